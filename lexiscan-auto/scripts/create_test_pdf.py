@@ -10,14 +10,6 @@ def create_sample_contract():
 
     os.makedirs(os.path.dirname(pdf_path), exist_ok=True)
 
-    c = canvas.Canvas(pdf_path, pagesize=letter)
-
-    # Title
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(100, 750, "SERVICE AGREEMENT")
-
-    # Body text
-    c.setFont("Helvetica", 11)
     text = [
         "",
         "This Service Agreement (\"Agreement\") is made and entered into on",
@@ -63,9 +55,33 @@ def create_sample_contract():
         "as of the date first written above.",
     ]
 
+    write_contract_pdf(pdf_path, "SERVICE AGREEMENT", text)
+    print(f"✓ Created sample contract: {pdf_path}")
+
+
+def write_contract_pdf(pdf_path, title, lines, page_breaks=()):
+    """
+    Render a contract to a digital PDF.
+
+    Args:
+        pdf_path: Output file
+        title: Heading drawn on the first page
+        lines: Body lines (long documents wrap onto new pages)
+        page_breaks: Line indexes that start a new page
+    """
+    c = canvas.Canvas(str(pdf_path), pagesize=letter)
+
+    # Title
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(100, 750, title)
+
+    # Body text
+    c.setFont("Helvetica", 11)
+    page_breaks = set(page_breaks)
+
     y = 710
-    for line in text:
-        if y < 50:
+    for index, line in enumerate(lines):
+        if y < 50 or index in page_breaks:
             c.showPage()
             c.setFont("Helvetica", 11)
             y = 750
@@ -73,7 +89,6 @@ def create_sample_contract():
         y -= 18
 
     c.save()
-    print(f"✓ Created sample contract: {pdf_path}")
 
 if __name__ == "__main__":
     create_sample_contract()
@@ -1,6 +1,8 @@
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -13,20 +15,54 @@ class Settings(BaseSettings):
     project_root: Path = Path(__file__).parent.parent.parent
     data_dir: Path = project_root / "data"
     model_path: Path = data_dir / "models" / "ner_model"
+    cache_dir: Path = data_dir / "cache"
+    page_store_dir: Path = data_dir / "page_store"
 
     # Model settings
     model_name: str = "nlpaueb/legal-bert-base-uncased"
     min_confidence: float = 0.75
     max_length: int = 512
+    ner_mode: str = "full"  # "rules": regex only, skips spaCy; "transformer": model_path
+    ner_quantize: bool = True  # int8 dynamic quantization for the transformer on CPU
+    ner_batch_size: int = 16
 
     # OCR settings
     ocr_dpi: int = 300
+    ocr_adaptive_dpi: Optional[int] = None  # e.g. 150: low-DPI first pass, full DPI only for weak pages
     ocr_min_confidence: float = 60.0
+    ocr_render_memory_mb: int = 512
+    ocr_refine_regions: bool = False
+    ocr_native_layout: bool = False  # pdfplumber layout-aware native text instead of PyPDF2 plain text
+    ocr_workers: int = 1  # processes per document for OCR pages and the native pass of long PDFs
+
+    # Result cache
+    cache_enabled: bool = True
+    cache_max_size_mb: int = 1024
+
+    # Logging and per-document tracing (see scripts/tracing.py)
+    log_level: str = "INFO"
+    log_json: bool = False  # one JSON object per line; traces carry their span tree
+    trace_enabled: bool = False
+    trace_profile_rate: float = 0.0  # share of traced documents run under cProfile
+    trace_slow_seconds: float = 60.0  # profiled documents this slow get the profile attached
+    trace_profile_dir: Optional[Path] = None  # also keep their .prof dumps here
 
     # API settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     max_file_size_mb: int = 50
+    # Scheduler lanes: api_workers / api_max_queue size the OCR lane (queue in page chunks)
+    api_workers: int = 2
+    api_max_queue: int = 32
+    api_native_workers: int = 2
+    api_native_queue: int = 32
+    api_ner_workers: int = 1
+    api_ner_queue: int = 32
+    api_ocr_chunk_pages: int = 4
+    api_max_in_flight: int = 64
+    api_chunk_aging_s: float = 2.0  # OCR chunk N of a document ranks as if it arrived N * this later
+    api_tenant_priorities: Dict[str, int] = {}  # JSON, lower runs first, e.g. {"acme": 0}; default 1
+    api_prewarm: bool = True  # start every lane worker and load its models before serving
 
     # ✅ Pydantic v2 configuration
     model_config = ConfigDict(
@@ -35,5 +71,14 @@ class Settings(BaseSettings):
     )
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """The process-wide Settings, read from the environment on first use"""
+    return Settings()
+
+
+def __getattr__(name: str):
+    # `from src.utils.config import settings` builds Settings on first access, not at import
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
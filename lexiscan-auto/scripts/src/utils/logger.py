@@ -1,7 +1,6 @@
 import logging
 import sys
 from pathlib import Path
-from pythonjsonlogger import jsonlogger
 
 
 def setup_logging(
@@ -30,6 +29,8 @@ def setup_logging(
 
     if json_format:
         # JSON format for production (easy to parse)
+        from pythonjsonlogger import jsonlogger
+
         formatter = jsonlogger.JsonFormatter(
             '%(asctime)s %(name)s %(levelname)s %(message)s'
         )
@@ -53,10 +54,9 @@ def setup_logging(
     logger.info(f"Logging initialized at {level} level")
     return logger
 
-#TEST
-from src.utils.logger import setup_logging
 
-logger = setup_logging(level="INFO")
-logger.info("This is an info message")
-logger.warning("This is a warning")
-logger.error("This is an error")
\ No newline at end of file
+if __name__ == "__main__":
+    logger = setup_logging(level="INFO")
+    logger.info("This is an info message")
+    logger.warning("This is a warning")
+    logger.error("This is an error")
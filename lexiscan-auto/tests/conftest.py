@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The pipeline modules (ocr_processor, NER_Algo, ...) live in the repo-level scripts folder
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
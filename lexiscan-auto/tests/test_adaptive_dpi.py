@@ -0,0 +1,63 @@
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+import ocr_processor  # noqa: E402
+from ocr_processor import OCRProcessor  # noqa: E402
+from PIL import Image  # noqa: E402
+
+# page -> {dpi: confidence of its words}; an empty dict = a page without text
+CONFIDENCE = {1: {150: 92.0, 300: 95.0}, 2: {150: 41.0, 300: 88.0}, 3: {}}
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Fake pdf2image and Tesseract; returns the (page, dpi) renders made"""
+    made = []
+
+    def convert_from_path(pdf_path, dpi, first_page, last_page, **kwargs):
+        images = []
+        for page in range(first_page, last_page + 1):
+            made.append((page, dpi))
+            image = Image.new('L', (10, 10), 255)
+            image.info.update(page=page, render_dpi=dpi)
+            images.append(image)
+        return images
+
+    def image_to_data(image, output_type=None):
+        confidence = CONFIDENCE[image.info['page']].get(image.info['render_dpi'])
+        words = ['Payment', 'due'] if confidence is not None else []
+        return {
+            'level': [5] * len(words), 'block_num': [1] * len(words), 'par_num': [1] * len(words),
+            'line_num': [1] * len(words), 'text': words, 'conf': [confidence] * len(words)
+        }
+
+    fake_tesseract = types.SimpleNamespace(image_to_data=image_to_data, Output=types.SimpleNamespace(DICT='dict'))
+    monkeypatch.setitem(sys.modules, "pdf2image", types.SimpleNamespace(convert_from_path=convert_from_path))
+    monkeypatch.setattr(ocr_processor, "_pytesseract", lambda: fake_tesseract)
+    monkeypatch.setattr(ocr_processor, "_tesseract_version", "test")
+    monkeypatch.setattr(OCRProcessor, "_render_window", lambda self, pdf_path: (3, 3))
+    # Keep the render (and its page/DPI tags) instead of binarizing it
+    monkeypatch.setattr(OCRProcessor, "preprocess_image", lambda self, image: image)
+    return made
+
+
+def test_only_pages_below_min_confidence_are_rerendered(renders):
+    processor = OCRProcessor(dpi=300, adaptive_dpi=150, min_confidence=60.0)
+
+    pages = list(processor.iter_pages_ocr("contract.pdf"))
+
+    # One first-pass render of the window, then full DPI for the weak page only
+    assert renders == [(1, 150), (2, 150), (3, 150), (2, 300)]
+    assert [(page['page'], page['dpi'], page['confidence']) for page in pages] == [(1, 150, 92.0), (2, 300, 88.0)]
+
+
+def test_without_adaptive_dpi_pages_render_once_at_full_dpi(renders):
+    processor = OCRProcessor(dpi=300, min_confidence=60.0)
+
+    pages = list(processor.iter_pages_ocr("contract.pdf"))
+
+    assert renders == [(1, 300), (2, 300), (3, 300)]
+    assert [(page['page'], page['dpi']) for page in pages] == [(1, 300), (2, 300)]
@@ -0,0 +1,101 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("httpx")
+pytest.importorskip("reportlab")
+from fastapi import HTTPException  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+import api_server  # noqa: E402
+import load_test_api  # noqa: E402
+import scheduler  # noqa: E402
+from scheduler import Lane, Scheduler  # noqa: E402
+
+
+def _native_stage(pdf_path):
+    with open(pdf_path, "rb") as f:
+        text = f.read().decode("latin-1")
+    return {'success': True, 'pages': [{'page': 1, 'text': text, 'method': 'native'}], 'ocr_pages': [],
+            'total_pages': 1}
+
+
+def _ner_stage(extraction):
+    return dict(extraction, entities={'party_names': [extraction['pages'][0]['text']]})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(scheduler.pipeline, "native_stage", _native_stage)
+    monkeypatch.setattr(scheduler.pipeline, "ner_stage", _ner_stage)
+    monkeypatch.setattr(api_server.settings, "max_file_size_mb", 1)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        monkeypatch.setattr(api_server.service, "scheduler", Scheduler({
+            'native': Lane('native', pool, 1, 4),
+            'ocr': Lane('ocr', pool, 1, 4),
+            'ner': Lane('ner', pool, 1, 4),
+        }))
+        # No `with`: the lifespan would start the real lane pools
+        yield TestClient(api_server.app)
+
+
+def test_upload_is_extracted_and_removed(client, monkeypatch):
+    saved = []
+    save_upload = api_server._save_upload
+
+    async def recording_save(request):
+        saved.append(await save_upload(request))
+        return saved[-1]
+
+    monkeypatch.setattr(api_server, "_save_upload", recording_save)
+    response = client.post("/extract", content=b"Acme Corp.", headers={"Content-Type": "application/pdf"})
+
+    assert response.status_code == 200
+    assert response.json()['entities'] == {'party_names': ["Acme Corp."]}
+    assert not os.path.exists(saved[0])
+    assert api_server.service.scheduler.in_flight == 0
+
+
+def test_oversized_and_empty_uploads_are_rejected(client):
+    assert client.post("/extract", content=b"x" * (1024 * 1024 + 1)).status_code == 413
+    assert client.post("/extract", content=b"").status_code == 400
+    assert api_server.service.scheduler.in_flight == 0
+
+
+def test_malformed_content_length_is_a_bad_request():
+    request = Request({'type': 'http', 'method': 'POST', 'headers': [(b'content-length', b'12abc')]})
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(api_server._save_upload(request))
+    assert error.value.status_code == 400
+
+
+def test_full_native_lane_rejects_new_documents(client):
+    api_server.service.scheduler.lanes['native'].max_queue = 0
+
+    response = client.post("/extract", content=b"Acme Corp.")
+
+    assert response.status_code == 429
+    assert response.json()['detail'] == {'error': 'Server busy, retry later', 'lane': 'native', 'queue_depth': 0}
+
+
+def test_load_test_requests_against_the_app(client, tmp_path):
+    import httpx
+
+    pdf = load_test_api.generate_pdfs(tmp_path, 1)[0].read_bytes()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=api_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return [
+                await load_test_api.send_sync(http, pdf),
+                await load_test_api.send_job(http, pdf, poll_interval=0.01),
+            ]
+
+    assert asyncio.run(scenario()) == [200, 200]
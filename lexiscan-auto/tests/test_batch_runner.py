@@ -0,0 +1,65 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+import batch_runner  # noqa: E402
+import pipeline  # noqa: E402
+
+
+def _init_worker(*args):
+    pass
+
+
+def _process_pdf(pdf_path):
+    name = os.path.basename(pdf_path)
+    if name.startswith("crash"):
+        os._exit(1)
+    if name.startswith("slow"):
+        time.sleep(1)
+    if name.startswith("bad"):
+        return {'success': False, 'error': "Unreadable PDF"}
+    return {'success': True}
+
+
+@pytest.fixture(autouse=True)
+def fake_pipeline(monkeypatch):
+    monkeypatch.setattr(pipeline, "init_worker", _init_worker)
+    monkeypatch.setattr(pipeline, "process_pdf", _process_pdf)
+
+
+def _checkpoint(path):
+    return dict(reversed(line.rstrip("\n").split("\t")) for line in open(path, encoding="utf-8"))
+
+
+def test_results_are_yielded_as_they_finish():
+    order = [path for path, _ in batch_runner._run_pool(["slow.pdf", "a.pdf", "b.pdf", "c.pdf"], 2, ())]
+
+    assert order[-1] == "slow.pdf"
+    assert sorted(order) == ["a.pdf", "b.pdf", "c.pdf", "slow.pdf"]
+
+
+def test_only_the_document_that_crashes_again_fails():
+    results = dict(batch_runner._run_pool(["slow.pdf", "crash.pdf", "a.pdf"], 2, ()))
+
+    assert results["slow.pdf"]['success'] and results["a.pdf"]['success']
+    assert results["crash.pdf"] == {'success': False, 'error': 'Worker process crashed'}
+
+
+def test_resume_skips_checkpointed_documents(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("a.pdf\nbad.pdf\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    first = batch_runner.run_batch(str(manifest), str(output), workers=2)
+    assert (first['succeeded'], first['failed']) == (1, 1)
+    assert _checkpoint(f"{output}.checkpoint") == {'a.pdf': 'ok', 'bad.pdf': 'failed'}
+
+    manifest.write_text("a.pdf\nbad.pdf\nc.pdf\n", encoding="utf-8")
+    second = batch_runner.run_batch(str(manifest), str(output), workers=2)
+    assert (second['skipped'], second['succeeded']) == (2, 1)
+
+    retried = batch_runner.run_batch(str(manifest), str(output), workers=2, retry_failed=True)
+    assert (retried['skipped'], retried['failed']) == (2, 1)
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 4
@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("prometheus_client")
+from chunked_ner import join_pages, make_windows, merge_spans  # noqa: E402
+from rule_extractor import extract_entities  # noqa: E402
+
+PAGE = "TERM: This Agreement commences on January 15, 2024 and continues until 01/15/2025. " * 12
+
+
+def _rule_spans(text):
+    return [{'label': e['label'], 'start': e['start'], 'end': e['end']} for e in extract_entities(text)]
+
+
+def test_windows_overlap_and_prefer_page_breaks():
+    pages = [{'page': number, 'text': PAGE} for number in range(1, 6)]
+    text, page_starts, numbers = join_pages(pages)
+
+    windows = make_windows(text, max_chars=1200, overlap=200, page_starts=page_starts)
+
+    assert numbers == [1, 2, 3, 4, 5]
+    assert windows[0][0] == 0 and windows[-1][1] == len(text)
+    assert all(end - start <= 1200 for start, end in windows)
+    assert all(nxt[0] < prev[1] for prev, nxt in zip(windows, windows[1:]))
+    assert windows[0][1] in page_starts
+
+
+def test_merged_spans_match_a_single_pass():
+    """Entities seen in two windows are kept once, at document offsets"""
+    text = PAGE * 4
+    windows = make_windows(text, max_chars=700, overlap=150)
+
+    merged = merge_spans(text, windows, [_rule_spans(text[start:end]) for start, end in windows])
+
+    assert [(s['start'], s['end']) for s in merged] == [(s['start'], s['end']) for s in _rule_spans(text)]
+    assert all(text[s['start']:s['end']] == s['text'] for s in merged)
+
+
+def test_cut_span_loses_to_complete_one():
+    text = "Paid on January 15, 2024 in full."
+    windows = [(0, 18), (8, len(text))]
+    window_spans = [
+        [{'label': 'DATE', 'start': 8, 'end': 18}],   # "January 15" cut at the window edge
+        [{'label': 'DATE', 'start': 0, 'end': 16}],   # "January 15, 2024"
+    ]
+
+    assert [s['text'] for s in merge_spans(text, windows, window_spans)] == ["January 15, 2024"]
+
+
+def test_transformer_mode_of_ner_algo_runs_in_windows(monkeypatch):
+    """NER_Algo's transformer mode finds entities past the model's max_length"""
+    import chunked_ner
+    from NER_Algo import NER_Algo
+
+    class FakeEngine:
+        max_length = 256
+
+        def __init__(self):
+            self.lengths = []
+
+        def predict(self, texts):
+            self.lengths.extend(len(text) for text in texts)
+            return [
+                [{'label': {'DATE': 'DATE', 'MONEY': 'AMOUNT'}[s['label']], 'start': s['start'], 'end': s['end'],
+                  'text': text[s['start']:s['end']]} for s in _rule_spans(text) if s['label'] in ('DATE', 'MONEY')]
+                for text in texts
+            ]
+
+    engine = FakeEngine()
+    monkeypatch.setattr(chunked_ner, "get_engine", lambda: engine)
+    text = PAGE * 3 + "The final payment of $9,999.00 is due on March 3, 2031."
+
+    party_names, dates, amounts, _ = NER_Algo(text, mode="transformer")
+
+    assert max(engine.lengths) <= engine.max_length * chunked_ner.TRANSFORMER_CHARS_PER_TOKEN
+    assert amounts == ["$9,999.00"]
+    assert dates[-1] == "March 3, 2031"
@@ -0,0 +1,32 @@
+from clause_extractor import extract_termination_clauses
+
+CONTRACT = (
+    "SERVICE AGREEMENT\n"
+    "\n"
+    "TERM: This Agreement runs until 2025 unless terminated earlier by Acme Corp. under\n"
+    "its terms. Fees are due monthly.\n"
+    "\n"
+    "TERMINATION: Either party may terminate this Agreement upon thirty (30) days written\n"
+    "notice. Upon termination, Client shall pay for all services completed through the\n"
+    "termination date.\n"
+    "VENDOR CONTRACT\n"
+    "CANCELLATION: Contract may be cancelled with written notice.\n"
+)
+
+
+def test_sections_and_sentences_returned_once():
+    """Headed sections come back whole, other hits as their sentence, each once"""
+    clauses = extract_termination_clauses(CONTRACT)
+
+    assert [(clause['section'], clause['text']) for clause in clauses] == [
+        (False, "TERM: This Agreement runs until 2025 unless terminated earlier by Acme Corp. under\nits terms."),
+        (True, "TERMINATION: Either party may terminate this Agreement upon thirty (30) days written\n"
+               "notice. Upon termination, Client shall pay for all services completed through the\n"
+               "termination date."),
+        (True, "CANCELLATION: Contract may be cancelled with written notice."),
+    ]
+    assert all(CONTRACT[clause['start']:clause['end']] == clause['text'] for clause in clauses)
+
+
+def test_no_keywords():
+    assert extract_termination_clauses("PAYMENT: Client shall pay $5,000.") == []
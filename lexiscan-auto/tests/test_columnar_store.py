@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+np = pytest.importorskip("numpy")
+import chunked_ner  # noqa: E402
+from columnar_store import load, write_columnar  # noqa: E402
+
+PAGES = [
+    {'page': 1, 'text': "Société Générale pays €5,000 — $5,000.00 on January 15, 2024.", 'method': 'native',
+     'confidence': 100.0},
+    {'page': 3, 'text': "TERMINATION: Either party may terminate with 30 days notice.", 'method': 'ocr',
+     'confidence': 87.5},
+]
+
+
+def _result(pages):
+    ner = chunked_ner.extract_document(pages, mode="rules")
+    return {
+        'success': True, 'pages': pages, 'total_pages': 3,
+        'entity_spans': ner['spans'], 'clause_spans': ner['termination_clauses'],
+    }
+
+
+def test_batch_results_round_trip_through_mapped_columns(tmp_path):
+    result = _result(PAGES)
+    records = [
+        {'path': "a.pdf", 'success': False, 'error': "Worker process crashed"},
+        {'path': "b.pdf", 'success': False, 'error': "broken"},
+        {'path': "a.pdf", **result},
+    ]
+    jsonl = tmp_path / "results.jsonl"
+    jsonl.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+    rows = write_columnar(str(jsonl), str(tmp_path / "cols"))
+    store = load(str(tmp_path / "cols"))
+
+    assert store.paths == ["b.pdf", "a.pdf"]
+    assert rows == {'documents': 2, 'pages': 2, 'spans': len(result['entity_spans']) + len(result['clause_spans'])}
+    assert isinstance(store.spans['start'], np.memmap)
+
+    assert store.document_text(1) == chunked_ner.join_pages(PAGES)[0]
+    assert [store.span_text(row) for row in range(rows['spans'])] == \
+        [item['text'] for item in result['entity_spans'] + result['clause_spans']]
+    assert store.text(store.pages['text_start'][1], store.pages['text_end'][1]) == PAGES[1]['text']
+
+    spans = store.frame("spans")
+    assert set(spans['label']) == {'AMOUNT', 'DATE', 'TERMINATION_CLAUSE'}
+    assert list(spans['doc'].unique()) == [1]
+    assert list(store.frame("pages")['method']) == ['native', 'ocr']
@@ -0,0 +1,36 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("prometheus_client")
+from PIL import Image, ImageDraw, ImageFilter  # noqa: E402
+
+import image_preprocessing  # noqa: E402
+import ocr_processor  # noqa: E402
+from ocr_processor import OCRProcessor  # noqa: E402
+
+
+def _page(noise):
+    image = Image.new('L', (640, 400), 230)
+    draw = ImageDraw.Draw(image)
+    for y in range(20, 380, 30):
+        draw.text((20, y), "TERMINATION: Either party may terminate upon thirty (30) days notice.", fill=30)
+    pixels = np.asarray(image, dtype=np.int16) + np.random.default_rng(0).integers(-noise, noise + 1, (400, 640))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).convert('RGB')
+
+
+@pytest.mark.parametrize("noise", [0, 12])
+def test_numpy_engine_matches_the_pil_chain(noise, monkeypatch):
+    monkeypatch.setattr(ocr_processor, "_tesseract_version", "test")
+    page = _page(noise)
+
+    expected = np.asarray(OCRProcessor(preprocessing="pil").preprocess_image(page))
+    result = np.asarray(image_preprocessing.preprocess_image(page))
+
+    assert np.array_equal(result, expected)
+
+
+def test_median_matches_pil_median_filter():
+    gray = np.random.default_rng(1).integers(0, 256, (300, 301), dtype=np.uint8)
+    expected = np.asarray(Image.fromarray(gray).filter(ImageFilter.MedianFilter(3)))
+
+    assert np.array_equal(image_preprocessing.median3(gray.copy()), expected)
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+pytest.importorskip("reportlab")
+pytest.importorskip("PyPDF2")
+import ocr_processor  # noqa: E402
+from benchmark_corpus import build_native_pdf  # noqa: E402
+from ocr_processor import OCRProcessor, _LayoutPages  # noqa: E402
+
+
+@pytest.fixture
+def native_pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr_processor, "_tesseract_version", "test")
+    return build_native_pdf(tmp_path / "native.pdf", 3)
+
+
+def test_text_layer_probe_routes_native_pages_without_pdfplumber(native_pdf, monkeypatch):
+    def opened(self, page_num):
+        raise AssertionError("pdfplumber opened for a native page")
+
+    monkeypatch.setattr(_LayoutPages, "__getitem__", opened)
+    triage = OCRProcessor().triage_pages(native_pdf)
+
+    assert [entry['route'] for entry in triage] == ['native'] * 3
+    assert "SERVICE AGREEMENT" in triage[0]['text']
+
+
+def test_layout_text_and_parallel_ranges_match_serial(native_pdf):
+    pytest.importorskip("pdfplumber")
+    serial = OCRProcessor().triage_pages(native_pdf, fingerprints=True)
+    layout = OCRProcessor(native_layout=True).triage_pages(native_pdf)
+
+    assert [entry['chars'] for entry in layout] == [entry['chars'] for entry in serial]
+    assert all(entry['text'].strip() for entry in layout)
+
+    processor = OCRProcessor(workers=2)
+    assert processor._triage_parallel(native_pdf, True, 1, 3) == serial
+
+
+def test_ocr_workers_setting_enables_the_parallel_native_pass(native_pdf, monkeypatch):
+    pytest.importorskip("pydantic_settings")
+    import pipeline
+
+    # Settings live in the lexiscan-auto scripts package
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[1] / "scripts"))
+    from src.utils.config import Settings
+
+    ranges = []
+    monkeypatch.setattr(ocr_processor, "NATIVE_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(
+        OCRProcessor, "_triage_parallel", lambda self, pdf_path, fingerprints, first, last: ranges.append((first, last))
+    )
+
+    processor = OCRProcessor(**pipeline.ocr_options_from_settings(Settings(ocr_workers=2)))
+    processor.triage_pages(native_pdf)
+
+    assert processor.workers == 2 and ranges == [(1, 3)]
@@ -0,0 +1,94 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+ocr_processor = pytest.importorskip("ocr_processor")
+from ocr_processor import OCRProcessor, _splice_lines, _weak_lines, text_from_ocr_data
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SAMPLE_CONTRACTS = [
+    REPO_ROOT / "lexiscan-auto" / "data" / "raw" / "sample_contract.pdf",
+    REPO_ROOT / "lexiscan-auto" / "scripts" / "data" / "raw" / "sample_contract.pdf",
+]
+
+
+def _ocr_rows(*rows):
+    """Build an image_to_data style dict from (level, block, par, line, text) rows"""
+    data = {'level': [], 'block_num': [], 'par_num': [], 'line_num': [], 'text': [], 'conf': []}
+    for level, block, par, line, text in rows:
+        data['level'].append(level)
+        data['block_num'].append(block)
+        data['par_num'].append(par)
+        data['line_num'].append(line)
+        data['text'].append(text)
+        data['conf'].append(95 if level == 5 else -1)
+    return data
+
+
+def test_text_from_ocr_data_layout():
+    """Lines, paragraphs and blocks are laid out like image_to_string"""
+    data = _ocr_rows(
+        (1, 0, 0, 0, ''),
+        (2, 1, 0, 0, ''),
+        (5, 1, 1, 1, 'SERVICE'),
+        (5, 1, 1, 1, 'AGREEMENT'),
+        (5, 1, 2, 1, 'This'),
+        (5, 1, 2, 1, 'Agreement'),
+        (5, 1, 2, 2, 'is'),
+        (5, 1, 2, 2, ' '),
+        (5, 1, 2, 2, 'binding.'),
+        (5, 2, 1, 1, 'TERMINATION:'),
+    )
+
+    assert text_from_ocr_data(data) == (
+        "SERVICE AGREEMENT\n\n"
+        "This Agreement\nis binding.\n\n"
+        "TERMINATION:\n\n\f"
+    )
+
+
+def test_text_from_ocr_data_empty_page():
+    """A page without words produces no text"""
+    data = _ocr_rows((1, 0, 0, 0, ''), (5, 1, 1, 1, ' '))
+    assert text_from_ocr_data(data) == ''
+
+
+def test_weak_line_is_spliced_back():
+    """Only the low-confidence line is found and replaced, in place"""
+    data = _ocr_rows(
+        (5, 1, 1, 1, 'Paymnt'),
+        (5, 1, 1, 1, 'd0e'),
+        (5, 1, 1, 2, 'monthly.'),
+    )
+    data['conf'] = [40, 30, 95]
+    data.update(left=[10, 80, 10], top=[10, 12, 40], width=[60, 30, 70], height=[20, 18, 20])
+
+    weak = _weak_lines(data, min_confidence=60)
+    assert [line['key'] for line in weak] == [(1, 1, 1)]
+    assert weak[0]['box'] == [10, 10, 110, 30]
+
+    words = [{'level': 5, 'line_num': 1, 'conf': 96, 'text': text} for text in ('Payment', 'due')]
+    spliced = _splice_lines(data, {weak[0]['rows'][0]: (weak[0]['rows'], words)})
+
+    assert text_from_ocr_data(spliced) == "Payment due\nmonthly.\n\n\f"
+
+
+@pytest.mark.skipif(shutil.which("tesseract") is None, reason="Tesseract not installed")
+@pytest.mark.parametrize("pdf_path", SAMPLE_CONTRACTS, ids=lambda p: p.parent.parent.parent.name)
+def test_single_pass_matches_two_pass(pdf_path):
+    """Text rebuilt from image_to_data matches a separate image_to_string pass"""
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    pytesseract.pytesseract.tesseract_cmd = shutil.which("tesseract")
+    processor = OCRProcessor()
+
+    for image in convert_from_path(str(pdf_path), dpi=processor.dpi):
+        clean_image = processor.preprocess_image(image)
+
+        data = pytesseract.image_to_data(clean_image, output_type=pytesseract.Output.DICT)
+        two_pass = pytesseract.image_to_string(clean_image)
+
+        assert text_from_ocr_data(data).split() == two_pass.split()
+        assert text_from_ocr_data(data).strip() == two_pass.strip()
@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("prometheus_client")
+pytest.importorskip("reportlab")
+pytest.importorskip("pdfplumber")
+import ocr_processor  # noqa: E402
+from ocr_processor import OCRProcessor  # noqa: E402
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setattr(ocr_processor, "_tesseract_version", "test")
+    return OCRProcessor()
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """Page 1 digital text, page 2 a full-page image, page 3 empty"""
+    from PIL import Image
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    path = tmp_path / "mixed.pdf"
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    for line in range(20):
+        pdf.drawString(72, 720 - line * 14, f"Clause {line}: the Supplier shall deliver the Goods on time.")
+    pdf.showPage()
+    scan = Image.effect_noise((850, 1100), 60).convert("RGB")
+    pdf.drawImage(ImageReader(scan), 0, 0, width=letter[0], height=letter[1])
+    pdf.showPage()
+    pdf.showPage()
+    pdf.save()
+    return str(path)
+
+
+def test_pages_are_routed_native_scanned_or_blank(processor, mixed_pdf, monkeypatch):
+    # Thumbnail variance needs poppler; the scan is busy, the empty page flat
+    thumbnail_std = staticmethod(lambda pdf_path, page_num: 0.0 if page_num == 3 else 40.0)
+    monkeypatch.setattr(OCRProcessor, "_thumbnail_std", thumbnail_std)
+
+    triage = processor.triage_pages(mixed_pdf)
+
+    assert [entry['route'] for entry in triage] == ['native', 'scanned', 'blank']
+    assert "Supplier" in triage[0]['text']
+    assert triage[1]['image_coverage'] > 0.9
+
+
+def test_unreadable_text_layer_falls_back_to_ocr(processor, tmp_path, monkeypatch):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    monkeypatch.setattr(OCRProcessor, "_render_window", lambda self, pdf_path: (2, 4))
+    monkeypatch.setattr(
+        OCRProcessor, "iter_pages_ocr",
+        lambda self, pdf_path, pages=None: iter([{'page': num, 'text': "scanned", 'method': 'ocr'} for num in pages])
+    )
+
+    result = processor.extract_text_hybrid(str(broken))
+
+    assert result['success']
+    assert [page['page'] for page in result['pages']] == [1, 2]
+    assert result['routing'] == {'native': 0, 'ocr': 2, 'blank': 0}
+
+
+def _form_pdf(path, text):
+    """One page whose content stream only draws a form XObject holding `text`"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(str(path), pagesize=letter, invariant=1)
+    pdf.beginForm("Terms")
+    pdf.drawString(72, 720, text)
+    pdf.endForm()
+    pdf.doForm("Terms")
+    pdf.showPage()
+    pdf.save()
+    return str(path)
+
+
+def test_fingerprint_covers_form_xobjects(tmp_path):
+    from PyPDF2 import PdfReader
+
+    def page(name, text):
+        return PdfReader(_form_pdf(tmp_path / name, text)).pages[0]
+
+    first = page("a.pdf", "The fee is $5,000.00.")
+    same = page("b.pdf", "The fee is $5,000.00.")
+    changed = page("c.pdf", "The fee is $9,000.00.")
+
+    # Only the form differs, not the page's own content stream
+    assert first.get_contents().get_data() == changed.get_contents().get_data()
+    assert OCRProcessor._content_hash(first) == OCRProcessor._content_hash(same)
+    assert OCRProcessor._content_hash(first) != OCRProcessor._content_hash(changed)
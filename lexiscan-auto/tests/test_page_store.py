@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("prometheus_client")
+from chunked_ner import join_pages  # noqa: E402
+from page_store import PageStore, diff_entities, process_incremental  # noqa: E402
+
+PAGES = {
+    'a': "Payment of $5,000.00 is due on January 15, 2024.",
+    'b': "TERMINATION: Either party may terminate with 30 days notice.",
+    'c': "The fee rises to $7,500.00 after March 1, 2025.",
+}
+
+
+class FakeProcessor:
+    """Native pages from PAGES, scanned pages for other names (OCR finds no text); fingerprint = name"""
+
+    def __init__(self, names):
+        self.names = names
+        self.ocr_calls = []
+
+    def cache_settings(self):
+        return {}
+
+    def triage_pages(self, pdf_path, fingerprints=False):
+        if pdf_path.startswith("broken"):
+            raise ValueError("Could not read malformed PDF file")
+        return [
+            {'page': number, 'route': 'native', 'text': PAGES[name], 'fingerprint': f"native:{name}"}
+            if name in PAGES else
+            {'page': number, 'route': 'scanned', 'fingerprint': f"scan:{name}"}
+            for number, name in enumerate(self.names, 1)
+        ]
+
+    def ocr_triage(self, pdf_path, fingerprints=False):
+        return [
+            {'page': number, 'route': 'scanned', 'fingerprint': f"scan:{name}"}
+            for number, name in enumerate(self.names, 1)
+        ]
+
+    def iter_pages_ocr(self, pdf_path, pages):
+        self.ocr_calls.append(list(pages))
+        return iter([])
+
+
+def test_unchanged_pages_are_reused_even_when_moved(tmp_path):
+    store = PageStore(str(tmp_path))
+    first = process_incremental("v1.pdf", FakeProcessor(['a', 'b']), store, ner_mode="rules")
+    second = process_incremental("v2.pdf", FakeProcessor(['c', 'a', 'b']), store, ner_mode="rules")
+
+    assert first['processed_pages'] == [1, 2]
+    assert second['reused_pages'] == [2, 3] and second['processed_pages'] == [1]
+
+    text, _, _ = join_pages(second['pages'])
+    assert all(text[s['start']:s['end']] == s['text'] for s in second['entity_spans'] + second['clause_spans'])
+    assert [s['page'] for s in second['entity_spans']] == [1, 1, 2, 2]
+
+    diff = diff_entities(first, second)
+    assert {(item['text'], item['page']) for item in diff['added']} == {('$7,500.00', 1), ('March 1, 2025', 1)}
+    assert diff['removed'] == []
+
+
+def test_pages_without_text_are_not_ocred_again(tmp_path):
+    store = PageStore(str(tmp_path))
+    first_processor = FakeProcessor(['a', 'stamp'])
+    first = process_incremental("v1.pdf", first_processor, store, ner_mode="rules")
+
+    second_processor = FakeProcessor(['stamp', 'a'])
+    second = process_incremental("v2.pdf", second_processor, store, ner_mode="rules")
+
+    assert first_processor.ocr_calls == [[2]] and first['processed_pages'] == [1, 2]
+    assert second_processor.ocr_calls == [] and second['reused_pages'] == [1, 2]
+    assert [page['page'] for page in second['pages']] == [2]
+    assert [s['page'] for s in second['entity_spans']] == [2, 2]
+
+
+def test_unreadable_text_layer_falls_back_to_ocr(tmp_path):
+    store = PageStore(str(tmp_path))
+    processor = FakeProcessor(['a', 'b'])
+
+    result = process_incremental("broken.pdf", processor, store, ner_mode="rules")
+
+    assert result['success'] and result['processed_pages'] == [1, 2]
+    assert processor.ocr_calls == [[1, 2]]
@@ -0,0 +1,86 @@
+import os
+import time
+
+from result_cache import ResultCache
+
+
+def test_put_get_roundtrip(tmp_path):
+    """Stored results come back unchanged and count as hits"""
+    cache = ResultCache(tmp_path)
+    key = cache.make_key("abc", {'dpi': 300})
+
+    assert cache.get(key) is None
+    cache.put(key, {'success': True, 'pages': [{'page': 1, 'text': 'hello'}]})
+
+    assert cache.get(key) == {'success': True, 'pages': [{'page': 1, 'text': 'hello'}]}
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['entries'] == 1
+
+
+def test_key_depends_on_settings(tmp_path):
+    """Different OCR settings never share a cache entry"""
+    cache = ResultCache(tmp_path)
+    content = cache.text_hash("contract")
+
+    assert cache.make_key(content, {'dpi': 300, 'min_confidence': 60.0}) == \
+        cache.make_key(content, {'min_confidence': 60.0, 'dpi': 300})
+    assert cache.make_key(content, {'dpi': 300}) != cache.make_key(content, {'dpi': 150})
+
+
+def test_file_hash_matches_content(tmp_path):
+    """Identical files hash the same regardless of name"""
+    first = tmp_path / "a.pdf"
+    second = tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF-1.4 same bytes")
+    second.write_bytes(b"%PDF-1.4 same bytes")
+
+    assert ResultCache.file_hash(first) == ResultCache.file_hash(second)
+
+
+def test_lru_eviction(tmp_path):
+    """Least recently used entries are dropped once over the size limit"""
+    cache = ResultCache(tmp_path, max_size_mb=1)
+    payload = 'x' * (400 * 1024)
+
+    cache.put('a' * 64, payload)
+    cache.put('b' * 64, payload)
+
+    # Touch "a" so "b" becomes the oldest
+    old = time.time() - 60
+    os.utime(cache._path('b' * 64), (old, old))
+    os.utime(cache._path('a' * 64), (old - 30, old - 30))
+    assert cache.get('a' * 64) == payload
+
+    cache.put('c' * 64, payload)
+
+    assert cache.get('b' * 64) is None
+    assert cache.get('a' * 64) == payload
+    assert cache.get('c' * 64) == payload
+    assert cache.stats()['size_bytes'] <= 1024 * 1024
+
+
+def test_processes_sharing_a_directory_see_each_others_writes(tmp_path):
+    """Each writer re-stats the shared directory, so the limit holds across processes"""
+    first = ResultCache(tmp_path, max_size_mb=1, rescan_seconds=0)
+    second = ResultCache(tmp_path, max_size_mb=1, rescan_seconds=0)
+    payload = 'x' * (300 * 1024)
+
+    for index in range(3):
+        first.put(f"{index}a".ljust(64, 'a'), payload)
+        second.put(f"{index}b".ljust(64, 'b'), payload)
+
+    assert first.stats()['size_bytes'] <= 1024 * 1024
+
+
+def test_failed_write_does_not_raise(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", disk_full)
+
+    assert cache.put('a' * 64, {'success': True}) is False
+    assert cache.get('a' * 64) is None
+    assert list(tmp_path.glob('*/*.tmp')) == []
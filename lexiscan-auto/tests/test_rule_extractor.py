@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+import pytest
+
+from rule_extractor import add_to_pipeline, extract_amounts_dates, extract_entities
+
+TEXT = (
+    "The Client shall pay $50,000.00 upon signing and USD 50,000 on completion. "
+    "Effective January 15, 2024; renewal on 01/15/2025 or 15 January 2026. "
+    "Invalid 13/45/2024 is ignored."
+)
+
+
+def test_amounts_and_dates_are_normalized():
+    """Every generated format is found and normalized, with offsets"""
+    entities = extract_entities(TEXT)
+
+    assert [(e['label'], e['text'], e['value']) for e in entities] == [
+        ('MONEY', '$50,000.00', Decimal('50000.00')),
+        ('MONEY', 'USD 50,000', Decimal('50000')),
+        ('DATE', 'January 15, 2024', '2024-01-15'),
+        ('DATE', '01/15/2025', '2025-01-15'),
+        ('DATE', '15 January 2026', '2026-01-15'),
+    ]
+    assert all(e['currency'] == 'USD' for e in entities if e['label'] == 'MONEY')
+    assert all(TEXT[e['start']:e['end']] == e['text'] for e in entities)
+
+
+def test_extract_amounts_dates_dedupes_in_order():
+    dates, amounts = extract_amounts_dates("Pay $1,200 by May 1, 2024. Again: $1,200 by May 1, 2024.")
+    assert dates == ['May 1, 2024']
+    assert amounts == ['$1,200']
+
+
+def test_malformed_amounts_are_not_truncated():
+    """A number that runs on past its cents is skipped, not cut short"""
+    _, amounts = extract_amounts_dates("Fees of $1,234,567.891 and $12,34 apply; total $7,500.")
+    assert amounts == ['$7,500']
+
+
+def test_spacy_component_sets_entities():
+    """As a pipeline component the rules set doc.ents with normalized values"""
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("en")
+    add_to_pipeline(nlp)
+
+    doc = nlp(TEXT)
+    assert [(ent.label_, ent._.value) for ent in doc.ents][:3] == [
+        ('MONEY', Decimal('50000.00')),
+        ('MONEY', Decimal('50000')),
+        ('DATE', '2024-01-15'),
+    ]
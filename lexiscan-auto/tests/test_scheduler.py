@@ -0,0 +1,120 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+import scheduler  # noqa: E402
+from scheduler import Lane, LaneFull, Scheduler  # noqa: E402
+
+# name -> number of scanned pages (0 = digital)
+DOCUMENTS = {'big_scan.pdf': 40, 'small_scan.pdf': 2, 'digital.pdf': 0}
+
+
+class FakeStages:
+    """Stand-ins for the pipeline stages: OCR takes 10 ms per page"""
+
+    def __init__(self):
+        self.ocr_calls = []
+
+    def native_stage(self, pdf_path):
+        scanned = DOCUMENTS[pdf_path]
+        return {'success': True, 'pages': [], 'ocr_pages': list(range(1, scanned + 1)), 'total_pages': scanned}
+
+    def ocr_stage(self, pdf_path, pages):
+        self.ocr_calls.append(pdf_path)
+        time.sleep(0.01 * len(pages))
+        return [{'page': page, 'text': 'x', 'method': 'ocr'} for page in pages]
+
+    def ner_stage(self, extraction):
+        return dict(extraction, entities={})
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    fake = FakeStages()
+    for name in ('native_stage', 'ocr_stage', 'ner_stage'):
+        monkeypatch.setattr(scheduler.pipeline, name, getattr(fake, name))
+    return fake
+
+
+def _scheduler(pool, ocr_queue=100):
+    return Scheduler(
+        {
+            'native': Lane('native', pool, 2, 10),
+            'ocr': Lane('ocr', pool, 1, ocr_queue),
+            'ner': Lane('ner', pool, 1, 10),
+        },
+        ocr_chunk_pages=4
+    )
+
+
+def test_small_documents_are_not_starved_by_a_large_scan(stages):
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            lanes = _scheduler(pool)
+            finished = []
+
+            async def run(name, delay):
+                await asyncio.sleep(delay)
+                lanes.admit()
+                result = await lanes.process(name)
+                finished.append(name)
+                return result
+
+            results = await asyncio.gather(
+                run('big_scan.pdf', 0), run('small_scan.pdf', 0.02), run('digital.pdf', 0.02)
+            )
+            return finished, results, lanes
+
+    finished, results, lanes = asyncio.run(scenario())
+
+    assert finished[-1] == 'big_scan.pdf'
+    assert [page['page'] for page in results[0]['pages']] == list(range(1, 41))
+    # The small scan's only chunk ran long before the big scan's last chunks
+    assert stages.ocr_calls.index('small_scan.pdf') < 5
+    assert lanes.in_flight == 0
+    assert lanes.stats()['lanes']['ocr']['p99_s'] is not None
+
+
+def test_admission_rejects_when_native_lane_is_full(stages):
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        lanes = _scheduler(pool)
+        lanes.lanes['native'].max_queue = 0
+
+        with pytest.raises(LaneFull) as error:
+            lanes.admit()
+        assert error.value.lane == 'native'
+
+
+def test_job_priority_orders_before_tenant_and_chunk():
+    lanes = Scheduler({}, tenant_priorities={'acme': 0})
+    assert lanes.key('high', None, 9) < lanes.key('normal', 'acme', 0) < lanes.key('normal', 'other', 0)
+    with pytest.raises(ValueError):
+        lanes.key('urgent', None)
+
+
+def test_admitted_documents_wait_for_native_room(stages):
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            lanes = _scheduler(pool)
+            lanes.lanes['native'].max_queue = 1
+            for _ in range(4):
+                lanes.admit()
+            results = await asyncio.gather(*(lanes.process('digital.pdf') for _ in range(4)))
+            return results, lanes
+
+    results, lanes = asyncio.run(scenario())
+
+    assert all(result['success'] for result in results)
+    assert lanes.in_flight == 0
+
+
+def test_later_chunks_age_ahead_of_new_documents():
+    lanes = Scheduler({}, chunk_aging_s=1.0)
+
+    # Chunk 5 of a scan that arrived at t=0 yields to a document arriving just after...
+    assert lanes.key('normal', None, 0, arrival=0.5) < lanes.key('normal', None, 5, arrival=0.0)
+    # ...but not to documents that keep arriving long after it
+    assert lanes.key('normal', None, 5, arrival=0.0) < lanes.key('normal', None, 0, arrival=6.0)
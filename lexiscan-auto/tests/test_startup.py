@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+from benchmark_startup import SCRIPTS_DIR, parse_importtime  # noqa: E402
+
+HEAVY = ("pytesseract", "pdf2image", "pdfplumber", "numpy", "PIL")
+
+
+def test_importing_the_pipeline_does_not_load_ocr_libraries():
+    code = f"import sys, ocr_processor, pipeline; print([m for m in {HEAVY!r} if m in sys.modules])"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_parse_importtime_reports_direct_imports():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 | site",
+        "import time:        50 |         50 |     numpy.core",
+        "import time:       200 |        250 |   numpy",
+        "import time:        30 |         30 |   metrics",
+        "import time:        20 |        300 | ocr_processor",
+    ])
+
+    assert parse_importtime(stderr, "ocr_processor") == (300, {'numpy': 250, 'metrics': 30})
@@ -0,0 +1,73 @@
+import logging
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+import tracing  # noqa: E402
+from metrics import time_stage  # noqa: E402
+
+
+@pytest.fixture
+def traces(monkeypatch):
+    records = []
+    monkeypatch.setattr(tracing.logger, "handle", records.append)
+    monkeypatch.setattr(tracing.logger, "level", logging.INFO)
+    yield records
+    tracing.configure()
+
+
+def _names(node):
+    return [node['name'], [_names(child) for child in node.get('children', [])]]
+
+
+def test_stages_nest_under_the_document_span(traces):
+    tracing.configure(enabled=True)
+
+    with tracing.document("process_pdf", file="contract.pdf"):
+        with tracing.span("page", page=1) as page:
+            with time_stage("tesseract"):
+                pass
+            page.set(confidence=91.5)
+        with time_stage("clauses"):
+            pass
+
+    tree = traces[0].trace
+    assert _names(tree) == ['process_pdf', [['page', [['tesseract', []]]], ['clauses', []]]]
+    assert tree['attributes'] == {'file': 'contract.pdf'}
+    assert tree['children'][0]['attributes'] == {'page': 1, 'confidence': 91.5}
+    assert not hasattr(traces[0], 'profile')
+
+
+def test_spans_are_no_ops_when_tracing_is_off(traces):
+    with tracing.document("process_pdf") as root:
+        with time_stage("tesseract") as stage:
+            stage.set(ignored=True)
+
+    assert root is tracing.NO_SPAN and traces == []
+
+
+def test_slow_profiled_document_gets_a_profile(traces, tmp_path):
+    tracing.configure(enabled=True, profile_rate=1.0, slow_seconds=0, profile_dir=str(tmp_path))
+
+    with tracing.document("process_pdf"):
+        sorted(range(10000), key=lambda value: -value)
+
+    record = traces[0]
+    assert "function calls" in record.profile
+    assert (tmp_path / f"{record.trace_id}.prof").exists()
+
+
+def test_fragments_from_workers_are_joined(traces):
+    fragment_result, fragment = tracing.traced_call(_stage, (3,), profiled=True)
+    trace = tracing.Trace("document", profiled=True)
+    trace.root.attach(fragment['span'])
+    trace.add_stats(fragment['stats'])
+    record = trace.finish()
+
+    assert fragment_result == 6
+    assert _names(record['trace']) == ['document', [['_stage', [['clauses', []]]]]]
+
+
+def _stage(value):
+    with time_stage("clauses"):
+        return value * 2
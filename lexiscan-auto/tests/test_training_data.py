@@ -0,0 +1,40 @@
+import string
+
+import pytest
+
+pytest.importorskip("faker")
+from create_sample_data import fill_template, termination_spans, TEMPLATES  # noqa: E402
+from generate_training_data import generate_samples  # noqa: E402
+
+VALUES = {
+    'party1': "Acme Corp.", 'party2': "Acme Corp.",
+    'amount1': "$5,000", 'amount2': "$5,000",
+    'date1': "01/15/2024", 'date2': "01/15/2024", 'date3': "March 1, 2025",
+}
+
+
+def test_fill_template_spans_are_exact_when_values_repeat():
+    """Each placeholder gets its own span, even when two values are identical"""
+    for template in TEMPLATES:
+        text, annotations = fill_template(template, VALUES)
+
+        fields = [field for _, field, _, _ in string.Formatter().parse(template) if field]
+        assert len(annotations) == len(fields)
+        assert [text[a['start']:a['end']] for a in annotations] == [VALUES[field] for field in fields]
+
+
+def test_termination_spans_offsets():
+    text = "Intro text. Either party may terminate this Agreement. Short cancel. Upon termination, pay."
+    assert [text[s['start']:s['end']] for s in termination_spans(text)] == [
+        "Either party may terminate this Agreement",
+        "Upon termination, pay",
+    ]
+
+
+def test_generate_samples_is_reproducible_per_shard():
+    first = list(generate_samples(5, seed=7, shard_index=3))
+    again = list(generate_samples(5, seed=7, shard_index=3))
+    other = list(generate_samples(5, seed=7, shard_index=4))
+
+    assert first == again
+    assert first != other
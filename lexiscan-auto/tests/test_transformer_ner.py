@@ -0,0 +1,51 @@
+from transformer_ner import decode_spans
+
+TEXT = "Acme Corp. pays $50,000.00 on January 15, 2024."
+
+
+def _tokens(*tokens):
+    """(piece, label, score, word) tuples -> offsets / labels / scores / word ids, locating pieces in TEXT"""
+    offsets, labels, scores, words = [(0, 0)], ['O'], [1.0], [None]
+    position = 0
+    for piece, label, score, word in tokens:
+        start = TEXT.index(piece, position)
+        position = start + len(piece)
+        offsets.append((start, position))
+        labels.append(label)
+        scores.append(score)
+        words.append(word)
+    return offsets + [(0, 0)], labels + ['O'], scores + [1.0], words + [None]
+
+
+def test_word_pieces_merge_and_spans_close_on_o():
+    offsets, labels, scores, words = _tokens(
+        ("Acme", 'B-PARTY_NAME', 0.9, 0), ("Corp", 'I-PARTY_NAME', 0.9, 1), (".", 'O', 0.9, 2),
+        ("pays", 'O', 0.99, 3),
+        ("$", 'B-AMOUNT', 0.95, 4), ("50", 'I-AMOUNT', 0.95, 5), (",", 'I-AMOUNT', 0.9, 6),
+        ("000", 'I-AMOUNT', 0.9, 7), (".", 'I-AMOUNT', 0.9, 8), ("00", 'I-AMOUNT', 0.9, 9),
+        ("on", 'O', 0.99, 10),
+        ("Jan", 'B-DATE', 0.9, 11), ("uary", 'O', 0.9, 11), ("15", 'I-DATE', 0.9, 12),
+        (",", 'I-DATE', 0.9, 13), ("2024", 'I-DATE', 0.9, 14), (".", 'O', 0.9, 15),
+    )
+
+    spans = decode_spans(TEXT, offsets, labels, scores, min_confidence=0.75, word_ids=words)
+
+    # Trailing punctuation labelled O stays out; "uary" follows its word into the date
+    assert [(span['label'], span['text']) for span in spans] == [
+        ('PARTY_NAME', 'Acme Corp'),
+        ('AMOUNT', '$50,000.00'),
+        ('DATE', 'January 15, 2024'),
+    ]
+    assert all(TEXT[span['start']:span['end']] == span['text'] for span in spans)
+
+
+def test_adjacent_tokens_with_other_labels_start_new_spans():
+    offsets, labels, scores, words = _tokens(
+        ("$", 'B-AMOUNT', 0.95, 0), ("50", 'I-DATE', 0.95, 1), (",", 'O', 0.95, 2),
+        ("January", 'B-DATE', 0.6, 3), ("15", 'I-DATE', 0.6, 4),
+    )
+
+    spans = decode_spans(TEXT, offsets, labels, scores, min_confidence=0.75, word_ids=words)
+
+    # The low-confidence date is dropped
+    assert [(span['label'], span['text']) for span in spans] == [('AMOUNT', '$'), ('DATE', '50')]
@@ -1,31 +1,40 @@
-def NER_Algo(Input_text):
+import logging
+import time
 
-    import spacy
-    from spacy.matcher import Matcher
-    
-    # Sample contract text
-    text = Input_text
-    
-    # Load English model
-    nlp = spacy.load("en_core_web_sm")
+import metrics
+from metrics import time_stage
+from nlp_registry import get_pipeline, DEFAULT_MODEL, DEFAULT_COMPONENTS
+from clause_extractor import extract_termination_clauses
+from rule_extractor import extract_amounts_dates
+from transformer_ner import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction rules change, so cached NER results are not reused
+NER_VERSION = 5
+
+# "full": spaCy NER for party names, amounts and dates
+# "rules": regex amounts, dates and clauses only (party names come back empty)
+# "transformer": fine-tuned legal-bert at Settings.model_path for every field
+NER_MODES = ("full", "rules", "transformer")
 
-    # Process text
-    doc = nlp(text)
+# transformer_ner labels -> NER_Algo output position
+TRANSFORMER_LABELS = {'PARTY_NAME': 0, 'DATE': 1, 'AMOUNT': 2, 'TERMINATION_CLAUSE': 3}
 
-    # Create matcher for custom rules
-    matcher = Matcher(nlp.vocab)
 
-    # Rule to detect termination clauses (lines starting with TERMINATION)
-    termination_pattern = [{"LOWER": "termination"}, {"IS_PUNCT": True, "OP": "?"}, {"IS_ALPHA": True, "OP": "*"}]
-    matcher.add("TERMINATION_CLAUSE", [termination_pattern])
+def _termination_clauses(text):
+    """Unique clause texts, in text order"""
+    with time_stage("clauses"):
+        return list(dict.fromkeys(clause['text'] for clause in extract_termination_clauses(text)))
 
-    matches = matcher(doc)
+
+def _extract(doc):
+    """Collect party names, dates, amounts and termination clauses from a processed doc"""
 
     # Extracted info
     party_names = []
     amounts = []
     dates = []
-    termination_clauses = []
 
     # Extract using spaCy entities
     for ent in doc.ents:
@@ -36,15 +45,135 @@ def NER_Algo(Input_text):
         elif ent.label_ in ["DATE"]:
             dates.append(ent.text)
 
-    # Extract termination clauses using matcher
-    for match_id, start, end in matches:
-        span = doc[start:end].sent  # capture the full sentence
-        termination_clauses.append(span.text.strip())
+    # Termination clauses come from keyword + section/sentence rules (no parser)
+    termination_clauses = _termination_clauses(doc.text)
 
     # Remove duplicates
     output_party_names = list(set(party_names))
     output_dates = list(set(dates))
     output_amounts = list(set(amounts))
-    output_termination_clauses = list(set(termination_clauses))
 
-    return output_party_names, output_dates, output_amounts, output_termination_clauses
\ No newline at end of file
+    return output_party_names, output_dates, output_amounts, termination_clauses
+
+
+def cache_settings(mode):
+    """Everything besides the text that determines a cached NER result"""
+    if mode == "transformer":
+        engine = get_engine()
+        return {
+            'mode': mode,
+            'model': str(engine.model_path),
+            'max_length': engine.max_length,
+            'min_confidence': engine.min_confidence,
+            'ner_version': NER_VERSION
+        }
+    return {
+        'model': DEFAULT_MODEL,
+        'components': DEFAULT_COMPONENTS,
+        'ner_version': NER_VERSION
+    }
+
+
+def NER_Algo(Input_text, cache=None, mode="full"):
+
+    if mode not in NER_MODES:
+        raise ValueError(f"Unknown NER mode {mode!r}; expected one of {NER_MODES}")
+
+    # Sample contract text
+    text = Input_text
+
+    # Rules-only: no spaCy at all, regex scans only
+    if mode == "rules":
+        with time_stage("rules"):
+            dates, amounts = extract_amounts_dates(text)
+        termination_clauses = _termination_clauses(text)
+        metrics.DOCUMENTS_TOTAL.labels('ner').inc()
+        return [], dates, amounts, termination_clauses
+
+    # Optional on-disk result cache (result_cache.ResultCache)
+    key = None
+    if cache is not None:
+        key = cache.make_key(cache.text_hash(text), cache_settings(mode))
+        cached = cache.get(key)
+        if cached is not None:
+            return tuple(cached)
+
+    if mode == "transformer":
+        # Fine-tuned model (loaded once per process), run over windows of about
+        # max_length tokens: the model itself truncates longer texts
+        import chunked_ner
+
+        result = chunked_ner.as_ner_tuple(chunked_ner.extract_document([{'page': 1, 'text': text}], mode=mode))
+    else:
+        # Cached English model (loaded once per process)
+        entry = get_pipeline()
+
+        # Process text
+        with time_stage("spacy_ner"):
+            doc = entry.nlp(text)
+
+        result = _extract(doc)
+        metrics.DOCUMENTS_TOTAL.labels('ner').inc()
+
+    if cache is not None:
+        cache.put(key, list(result))
+
+    return result
+
+
+def _as_pairs(inputs):
+    """Accept plain texts or (doc_id, text) pairs; plain texts get their index as id"""
+    for index, item in enumerate(inputs):
+        if isinstance(item, str):
+            yield item, index
+        else:
+            doc_id, text = item
+            yield text, doc_id
+
+
+def NER_Algo_batch(inputs, batch_size=64, n_process=1, log_every=1000):
+    """
+    Run NER_Algo over many contracts using nlp.pipe.
+
+    Args:
+        inputs: Iterable of texts or (doc_id, text) pairs (consumed lazily)
+        batch_size: Number of texts spaCy processes per batch
+        n_process: Worker processes for nlp.pipe (1 = in-process)
+        log_every: Log throughput after this many documents
+
+    Yields:
+        (doc_id, (party_names, dates, amounts, termination_clauses)) in input order
+    """
+    entry = get_pipeline()
+
+    docs = entry.nlp.pipe(
+        _as_pairs(inputs),
+        as_tuples=True,
+        batch_size=batch_size,
+        n_process=n_process
+    )
+
+    processed = 0
+    start = time.perf_counter()
+    waited_since = start
+
+    for doc, doc_id in docs:
+        # Time spent waiting on nlp.pipe for this doc (amortized over its batch)
+        metrics.STAGE_SECONDS.labels("spacy_ner").observe(time.perf_counter() - waited_since)
+
+        result = _extract(doc)
+        metrics.DOCUMENTS_TOTAL.labels('ner').inc()
+        yield doc_id, result
+        waited_since = time.perf_counter()
+
+        processed += 1
+        if log_every and processed % log_every == 0:
+            elapsed = time.perf_counter() - start
+            logger.info(f"NER batch: {processed} docs ({processed / elapsed:.1f} docs/sec)")
+
+    elapsed = time.perf_counter() - start
+    if processed:
+        logger.info(
+            f"✓ NER batch finished: {processed} docs in {elapsed:.1f}s "
+            f"({processed / elapsed:.1f} docs/sec)"
+        )
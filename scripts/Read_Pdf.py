@@ -12,7 +12,8 @@ def Read_Pdf(Input_path):
     # Process the sample contract
     result = processor.process_document(Input_path)
     
-    output = result["pages"][0]['text']
+    # Every extracted page, in page order
+    output = "\n\n".join(page['text'] for page in result["pages"])
     
     return output
 
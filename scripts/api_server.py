@@ -0,0 +1,281 @@
+"""
+LexiScan Auto REST API.
+
+Uploads are streamed to disk (raw PDF request body) with the size limit
+enforced while reading. Documents then go through the scheduler's native,
+OCR and NER lanes, each a bounded process pool, so the event loop never
+blocks and a large scan cannot hold up digital contracts. When the
+native lane's queue is full, requests get 429 with the lane and queue
+depth.
+
+Optional request parameters:
+    ?priority=high|normal|low   job priority (default normal)
+    X-Tenant-ID header          tenant, ranked by API_TENANT_PRIORITIES
+
+With API_PREWARM (default on), start-up forks every lane worker and
+loads its libraries and models before the server accepts requests; the
+OCR libraries are imported in the parent first so forked workers inherit
+them.
+
+With TRACE_ENABLED, each document's span tree across the lanes is logged
+(one JSON line with LOG_JSON=true); see scripts/tracing.py.
+
+Prometheus metrics are served on /metrics. Set PROMETHEUS_MULTIPROC_DIR
+to an empty directory before start-up so samples recorded in the pool
+workers are included.
+
+Usage:
+    python scripts/api_server.py
+    curl -X POST --data-binary @contract.pdf -H "Content-Type: application/pdf" localhost:8000/extract
+    curl -X POST --data-binary @scan.pdf -H "X-Tenant-ID: acme" "localhost:8000/jobs?priority=low"
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+# Settings live in the lexiscan-auto scripts package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lexiscan-auto" / "scripts"))
+from src.utils.config import settings  # noqa: E402
+from src.utils.logger import setup_logging  # noqa: E402
+import metrics  # noqa: E402
+import pipeline  # noqa: E402
+import tracing  # noqa: E402
+from scheduler import Lane, LaneFull, PRIORITIES, Scheduler  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 1000
+
+
+def _busy(error: LaneFull) -> HTTPException:
+    """429 response for a full lane"""
+    return HTTPException(
+        status_code=429,
+        detail={'error': 'Server busy, retry later', 'lane': error.lane, 'queue_depth': error.queued}
+    )
+
+
+class ExtractionService:
+    """Lane pools, the scheduler and the in-memory job table"""
+
+    def __init__(self):
+        self.scheduler = None
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self.tasks = set()
+
+    def start(self):
+        cache_dir = str(settings.cache_dir) if settings.cache_enabled else None
+        ocr_options = pipeline.ocr_options_from_settings(settings)
+        trace_options = pipeline.trace_options_from_settings(settings)
+        transformer_options = pipeline.transformer_options_from_settings(settings)
+        tracing.configure(**trace_options)
+
+        if settings.api_prewarm and multiprocessing.get_start_method() == "fork":
+            # Prefork: workers inherit the imported libraries instead of importing them again
+            pipeline.warm_up(settings.ner_mode, ner=False)
+
+        def lane(name: str, workers: int, max_queue: int, ner: bool) -> Lane:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=pipeline.init_worker,
+                initargs=(
+                    ocr_options, cache_dir, settings.cache_max_size_mb, settings.ner_mode, ner, not ner, trace_options,
+                    None, transformer_options
+                )
+            )
+            return Lane(name, pool, workers, max_queue)
+
+        self.scheduler = Scheduler(
+            {
+                'native': lane('native', settings.api_native_workers, settings.api_native_queue, False),
+                'ocr': lane('ocr', settings.api_workers, settings.api_max_queue, False),
+                'ner': lane('ner', settings.api_ner_workers, settings.api_ner_queue, True),
+            },
+            ocr_chunk_pages=settings.api_ocr_chunk_pages,
+            max_in_flight=settings.api_max_in_flight,
+            tenant_priorities=settings.api_tenant_priorities,
+            chunk_aging_s=settings.api_chunk_aging_s
+        )
+        if settings.api_prewarm:
+            self.prewarm()
+
+    def prewarm(self):
+        """Start every lane's workers and wait for their models to load"""
+        start = time.perf_counter()
+        for lane in self.scheduler.lanes.values():
+            pids = pipeline.start_workers(lane.executor, lane.concurrency)
+            logger.info(f"✓ Lane {lane.name}: {len(pids)} workers ready")
+        logger.info(f"Workers warmed up in {time.perf_counter() - start:.1f}s")
+
+    def shutdown(self):
+        if self.scheduler:
+            for lane in self.scheduler.lanes.values():
+                lane.executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def queue_depth(self) -> int:
+        """Work items waiting across all lanes"""
+        return sum(lane.queued for lane in self.scheduler.lanes.values())
+
+    def reserve(self):
+        """Claim a document slot or raise 429 when the scheduler is saturated"""
+        try:
+            self.scheduler.admit()
+        except LaneFull as e:
+            raise _busy(e)
+
+    def release(self):
+        self.scheduler.release()
+
+    async def run(self, pdf_path: str, priority: str = "normal", tenant: Optional[str] = None) -> Dict:
+        """Run the document through the lanes; releases the slot and the upload when done"""
+        try:
+            return await self.scheduler.process(pdf_path, priority, tenant)
+        except LaneFull as e:
+            raise _busy(e)
+        finally:
+            os.remove(pdf_path)
+
+    async def run_job(self, job_id: str, pdf_path: str, priority: str, tenant: Optional[str]):
+        job = self.jobs[job_id]
+        try:
+            job['result'] = await self.run(pdf_path, priority, tenant)
+            job['status'] = 'done'
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            job['status'] = 'failed'
+            job['error'] = str(e)
+
+        # Keep the job table bounded
+        finished = [jid for jid, j in self.jobs.items() if j['status'] in ('done', 'failed')]
+        for jid in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[jid]
+
+
+service = ExtractionService()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    service.start()
+    yield
+    service.shutdown()
+
+
+app = FastAPI(title="LexiScan Auto", lifespan=lifespan)
+app.mount("/metrics", metrics.metrics_app())
+
+
+async def _save_upload(request: Request) -> str:
+    """Stream the request body to a temp file, enforcing max_file_size_mb"""
+    max_bytes = settings.max_file_size_mb * 1024 * 1024
+
+    declared = request.headers.get('content-length')
+    if declared:
+        try:
+            declared = int(declared)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if declared and declared > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File exceeds {settings.max_file_size_mb} MB")
+
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"File exceeds {settings.max_file_size_mb} MB")
+                f.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    if size == 0:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail="Empty upload")
+    return path
+
+
+def _job_options(request: Request):
+    """(priority, tenant) from the query string and X-Tenant-ID header"""
+    priority = request.query_params.get('priority', 'normal')
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {list(PRIORITIES)}")
+    return priority, request.headers.get('x-tenant-id')
+
+
+async def _accept_upload(request: Request) -> str:
+    """Reserve a document slot, then receive the upload"""
+    service.reserve()
+    try:
+        return await _save_upload(request)
+    except BaseException:
+        service.release()
+        raise
+
+
+@app.get("/health")
+async def health():
+    return {
+        'status': 'ok',
+        'queue_depth': service.queue_depth,
+        **service.scheduler.stats()
+    }
+
+
+@app.post("/extract")
+async def extract(request: Request):
+    """Synchronous extraction: waits for OCR + NER and returns the result"""
+    priority, tenant = _job_options(request)
+    pdf_path = await _accept_upload(request)
+    result = await service.run(pdf_path, priority, tenant)
+
+    if not result['success']:
+        return JSONResponse(status_code=422, content=result)
+    return result
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: Request):
+    """Asynchronous extraction: returns a job id to poll"""
+    priority, tenant = _job_options(request)
+    pdf_path = await _accept_upload(request)
+
+    job_id = uuid.uuid4().hex
+    service.jobs[job_id] = {'job_id': job_id, 'status': 'queued', 'priority': priority}
+    task = asyncio.create_task(service.run_job(job_id, pdf_path, priority, tenant))
+    service.tasks.add(task)
+    task.add_done_callback(service.tasks.discard)
+
+    return {'job_id': job_id, 'status': 'queued', 'queue_depth': service.queue_depth}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = service.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    setup_logging(settings.log_level, json_format=settings.log_json)
+    # log_config=None: uvicorn's loggers go through the handlers set up above
+    uvicorn.run(app, host=settings.api_host, port=settings.api_port, log_config=None)
@@ -0,0 +1,266 @@
+"""
+Resumable bulk runner: OCR + NER over a directory or manifest of PDFs.
+
+Documents run concurrently on a process pool. Each finished document is
+appended to the JSONL output right away, then recorded in a checkpoint
+file. Re-running the same command skips everything already in the
+checkpoint, so an interrupted run resumes where it stopped. A failing file
+is written as a failed record and never aborts the run.
+
+Usage:
+    python scripts/batch_runner.py contracts/ --output results.jsonl --workers 8
+    python scripts/batch_runner.py manifest.txt --output results.jsonl --retry-failed
+    python scripts/batch_runner.py contracts/ --output results.jsonl --columnar results.cols
+    python scripts/batch_runner.py revised/ --output results.jsonl --page-store
+
+With --columnar the whole JSONL output is also converted to a columnar
+store (see columnar_store.py) once the run finishes. With --page-store,
+pages unchanged since an earlier revision are reused from PAGE_STORE_DIR
+instead of being extracted and tagged again (see page_store.py).
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Set, Tuple
+
+import pipeline
+
+# Settings live in the lexiscan-auto scripts package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lexiscan-auto" / "scripts"))
+from src.utils.config import settings  # noqa: E402
+from src.utils.logger import setup_logging  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def collect_inputs(source: str) -> List[str]:
+    """
+    PDFs to process, in a stable order.
+
+    Args:
+        source: A directory (searched recursively for *.pdf), a text manifest
+            with one path per line, or a JSON manifest (list of paths or of
+            {'path': ...} entries, as written by benchmark_corpus)
+    """
+    path = Path(source)
+    if path.is_dir():
+        return sorted(str(p) for p in path.rglob("*.pdf"))
+
+    if path.suffix == ".json":
+        entries = json.loads(path.read_text(encoding="utf-8"))
+        return [entry['path'] if isinstance(entry, dict) else entry for entry in entries]
+
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def load_checkpoint(checkpoint_path: Path) -> Tuple[Set[str], Set[str]]:
+    """(succeeded, failed) paths recorded by earlier runs"""
+    succeeded, failed = set(), set()
+    if not checkpoint_path.exists():
+        return succeeded, failed
+
+    with open(checkpoint_path, encoding="utf-8") as f:
+        for line in f:
+            status, _, pdf_path = line.rstrip("\n").partition("\t")
+            if not pdf_path:
+                # Torn last line from a killed run
+                continue
+            if status == "ok":
+                succeeded.add(pdf_path)
+                failed.discard(pdf_path)
+            else:
+                failed.add(pdf_path)
+    return succeeded, failed
+
+
+class BatchWriter:
+    """Appends results to the JSONL output, then marks them in the checkpoint"""
+
+    def __init__(self, output_path: Path, checkpoint_path: Path):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.output = open(output_path, "a", encoding="utf-8")
+        self.checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+
+    def write(self, pdf_path: str, result: Dict):
+        record = {'path': pdf_path, **result}
+        self.output.write(json.dumps(record) + "\n")
+        self.output.flush()
+        os.fsync(self.output.fileno())
+
+        # Checkpoint only after the result is on disk (at-least-once output)
+        status = "ok" if result.get('success') else "failed"
+        self.checkpoint.write(f"{status}\t{pdf_path}\n")
+        self.checkpoint.flush()
+
+    def close(self):
+        self.output.close()
+        self.checkpoint.close()
+
+
+def _run_isolated(suspects: Deque[str], pool_args: Tuple) -> Iterator[Tuple[str, Dict]]:
+    """
+    Rerun documents that were on a pool when a worker died, one at a time
+    on a single worker. Only a document that crashes its worker again here
+    is reported as failed.
+    """
+    pool = None
+    try:
+        while suspects:
+            pdf_path = suspects.popleft()
+            if pool is None:
+                pool = ProcessPoolExecutor(max_workers=1, initializer=pipeline.init_worker, initargs=pool_args)
+            try:
+                result = pool.submit(pipeline.process_pdf, pdf_path).result()
+            except BrokenProcessPool:
+                logger.error(f"Worker process crashed on {pdf_path}")
+                result = {'success': False, 'error': 'Worker process crashed'}
+                pool.shutdown(wait=False)
+                pool = None
+            yield pdf_path, result
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_pool(todo: List[str], workers: int, pool_args: Tuple) -> Iterator[Tuple[str, Dict]]:
+    """
+    Process `todo` on a pool, yielding (path, result) as documents finish.
+    At most 2 documents per worker are queued at a time, and a new one is
+    submitted whenever one finishes. If a worker process dies, the pool
+    cannot tell which document killed it: every document it still had is
+    rerun on its own (_run_isolated) before the pool is restarted for the rest.
+    """
+    remaining = deque(todo)
+
+    while remaining:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=pipeline.init_worker, initargs=pool_args)
+        pending = {}
+        suspects = deque()
+        broken = False
+        try:
+            while (remaining and not suspects and not broken) or pending:
+                while remaining and not suspects and not broken and len(pending) < workers * 2:
+                    try:
+                        future = pool.submit(pipeline.process_pdf, remaining[0])
+                    except BrokenProcessPool:
+                        broken = True
+                        break
+                    pending[future] = remaining.popleft()
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pdf_path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        suspects.append(pdf_path)
+                        continue
+                    yield pdf_path, result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if suspects:
+            logger.error(f"Worker process crashed; rerunning {len(suspects)} documents one at a time")
+            yield from _run_isolated(suspects, pool_args)
+
+
+def run_batch(
+        source: str,
+        output_path: str,
+        checkpoint_path: str = None,
+        workers: int = 4,
+        retry_failed: bool = False,
+        ocr_options: Dict = None,
+        cache_dir: str = None,
+        page_store_dir: str = None
+) -> Dict:
+    """
+    Process every PDF from `source` not yet in the checkpoint.
+    Returns run statistics.
+    """
+    output_path = Path(output_path)
+    checkpoint_path = Path(checkpoint_path or f"{output_path}.checkpoint")
+
+    inputs = collect_inputs(source)
+    succeeded, failed = load_checkpoint(checkpoint_path)
+    done = succeeded if retry_failed else succeeded | failed
+    todo = [pdf_path for pdf_path in inputs if pdf_path not in done]
+
+    logger.info(
+        f"📄 {len(inputs)} documents, {len(inputs) - len(todo)} already done, {len(todo)} to process"
+    )
+
+    stats = {'total': len(inputs), 'skipped': len(inputs) - len(todo), 'succeeded': 0, 'failed': 0}
+    if not todo:
+        return stats
+
+    pool_args = (
+        ocr_options or {}, cache_dir, settings.cache_max_size_mb, settings.ner_mode, True, True,
+        pipeline.trace_options_from_settings(settings), page_store_dir,
+        pipeline.transformer_options_from_settings(settings)
+    )
+    writer = BatchWriter(output_path, checkpoint_path)
+    start = time.perf_counter()
+
+    try:
+        for count, (pdf_path, result) in enumerate(_run_pool(todo, workers, pool_args), 1):
+            writer.write(pdf_path, result)
+
+            if result.get('success'):
+                stats['succeeded'] += 1
+            else:
+                stats['failed'] += 1
+                logger.warning(f"⚠ {pdf_path}: {result.get('error')}")
+
+            if count % 100 == 0 or count == len(todo):
+                elapsed = time.perf_counter() - start
+                logger.info(f"{count}/{len(todo)} documents ({count / elapsed * 3600:.0f} docs/hour)")
+    finally:
+        writer.close()
+
+    stats['elapsed_s'] = round(time.perf_counter() - start, 1)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process a directory or manifest of contract PDFs")
+    parser.add_argument("source", help="Directory of PDFs or manifest file (.txt / .json)")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--retry-failed", action="store_true", help="Reprocess documents that failed before")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the result cache")
+    parser.add_argument("--columnar", help="Also write all results as a columnar store in this directory")
+    parser.add_argument("--page-store", action="store_true", help="Reuse unchanged pages from PAGE_STORE_DIR")
+    args = parser.parse_args()
+
+    setup_logging(settings.log_level, json_format=settings.log_json)
+
+    use_cache = settings.cache_enabled and not args.no_cache
+    stats = run_batch(
+        args.source,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        retry_failed=args.retry_failed,
+        ocr_options=pipeline.ocr_options_from_settings(settings),
+        cache_dir=str(settings.cache_dir) if use_cache else None,
+        page_store_dir=str(settings.page_store_dir) if args.page_store else None
+    )
+    if args.columnar and Path(args.output).exists():
+        from columnar_store import write_columnar
+
+        stats['columnar_rows'] = write_columnar(args.output, args.columnar)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
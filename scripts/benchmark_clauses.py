@@ -0,0 +1,87 @@
+"""
+Termination clause extraction benchmark on long multi-page contracts.
+
+Compares clause_extractor with the previous approach (Matcher with an
+open-ended `termination IS_ALPHA*` pattern, .sent from the dependency
+parser, set() dedup). The old path needs en_core_web_sm and is skipped
+when it is not installed.
+
+Usage:
+    python scripts/benchmark_clauses.py --pages 1 10 50 200
+"""
+import argparse
+import random
+import time
+
+from benchmark_corpus import contract_lines
+from clause_extractor import extract_termination_clauses
+
+LEGACY_PATTERNS = [
+    [{"LOWER": "termination"}, {"IS_PUNCT": True, "OP": "?"}, {"IS_ALPHA": True, "OP": "*"}]
+]
+
+
+def legacy_extractor():
+    """Matcher + parser clause extraction as NER_Algo did it, or None without the model"""
+    try:
+        import spacy
+        from spacy.matcher import Matcher
+
+        nlp = spacy.load("en_core_web_sm", enable=["tok2vec", "parser"])
+    except (ImportError, OSError):
+        return None
+
+    nlp.max_length = 10_000_000
+    matcher = Matcher(nlp.vocab)
+    matcher.add("TERMINATION_CLAUSE", LEGACY_PATTERNS)
+
+    def extract(text):
+        doc = nlp(text)
+        matches = matcher(doc)
+        clauses = {doc[start:end].sent.text.strip() for _, start, end in matches}
+        return len(matches), clauses
+
+    return extract
+
+
+def best_of(fn, text, repeat):
+    """Fastest of `repeat` runs (seconds) and the last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark termination clause extraction")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    legacy = legacy_extractor()
+    if legacy is None:
+        print("en_core_web_sm not installed: legacy Matcher + parser timings skipped")
+
+    print(f"{'pages':>6} {'chars':>9} {'clauses':>8} {'regex ms':>9} {'MB/s':>7}"
+          + (f" {'legacy ms':>10} {'matches':>8} {'speed-up':>9}" if legacy else ""))
+
+    for pages in args.pages:
+        text = "\n".join(contract_lines(pages))
+
+        seconds, clauses = best_of(extract_termination_clauses, text, args.repeat)
+        row = (f"{pages:>6} {len(text):>9} {len(clauses):>8} {seconds * 1000:>9.2f} "
+               f"{len(text) / seconds / 1e6:>7.1f}")
+
+        if legacy:
+            legacy_seconds, (matches, _) = best_of(legacy, text, 1)
+            row += f" {legacy_seconds * 1000:>10.1f} {matches:>8} {legacy_seconds / seconds:>8.0f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Synthetic contract corpus for benchmarks and load tests.
+
+Text comes from the create_sample_data templates; PDFs are rendered with
+create_test_pdf.write_contract_pdf. "Scanned" variants are the same PDFs
+rasterized to images (with light noise) and saved back as image-only PDFs.
+"""
+import json
+import random
+import sys
+import textwrap
+from pathlib import Path
+from typing import Dict, List
+
+from create_sample_data import create_training_sample, fake, TEMPLATES
+
+# create_test_pdf lives in the lexiscan-auto scripts folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lexiscan-auto" / "scripts"))
+from create_test_pdf import write_contract_pdf  # noqa: E402
+
+LINES_PER_PAGE = 36
+LINE_WIDTH = 85
+
+
+def contract_lines(num_pages: int, start: int = 0) -> List[str]:
+    """Wrapped template text, enough to fill `num_pages` pages"""
+    lines = []
+    i = start
+    while len(lines) < num_pages * LINES_PER_PAGE:
+        text = create_training_sample(TEMPLATES[i % len(TEMPLATES)])["text"]
+        for paragraph in text.split("\n"):
+            lines.extend(textwrap.wrap(paragraph, LINE_WIDTH) or [""])
+        i += 1
+    return lines[:num_pages * LINES_PER_PAGE]
+
+
+def build_native_pdf(pdf_path, num_pages: int, start: int = 0) -> str:
+    """Render a `num_pages` page digital contract"""
+    lines = contract_lines(num_pages, start)
+    breaks = range(LINES_PER_PAGE, len(lines), LINES_PER_PAGE)
+    write_contract_pdf(pdf_path, "SERVICE AGREEMENT", lines, page_breaks=breaks)
+    return str(pdf_path)
+
+
+def rasterize_pdf(native_path, scanned_path, dpi: int = 200, noise: int = 12, seed: int = 0) -> str:
+    """Turn a digital PDF into an image-only "scan" with mild sensor noise"""
+    import numpy as np
+    from pdf2image import convert_from_path
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    pages = []
+    for image in convert_from_path(str(native_path), dpi=dpi, grayscale=True):
+        pixels = np.asarray(image, dtype=np.int16)
+        pixels = pixels + rng.integers(-noise, noise + 1, pixels.shape)
+        pages.append(Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)))
+
+    pages[0].save(str(scanned_path), save_all=True, append_images=pages[1:], resolution=dpi)
+    return str(scanned_path)
+
+
+def build_corpus(
+        directory,
+        docs: int,
+        page_counts=(1, 5, 20),
+        variants=("native", "scanned"),
+        seed: int = 0
+) -> List[Dict]:
+    """
+    Write `docs` PDFs per (variant, page count) into `directory`.
+
+    Returns a manifest: [{'path', 'variant', 'pages'}, ...], also saved
+    as manifest.json so a corpus can be reused between runs.
+    """
+    random.seed(seed)
+    fake.seed_instance(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    manifest = []
+    for num_pages in page_counts:
+        for i in range(docs):
+            native_path = directory / f"native_{num_pages:03d}p_{i:05d}.pdf"
+            build_native_pdf(native_path, num_pages, start=i)
+
+            if "native" in variants:
+                manifest.append({'path': str(native_path), 'variant': 'native', 'pages': num_pages})
+            if "scanned" in variants:
+                scanned_path = directory / f"scanned_{num_pages:03d}p_{i:05d}.pdf"
+                rasterize_pdf(native_path, scanned_path, seed=seed + i)
+                manifest.append({'path': str(scanned_path), 'variant': 'scanned', 'pages': num_pages})
+
+    with open(directory / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,84 @@
+"""
+NER latency benchmark.
+
+Usage:
+    python scripts/benchmark_ner.py --runs 50
+    python scripts/benchmark_ner.py --batch 5000 --batch-size 128 --n-process 4
+"""
+import argparse
+import statistics
+import time
+
+from create_sample_data import create_training_sample, TEMPLATES
+import nlp_registry
+from NER_Algo import NER_Algo, NER_Algo_batch
+
+
+def sample_texts(count):
+    """Generate `count` contract texts from the sample templates"""
+    return [
+        create_training_sample(TEMPLATES[i % len(TEMPLATES)])["text"]
+        for i in range(count)
+    ]
+
+
+def bench_cold_vs_warm(texts):
+    """Time the first NER_Algo call (model load) against the steady state"""
+    nlp_registry.clear()
+
+    start = time.perf_counter()
+    NER_Algo(texts[0])
+    first_call = time.perf_counter() - start
+
+    steady = []
+    for text in texts[1:]:
+        start = time.perf_counter()
+        NER_Algo(text)
+        steady.append(time.perf_counter() - start)
+
+    print("===== NER_Algo LATENCY =====")
+    print(f"First call (includes model load): {first_call * 1000:.1f} ms")
+    if steady:
+        print(f"Steady state mean:                {statistics.mean(steady) * 1000:.1f} ms")
+        print(f"Steady state p50:                 {statistics.median(steady) * 1000:.1f} ms")
+        print(f"Steady state max:                 {max(steady) * 1000:.1f} ms")
+        print(f"Speed-up vs loading every call:   {first_call / statistics.mean(steady):.1f}x")
+
+
+def bench_batch(texts, batch_size, n_process):
+    """Compare a Python loop over NER_Algo with NER_Algo_batch"""
+    nlp_registry.warm_up()
+
+    start = time.perf_counter()
+    for text in texts:
+        NER_Algo(text)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    count = sum(1 for _ in NER_Algo_batch(texts, batch_size=batch_size, n_process=n_process))
+    batch_time = time.perf_counter() - start
+
+    print("===== NER THROUGHPUT =====")
+    print(f"Documents:          {count}")
+    print(f"Loop over NER_Algo: {len(texts) / loop_time:.1f} docs/sec")
+    print(f"NER_Algo_batch:     {count / batch_time:.1f} docs/sec "
+          f"(batch_size={batch_size}, n_process={n_process})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NER_Algo latency")
+    parser.add_argument("--runs", type=int, default=50, help="Number of contracts to process")
+    parser.add_argument("--batch", type=int, default=0, help="Also benchmark batching on this many contracts")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    texts = sample_texts(max(args.runs, 2))
+    bench_cold_vs_warm(texts)
+
+    if args.batch:
+        bench_batch(sample_texts(args.batch), args.batch_size, args.n_process)
+
+
+if __name__ == "__main__":
+    main()
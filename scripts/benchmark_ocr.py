@@ -0,0 +1,98 @@
+"""
+OCR throughput benchmark across page counts and worker counts.
+
+Usage:
+    python scripts/benchmark_ocr.py --pages 1 10 40 --workers 1 2 4 8
+    python scripts/benchmark_ocr.py --pages 10 --adaptive-dpi 150
+"""
+import argparse
+import difflib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark_corpus import build_native_pdf, rasterize_pdf
+from ocr_processor import OCRProcessor
+
+
+def build_pdf(directory, num_pages):
+    """Write a `num_pages` page contract and return its path"""
+    return build_native_pdf(Path(directory) / f"contract_{num_pages}p.pdf", num_pages)
+
+
+def word_accuracy(reference, candidate):
+    """Word-level similarity (0-1) of two OCR texts"""
+    return difflib.SequenceMatcher(None, reference.split(), candidate.split(), autojunk=False).ratio()
+
+
+def bench_adaptive(directory, num_pages, dpi, adaptive_dpi):
+    """Full-DPI OCR vs adaptive (low-DPI first, full DPI only for weak pages) on a scanned PDF"""
+    scanned = rasterize_pdf(build_pdf(directory, num_pages), Path(directory) / f"scanned_{num_pages}p.pdf")
+
+    runs = {}
+    for label, processor in (
+            ("full", OCRProcessor(dpi=dpi)),
+            ("adaptive", OCRProcessor(dpi=dpi, adaptive_dpi=adaptive_dpi)),
+    ):
+        start = time.perf_counter()
+        result = processor.extract_text_ocr(scanned)
+        runs[label] = (time.perf_counter() - start, result)
+
+    full_time, full = runs["full"]
+    adaptive_time, adaptive = runs["adaptive"]
+    full_text = {page['page']: page['text'] for page in full['pages']}
+    rescanned = sum(1 for page in adaptive['pages'] if page.get('dpi') == dpi)
+    accuracy = [
+        word_accuracy(full_text.get(page['page'], ''), page['text']) for page in adaptive['pages']
+    ]
+
+    print(
+        f"{num_pages:>6} {full_time:>9.2f} {adaptive_time:>9.2f} {1 - adaptive_time / full_time:>8.0%} "
+        f"{rescanned:>10} {sum(accuracy) / max(1, len(accuracy)):>9.1%}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page-level OCR")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 40])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--adaptive-dpi", type=int, help="Compare full-DPI OCR with adaptive DPI instead")
+    args = parser.parse_args()
+
+    if args.adaptive_dpi:
+        print(f"Adaptive {args.adaptive_dpi} → {args.dpi} DPI vs fixed {args.dpi} DPI (scanned pages)")
+        print(f"{'pages':>6} {'full s':>9} {'adapt s':>9} {'saved':>8} {'re-scanned':>10} {'accuracy':>9}")
+        with tempfile.TemporaryDirectory() as tmp:
+            for num_pages in args.pages:
+                bench_adaptive(tmp, num_pages, args.dpi, args.adaptive_dpi)
+        return
+
+    print(f"{'pages':>6} {'workers':>8} {'seconds':>9} {'pages/sec':>10} {'speed-up':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_pages in args.pages:
+            pdf_path = build_pdf(tmp, num_pages)
+            baseline = None
+
+            for workers in sorted(set(args.workers)):
+                processor = OCRProcessor(dpi=args.dpi, workers=workers)
+
+                start = time.perf_counter()
+                result = processor.extract_text_ocr(pdf_path)
+                elapsed = time.perf_counter() - start
+
+                if not result['success']:
+                    print(f"✗ {num_pages} pages / {workers} workers: {result['error']}")
+                    continue
+
+                baseline = baseline or elapsed
+                print(
+                    f"{num_pages:>6} {workers:>8} {elapsed:>9.2f} "
+                    f"{num_pages / elapsed:>10.2f} {baseline / elapsed:>8.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
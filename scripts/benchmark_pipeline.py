@@ -0,0 +1,164 @@
+"""
+End-to-end pipeline benchmark on a synthetic contract corpus.
+
+Measures OCRProcessor.process_document, NER_Algo and the combined pipeline
+per (variant, page count) and writes p50/p95 latency, throughput and peak
+RSS as JSON so runs can be compared.
+
+Usage:
+    python scripts/benchmark_pipeline.py --docs 20 --pages 1 5 20 --output bench.json
+    python scripts/benchmark_pipeline.py --corpus-dir /tmp/corpus --reuse-corpus
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmark_corpus import build_corpus
+import nlp_registry
+from NER_Algo import NER_Algo
+from ocr_processor import OCRProcessor
+
+TARGET_DOCS_PER_HOUR = 1000
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process and its finished children (Linux: KB)"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max(own, children) / scale, 1)
+
+
+def summarize(latencies):
+    total = sum(latencies)
+    return {
+        'count': len(latencies),
+        'p50_s': round(statistics.median(latencies), 4),
+        'p95_s': round(percentile(latencies, 95), 4),
+        'mean_s': round(statistics.mean(latencies), 4),
+        'docs_per_hour': round(len(latencies) / total * 3600, 1) if total else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def run(manifest, processor):
+    """Time extraction, NER and the combined pipeline for every corpus document"""
+    timings = defaultdict(lambda: defaultdict(list))
+    failures = 0
+
+    for item in manifest:
+        group = f"{item['variant']}/{item['pages']}p"
+
+        start = time.perf_counter()
+        result = processor.process_document(item['path'])
+        extraction = time.perf_counter() - start
+
+        if not result['success']:
+            failures += 1
+            continue
+
+        text = "\n\n".join(page['text'] for page in result['pages'])
+        start = time.perf_counter()
+        NER_Algo(text)
+        ner = time.perf_counter() - start
+
+        for stage, elapsed in (('extraction', extraction), ('ner', ner), ('pipeline', extraction + ner)):
+            timings[group][stage].append(elapsed)
+            timings['all'][stage].append(elapsed)
+
+    return timings, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end LexiScan benchmark")
+    parser.add_argument("--docs", type=int, default=10, help="Documents per (variant, page count)")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--variants", nargs="+", default=["native", "scanned"], choices=["native", "scanned"])
+    parser.add_argument("--workers", type=int, default=1, help="OCRProcessor page workers")
+    parser.add_argument("--corpus-dir", help="Keep the corpus here instead of a temp directory")
+    parser.add_argument("--reuse-corpus", action="store_true", help="Reuse manifest.json in --corpus-dir")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: stdout)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = Path(args.corpus_dir or tmp)
+        manifest_path = corpus_dir / "manifest.json"
+
+        start = time.perf_counter()
+        if args.reuse_corpus and manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        else:
+            manifest = build_corpus(corpus_dir, args.docs, args.pages, args.variants)
+        corpus_seconds = time.perf_counter() - start
+
+        processor = OCRProcessor(workers=args.workers)
+        nlp_registry.warm_up()
+
+        start = time.perf_counter()
+        timings, failures = run(manifest, processor)
+        wall = time.perf_counter() - start
+
+    # .get: every document may have failed, leaving no 'all' group
+    processed = len(timings.get('all', {}).get('pipeline', []))
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'docs': args.docs,
+            'pages': args.pages,
+            'variants': args.variants,
+            'workers': args.workers,
+            'dpi': processor.dpi,
+        },
+        'corpus_build_s': round(corpus_seconds, 2),
+        'documents': len(manifest),
+        'failures': failures,
+        'wall_s': round(wall, 2),
+        'throughput_docs_per_hour': round(processed / wall * 3600, 1) if wall else None,
+        'meets_target': processed / wall * 3600 >= TARGET_DOCS_PER_HOUR if wall else False,
+        'peak_rss_mb': peak_rss_mb(),
+        'groups': {
+            group: {stage: summarize(values) for stage, values in stages.items() if values}
+            for group, stages in sorted(timings.items())
+            if any(stages.values())
+        },
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"✓ Report written to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Preprocessing micro-benchmark: PIL filter chain vs the NumPy engine on 300-DPI pages.
+
+Usage:
+    python scripts/benchmark_preprocess.py --runs 10
+    python scripts/benchmark_preprocess.py --pdf lexiscan-auto/data/raw/sample_contract.pdf
+"""
+import argparse
+import functools
+import statistics
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+import image_preprocessing
+
+LETTER_300DPI = (2550, 3300)
+
+
+def synthetic_page(noise=12, seed=0):
+    """A letter-size 300-DPI page of text lines with scanner-like noise"""
+    image = Image.new('RGB', LETTER_300DPI, 'white')
+    draw = ImageDraw.Draw(image)
+    line = "TERMINATION: Either party may terminate this Agreement upon thirty (30) days notice. "
+    for y in range(150, LETTER_300DPI[1] - 150, 60):
+        draw.text((150, y), line * 2, fill=(25, 25, 25))
+
+    rng = np.random.default_rng(seed)
+    pixels = np.asarray(image, dtype=np.int16) + rng.integers(-noise, noise, (LETTER_300DPI[1], LETTER_300DPI[0], 3))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def time_it(fn, page, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(page)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR page preprocessing")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--pdf", help="Use the first page of this PDF (rendered at 300 DPI)")
+    args = parser.parse_args()
+
+    if args.pdf:
+        from pdf2image import convert_from_path
+        page = convert_from_path(args.pdf, dpi=300, first_page=1, last_page=1)[0]
+    else:
+        page = synthetic_page()
+
+    # The engines directly, not through OCRProcessor (which needs Tesseract installed)
+    baseline_time = time_it(image_preprocessing.pil_preprocess_image, page, args.runs)
+    baseline = np.asarray(image_preprocessing.pil_preprocess_image(page))
+
+    print(f"Page: {page.size[0]}x{page.size[1]} px, {args.runs} runs (median)")
+    print(f"{'engine':<16} {'ms/page':>9} {'speed-up':>9} {'pixels same as PIL':>19}")
+    print(f"{'pil':<16} {baseline_time * 1000:>9.1f} {1.0:>8.1f}x {100.0:>18.1f}%")
+
+    for threshold in image_preprocessing.THRESHOLDS:
+        preprocess = functools.partial(image_preprocessing.preprocess_image, threshold=threshold)
+        elapsed = time_it(preprocess, page, args.runs)
+        agreement = (np.asarray(preprocess(page)) == baseline).mean() * 100
+        print(
+            f"{'numpy/' + threshold:<16} {elapsed * 1000:>9.1f} "
+            f"{baseline_time / elapsed:>8.1f}x {agreement:>18.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Cold-start benchmark: import time of the entry modules and worker warm-up.
+
+Each measurement runs in a fresh interpreter. Import times come from
+`python -X importtime`; for every module the report lists its cumulative
+import time and the heaviest modules it imports directly. Warm-up is the
+time pipeline.warm_up takes in a fresh process (libraries + NER model).
+
+With --history, each run is appended as one JSON line and compared with
+the previous line, so start-up regressions show up commit by commit.
+--max-regression makes the script exit non-zero when a module's import
+got slower than that.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 5 --history data/startup_history.jsonl --max-regression 25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmark_pipeline import git_commit
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+SETTINGS_DIR = SCRIPTS_DIR.parent / "lexiscan-auto" / "scripts"
+
+MODULES = ["ocr_processor", "pipeline", "chunked_ner", "NER_Algo", "scheduler", "api_server"]
+TOP_IMPORTS = 5
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SCRIPTS_DIR), str(SETTINGS_DIR), env.get("PYTHONPATH")]))
+    return env
+
+
+def parse_importtime(stderr: str, module: str):
+    """
+    (cumulative us of `module`, {direct import: cumulative us}) from -X importtime output.
+    Imports are listed after the modules they pull in, one indent level deeper.
+    """
+    children = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == module:
+                return int(cumulative), children
+            children = {}
+        elif depth == 1:
+            children[name] = int(cumulative)
+    raise ValueError(f"{module} not found in -X importtime output")
+
+
+def measure_import(module: str):
+    """Import `module` in a fresh interpreter: (wall seconds, cumulative us, direct imports)"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR, env=_env(), capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    cumulative, children = parse_importtime(proc.stderr, module)
+    return wall, cumulative, children
+
+
+def measure_warm_up(ner_mode: str):
+    """Seconds for pipeline.warm_up in a fresh interpreter (imports included)"""
+    code = (
+        "import time; start = time.perf_counter(); import pipeline, transformer_ner; "
+        "from src.utils.config import settings; "
+        "transformer_ner.configure(**pipeline.transformer_options_from_settings(settings)); "
+        f"pipeline.warm_up({ner_mode!r}); print(time.perf_counter() - start)"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=SCRIPTS_DIR, env=_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def run(modules, runs: int, ner_mode: str):
+    report = {}
+    for module in modules:
+        try:
+            samples = [measure_import(module) for _ in range(runs)]
+        except Exception as e:
+            report[module] = {'error': str(e)}
+            continue
+
+        walls, cumulatives, _ = zip(*samples)
+        children = samples[cumulatives.index(sorted(cumulatives)[len(cumulatives) // 2])][2]
+        heaviest = sorted(children.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+        report[module] = {
+            'import_ms': round(statistics.median(cumulatives) / 1000, 1),
+            'process_ms': round(statistics.median(walls) * 1000, 1),
+            'heaviest_imports_ms': {name: round(us / 1000, 1) for name, us in heaviest},
+        }
+
+    try:
+        warm_up = {'seconds': round(statistics.median(measure_warm_up(ner_mode) for _ in range(runs)), 3)}
+    except Exception as e:
+        warm_up = {'error': str(e)}
+    return report, dict(warm_up, ner_mode=ner_mode)
+
+
+def compare(previous, current, max_regression: float):
+    """Print per-module changes against the previous run; return the modules over max_regression %"""
+    regressions = []
+    for module, stats in current['modules'].items():
+        before = previous.get('modules', {}).get(module, {}).get('import_ms')
+        after = stats.get('import_ms')
+        if not before or after is None:
+            continue
+        change = (after - before) / before * 100
+        print(f"  {module:<15} {before:>8.1f} ms -> {after:>8.1f} ms ({change:+.0f}%)")
+        if max_regression is not None and change > max_regression:
+            regressions.append(module)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LexiScan cold-start benchmark")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement (median)")
+    parser.add_argument("--ner-mode", default="full", choices=["full", "rules", "transformer"])
+    parser.add_argument("--history", help="Append the report to this JSON-lines file and compare with the last run")
+    parser.add_argument("--max-regression", type=float, help="Exit 1 if an import got this many percent slower")
+    args = parser.parse_args()
+
+    modules, warm_up = run(args.modules, args.runs, args.ner_mode)
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'runs': args.runs,
+        'modules': modules,
+        'warm_up': warm_up,
+    }
+    print(json.dumps(report, indent=2))
+
+    if not args.history:
+        return
+
+    history = Path(args.history)
+    lines = history.read_text(encoding="utf-8").splitlines() if history.exists() else []
+    regressions = []
+    if lines:
+        previous = json.loads(lines[-1])
+        print(f"Compared with {previous.get('commit')} ({previous.get('timestamp')}):")
+        regressions = compare(previous, report, args.max_regression)
+
+    history.parent.mkdir(parents=True, exist_ok=True)
+    with history.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(report) + "\n")
+
+    if regressions:
+        print(f"✗ Import time regressed more than {args.max_regression:.0f}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
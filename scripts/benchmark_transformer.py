@@ -0,0 +1,79 @@
+"""
+Transformer NER vs spaCy throughput on CPU.
+
+Runs the same generated contracts through NER_Algo_batch (spaCy) and
+through transformer_ner in fp32 and int8, and prints docs/sec for each.
+
+Usage:
+    python scripts/benchmark_transformer.py --docs 500 --batch-size 16 --threads 4
+    python scripts/benchmark_transformer.py --model-path data/models/ner_model --skip-fp32
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import nlp_registry
+import pipeline
+import transformer_ner
+from benchmark_ner import sample_texts
+from NER_Algo import NER_Algo_batch
+from transformer_ner import TransformerNER, get_engine
+
+# Settings live in the lexiscan-auto scripts package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lexiscan-auto" / "scripts"))
+from src.utils.config import settings  # noqa: E402
+
+
+def bench_spacy(texts, batch_size):
+    nlp_registry.warm_up()
+    start = time.perf_counter()
+    count = sum(1 for _ in NER_Algo_batch(texts, batch_size=batch_size, log_every=0))
+    return count / (time.perf_counter() - start)
+
+
+def bench_transformer(texts, engine):
+    engine.predict(texts[:engine.batch_size])  # warm-up
+    start = time.perf_counter()
+    spans = engine.predict(texts)
+    elapsed = time.perf_counter() - start
+    return len(texts) / elapsed, sum(len(doc_spans) for doc_spans in spans)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transformer NER against spaCy on CPU")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--model-path", help="Fine-tuned model directory (default: Settings.model_path)")
+    parser.add_argument("--skip-fp32", action="store_true", help="Only benchmark the int8 model")
+    args = parser.parse_args()
+
+    texts = sample_texts(args.docs)
+    transformer_ner.configure(**pipeline.transformer_options_from_settings(settings))
+    options = {'batch_size': args.batch_size, 'num_threads': args.threads}
+    if args.model_path:
+        options['model_path'] = args.model_path
+
+    print("===== NER THROUGHPUT (CPU) =====")
+    print(f"Documents: {len(texts)}, batch size: {args.batch_size}")
+    print(f"spaCy {nlp_registry.DEFAULT_MODEL}: {bench_spacy(texts, args.batch_size):.1f} docs/sec")
+
+    int8 = get_engine(quantize=True, **options)
+    int8_rate, int8_spans = bench_transformer(texts, int8)
+
+    if not args.skip_fp32:
+        fp32 = TransformerNER(
+            int8.model_path, int8.max_length, int8.min_confidence,
+            batch_size=args.batch_size, quantize=False, num_threads=args.threads
+        )
+        fp32_rate, fp32_spans = bench_transformer(texts, fp32)
+        print(f"Transformer fp32:   {fp32_rate:.1f} docs/sec ({fp32_spans} spans)")
+
+    print(f"Transformer int8:   {int8_rate:.1f} docs/sec ({int8_spans} spans)")
+    if not args.skip_fp32:
+        print(f"int8 speed-up:      {int8_rate / fp32_rate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Windowed NER for long contracts.
+
+The document's page texts are joined as in pipeline.process_pdf, then
+split into overlapping windows small enough for the model (a character
+budget for spaCy, about max_length tokens for the transformer). A window
+ends at a page break where one falls in its last quarter, otherwise at a
+blank line, sentence end or space. All windows of a document run as one
+batch.
+
+Entity spans are shifted back to document offsets and tagged with their
+page. Spans found twice in an overlap are deduplicated. When spans
+conflict, the one farther from its window's edge wins, because a span
+cut by a window edge is usually incomplete.
+
+Each window is processed once and the overlap is a fixed size, so time
+and memory grow linearly with document length. Termination clauses and
+rules-mode amounts/dates are already linear, so they run once over the
+full text.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, List, Sequence, Tuple
+
+import metrics
+import tracing
+from metrics import time_stage
+from clause_extractor import extract_termination_clauses
+from NER_Algo import NER_MODES, TRANSFORMER_LABELS, cache_settings
+from nlp_registry import get_pipeline
+from rule_extractor import extract_entities
+from transformer_ner import get_engine
+
+# Bump when windowing or merging changes, so cached results are not reused
+CHUNKING_VERSION = 1
+
+PAGE_SEPARATOR = "\n\n"
+
+SPACY_WINDOW_CHARS = 20000
+SPACY_BATCH_SIZE = 8
+TRANSFORMER_CHARS_PER_TOKEN = 3  # conservative for legal English, leaves room for word pieces
+DEFAULT_OVERLAP_CHARS = 300
+
+# spaCy / rule labels -> the transformer's label set
+LABELS = {'ORG': 'PARTY_NAME', 'MONEY': 'AMOUNT', 'DATE': 'DATE'}
+
+_WHITESPACE_RE = re.compile(r"\s")
+
+
+def join_pages(pages: Sequence[Dict]) -> Tuple[str, List[int], List[int]]:
+    """
+    Document text from OCRProcessor page dicts.
+
+    Returns:
+        (text, start offset of each page, page numbers)
+    """
+    parts = []
+    starts = []
+    numbers = []
+    offset = 0
+    for page in pages:
+        if parts:
+            parts.append(PAGE_SEPARATOR)
+            offset += len(PAGE_SEPARATOR)
+        starts.append(offset)
+        numbers.append(page['page'])
+        parts.append(page['text'])
+        offset += len(page['text'])
+    return ''.join(parts), starts, numbers
+
+
+def _boundary(text: str, lo: int, hi: int, page_starts: Sequence[int]) -> int:
+    """Best window end in (lo, hi]: page break, blank line, sentence end, space"""
+    index = bisect_right(page_starts, hi) - 1
+    if index >= 0 and page_starts[index] > lo:
+        return page_starts[index]
+
+    for separator in ("\n\n", ". ", "\n", " "):
+        position = text.rfind(separator, lo, hi)
+        if position != -1:
+            return position + len(separator)
+    return hi
+
+
+def make_windows(
+        text: str,
+        max_chars: int,
+        overlap: int = DEFAULT_OVERLAP_CHARS,
+        page_starts: Sequence[int] = ()
+) -> List[Tuple[int, int]]:
+    """
+    Split `text` into overlapping (start, end) windows of at most max_chars.
+    Consecutive windows share about `overlap` characters.
+    """
+    if overlap * 2 > max_chars:
+        raise ValueError("overlap must be at most half of max_chars")
+
+    windows = []
+    start = 0
+    while len(text) - start > max_chars:
+        hi = start + max_chars
+        end = _boundary(text, hi - max_chars // 4, hi, page_starts)
+        windows.append((start, end))
+
+        # Next window starts `overlap` back, at a word boundary
+        match = _WHITESPACE_RE.search(text, end - overlap, end)
+        start = match.end() if match else end - overlap
+
+    windows.append((start, len(text)))
+    return windows
+
+
+def _spacy_spans(texts: List[str]) -> List[List[Dict]]:
+    """
+    The same steps as nlp.pipe, run one at a time over all windows so a
+    trace shows tokenization and each enabled component separately.
+    """
+    nlp = get_pipeline().nlp
+    with time_stage("spacy_ner"):
+        with tracing.span("tokenize", texts=len(texts)) as span:
+            docs = [nlp.make_doc(text) for text in texts]
+            span.set(tokens=sum(len(doc) for doc in docs))
+        for name, component in nlp.pipeline:
+            with tracing.span(name):
+                if hasattr(component, "pipe"):
+                    docs = list(component.pipe(docs, batch_size=SPACY_BATCH_SIZE))
+                else:
+                    docs = [component(doc) for doc in docs]
+
+    return [
+        [
+            {'label': LABELS[ent.label_], 'start': ent.start_char, 'end': ent.end_char}
+            for ent in doc.ents
+            if ent.label_ in LABELS
+        ]
+        for doc in docs
+    ]
+
+
+def _transformer_spans(texts: List[str]) -> List[List[Dict]]:
+    with time_stage("transformer_ner"):
+        return get_engine().predict(texts)
+
+
+def merge_spans(text: str, windows: Sequence[Tuple[int, int]], window_spans: Sequence[List[Dict]]) -> List[Dict]:
+    """
+    Shift window-local spans to document offsets and resolve overlaps.
+
+    Overlapping spans are one entity seen twice (or two conflicting
+    predictions). Keep the one with the most context on both sides within
+    its window, then the longer, then the more confident.
+    """
+    candidates = []
+    for (window_start, window_end), spans in zip(windows, window_spans):
+        for span in spans:
+            start, end = window_start + span['start'], window_start + span['end']
+            left = start - window_start if window_start > 0 else len(text)
+            right = window_end - end if window_end < len(text) else len(text)
+            rank = (min(left, right), end - start, span.get('confidence', 1.0))
+            candidates.append((start, end, rank, span))
+
+    candidates.sort(key=lambda candidate: (candidate[0], -candidate[1]))
+
+    merged = []
+    for candidate in candidates:
+        if merged and candidate[0] < merged[-1][1]:
+            if candidate[2] > merged[-1][2]:
+                merged[-1] = candidate
+            continue
+        merged.append(candidate)
+
+    return [
+        dict(span, start=start, end=end, text=text[start:end])
+        for start, end, _, span in merged
+    ]
+
+
+def _add_pages(items: List[Dict], page_starts: Sequence[int], page_numbers: Sequence[int]) -> List[Dict]:
+    for item in items:
+        index = max(0, bisect_right(page_starts, item['start']) - 1)
+        item['page'] = page_numbers[index] if page_numbers else None
+    return items
+
+
+def window_chars(mode: str) -> int:
+    """Window size for `mode`: a character budget for spaCy, ~max_length tokens for the transformer"""
+    if mode == "transformer":
+        return get_engine().max_length * TRANSFORMER_CHARS_PER_TOKEN
+    return SPACY_WINDOW_CHARS
+
+
+def extract_document(pages: Sequence[Dict], mode: str = "full", cache=None, max_chars: int = None) -> Dict:
+    """
+    Entities and termination clauses for a whole document.
+
+    Args:
+        pages: OCRProcessor page dicts ({'page', 'text', ...})
+        mode: NER_Algo mode ("full", "rules" or "transformer")
+        cache: Optional result_cache.ResultCache
+        max_chars: Window size override
+
+    Returns:
+        {'spans': [{'label', 'start', 'end', 'text', 'page', ...}],
+         'termination_clauses': [{'text', 'start', 'end', 'section', 'page'}],
+         'windows': number of windows}
+    """
+    if mode not in NER_MODES:
+        raise ValueError(f"Unknown NER mode {mode!r}; expected one of {NER_MODES}")
+
+    text, page_starts, page_numbers = join_pages(pages)
+
+    with tracing.span("ner", mode=mode, chars=len(text), pages=len(page_numbers)) as ner_span:
+        key = None
+        if cache is not None:
+            settings = dict(cache_settings(mode), mode=mode, chunking_version=CHUNKING_VERSION, max_chars=max_chars)
+            key = cache.make_key(cache.text_hash(text), settings)
+            cached = cache.get(key)
+            if cached is not None:
+                ner_span.set(cached=True)
+                return cached
+
+        if mode == "rules":
+            windows = [(0, len(text))]
+            with time_stage("rules"):
+                spans = [
+                    {'label': LABELS[entity['label']], 'start': entity['start'], 'end': entity['end'],
+                     'text': entity['text'], 'value': str(entity['value'])}
+                    for entity in extract_entities(text)
+                ]
+        else:
+            windows = make_windows(text, max_chars or window_chars(mode), page_starts=page_starts)
+            window_texts = [text[start:end] for start, end in windows]
+            predict = _transformer_spans if mode == "transformer" else _spacy_spans
+            spans = merge_spans(text, windows, predict(window_texts))
+
+        with time_stage("clauses"):
+            clauses = extract_termination_clauses(text)
+
+        result = {
+            'spans': _add_pages(spans, page_starts, page_numbers),
+            'termination_clauses': _add_pages(clauses, page_starts, page_numbers),
+            'windows': len(windows),
+        }
+        ner_span.set(windows=len(windows), entities=len(spans), clauses=len(clauses))
+        metrics.DOCUMENTS_TOTAL.labels('ner').inc()
+
+        if cache is not None:
+            cache.put(key, result)
+        return result
+
+
+def as_ner_tuple(result: Dict) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """(party_names, dates, amounts, termination_clauses) like NER_Algo, unique and in text order"""
+    fields = ([], [], [], [])
+    for span in result['spans']:
+        position = TRANSFORMER_LABELS.get(span['label'])
+        if position is not None:
+            fields[position].append(span['text'])
+    fields[3].extend(clause['text'] for clause in result['termination_clauses'])
+    return tuple(list(dict.fromkeys(values)) for values in fields)
@@ -0,0 +1,120 @@
+"""
+Termination clause extraction without the dependency parser.
+
+Keyword hits (terminate, termination, cancel, cancellation and their
+inflections, as in create_sample_data) are found with one precompiled
+regex. Each hit is expanded to its clause:
+  - inside a section whose heading names termination/cancellation
+    ("TERMINATION:", "12. Term and Termination:") the whole section,
+    up to the next heading, title line or blank line, is the clause;
+  - anywhere else, the sentence around the hit.
+
+Section and sentence boundaries are computed once per text, so the cost
+is linear in the text length, and every clause is returned once with its
+character offsets.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, List
+
+KEYWORD_RE = re.compile(r"\b(?:terminat|cancel)\w*", re.IGNORECASE)
+
+# "TERMINATION:", "12. TERM AND TERMINATION:", "Cancellation:" at the start of a line
+HEADING_RE = re.compile(
+    r"^[ \t]*(?:\d+(?:\.\d+)*\.?[ \t]+)?(?P<label>[A-Z][A-Za-z &/,-]{1,60}?)[ \t]*:",
+    re.MULTILINE
+)
+# All-caps title lines ("EMPLOYMENT AGREEMENT") also start a new section
+TITLE_RE = re.compile(r"^[ \t]*[A-Z][A-Z0-9 &/,-]{2,80}[ \t]*$", re.MULTILINE)
+PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t]*\n")
+
+# Sentence end: . ! ? (optionally closed by a quote or bracket) followed by whitespace
+SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]*(?=\s)")
+
+# Periods that do not end a sentence
+ABBREVIATIONS = frozenset({
+    'co', 'corp', 'inc', 'ltd', 'llc', 'no', 'nos', 'mr', 'mrs', 'ms', 'dr',
+    'st', 'sec', 'art', 'para', 'vs', 'etc', 'e.g', 'i.e', 'jan', 'feb', 'mar',
+    'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec', 'u.s',
+})
+_WORD_BEFORE_RE = re.compile(r"([\w.]+)$")
+
+
+def _is_heading_label(label: str) -> bool:
+    """Headings are short labels, not the first words of a sentence ending in ':'"""
+    words = label.split()
+    return label.isupper() or len(words) <= 4 and all(word[0].isupper() or word in ('and', 'of', '&') for word in words)
+
+
+def _sentence_ends(text: str) -> List[int]:
+    """Offsets just past each sentence-final punctuation mark"""
+    ends = []
+    for match in SENTENCE_END_RE.finditer(text):
+        if text[match.start()] == '.':
+            before = _WORD_BEFORE_RE.search(text, max(0, match.start() - 12), match.start())
+            if before and (before.group(1).lower() in ABBREVIATIONS or before.group(1).isdigit()):
+                continue
+        ends.append(match.end())
+    return ends
+
+
+def _strip_span(text: str, start: int, end: int) -> Dict:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return {'text': text[start:end], 'start': start, 'end': end}
+
+
+def extract_termination_clauses(text: str) -> List[Dict]:
+    """
+    Find termination / cancellation clauses in `text`.
+
+    Returns:
+        Clauses in text order, each {'text', 'start', 'end', 'section'}
+        where section is True when the clause is a whole headed section
+    """
+    hits = [match.start() for match in KEYWORD_RE.finditer(text)]
+    if not hits:
+        return []
+
+    # Hard boundaries: headings, titles and blank lines end sections and sentences alike
+    heading_labels = {
+        match.start(): match.group('label')
+        for match in HEADING_RE.finditer(text)
+        if _is_heading_label(match.group('label'))
+    }
+    breaks = sorted(
+        set(heading_labels)
+        | {match.start() for match in TITLE_RE.finditer(text)}
+        | {match.end() for match in PARAGRAPH_BREAK_RE.finditer(text)}
+    )
+    ends = sorted(set(_sentence_ends(text)) | set(breaks))
+
+    clauses = []
+    seen = set()
+    for hit in hits:
+        # The section holding the hit runs from the last hard break to the next one
+        position = bisect_right(breaks, hit)
+        section_start = breaks[position - 1] if position else 0
+        label = heading_labels.get(section_start)
+
+        if label and KEYWORD_RE.search(label):
+            start = section_start
+            end = breaks[position] if position < len(breaks) else len(text)
+            section = True
+        else:
+            position = bisect_right(ends, hit)
+            start = ends[position - 1] if position else 0
+            end = ends[position] if position < len(ends) else len(text)
+            section = False
+
+        if (start, end) in seen:
+            continue
+        seen.add((start, end))
+
+        clause = _strip_span(text, start, end)
+        clause['section'] = section
+        clauses.append(clause)
+
+    return clauses
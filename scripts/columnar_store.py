@@ -0,0 +1,283 @@
+"""
+Columnar storage for batch results.
+
+JSON results hold every page text and entity as Python strings and dicts,
+which is slow to re-parse and large to keep in memory. Here a batch is
+stored as flat tables of numbers pointing into one text buffer:
+
+    results.cols/
+        meta.json           version, row counts, label and method names
+        paths.txt           input path of each document (doc id = line number)
+        text.bin            UTF-8 text of every document, back to back
+        documents/*.npy     success, total_pages, text_start, text_end
+        pages/*.npy         doc, page, text_start, text_end, method, confidence
+        spans/*.npy         doc, page, start, end, label, confidence
+
+Offsets are UTF-8 byte offsets into text.bin, so a span's text is
+text.bin[start:end] and needs no document to be decoded. A document's
+text is its pages joined as in chunked_ner.join_pages. Entity spans and
+termination clauses share the span table; label is a code into LABELS
+(TERMINATION_CLAUSE for clauses) and confidence is NaN where the NER mode
+gives none. Rule values and clause sections are not stored.
+
+While a batch is written the tables are array.array columns (a few bytes
+per row); load() maps the columns back with numpy.load(mmap_mode="r"), so
+analytics read only the rows and columns they touch.
+
+Usage:
+    python scripts/columnar_store.py results.jsonl --output results.cols
+"""
+import argparse
+import json
+import logging
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+from chunked_ner import join_pages
+from NER_Algo import TRANSFORMER_LABELS
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout changes
+COLUMNAR_VERSION = 1
+
+LABELS = tuple(sorted(TRANSFORMER_LABELS, key=TRANSFORMER_LABELS.get))
+METHODS = ("native", "ocr")
+UNKNOWN = -1
+
+# Table -> {column: array.array typecode (also the numpy dtype)}
+COLUMNS = {
+    'documents': {'success': 'B', 'total_pages': 'I', 'text_start': 'Q', 'text_end': 'Q'},
+    'pages': {'doc': 'I', 'page': 'I', 'text_start': 'Q', 'text_end': 'Q', 'method': 'b', 'confidence': 'f'},
+    'spans': {'doc': 'I', 'page': 'I', 'start': 'Q', 'end': 'Q', 'label': 'b', 'confidence': 'f'},
+}
+
+_LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+_METHOD_CODES = {method: code for code, method in enumerate(METHODS)}
+
+
+def _byte_offsets(text: str, positions: Iterable[int]) -> Dict[int, int]:
+    """UTF-8 byte offset of each character offset in `text`"""
+    if text.isascii():
+        return {position: position for position in positions}
+
+    offsets = {}
+    previous = size = 0
+    for position in sorted(set(positions)):
+        size += len(text[previous:position].encode("utf-8"))
+        offsets[position] = size
+        previous = position
+    return offsets
+
+
+class ColumnarWriter:
+    """
+    Adds document results (pipeline.process_pdf dicts) to a columnar store.
+    Text goes to text.bin as documents are added; the tables are written on close().
+    """
+
+    def __init__(self, output_dir: str):
+        self.output_dir = Path(output_dir)
+        for table in COLUMNS:
+            (self.output_dir / table).mkdir(parents=True, exist_ok=True)
+        self.tables = {
+            table: {column: array(typecode) for column, typecode in columns.items()}
+            for table, columns in COLUMNS.items()
+        }
+        self.paths = open(self.output_dir / "paths.txt", "w", encoding="utf-8")
+        self.text = open(self.output_dir / "text.bin", "wb")
+        self.text_size = 0
+
+    def _append(self, table: str, **values):
+        columns = self.tables[table]
+        for column, value in values.items():
+            columns[column].append(value)
+
+    def add(self, pdf_path: str, result: Dict) -> int:
+        """Add one document; returns its doc id"""
+        doc = len(self.tables['documents']['success'])
+        self.paths.write(f"{pdf_path}\n")
+
+        pages = (result.get('pages') or []) if result.get('success') else []
+        text, page_starts, _ = join_pages(pages)
+        page_ends = [start + len(page['text']) for start, page in zip(page_starts, pages)]
+        items = [(span, _LABEL_CODES.get(span['label'], UNKNOWN)) for span in result.get('entity_spans', [])]
+        items += [(clause, _LABEL_CODES['TERMINATION_CLAUSE']) for clause in result.get('clause_spans', [])]
+
+        positions = page_starts + page_ends + [item[key] for item, _ in items for key in ('start', 'end')]
+        offsets = _byte_offsets(text, positions)
+        base = self.text_size
+
+        for start, end, page in zip(page_starts, page_ends, pages):
+            self._append(
+                'pages', doc=doc, page=page['page'],
+                text_start=base + offsets[start], text_end=base + offsets[end],
+                method=_METHOD_CODES.get(page.get('method'), UNKNOWN),
+                confidence=page.get('confidence', float('nan'))
+            )
+        for item, label in items:
+            self._append(
+                'spans', doc=doc, page=item.get('page') or 0,
+                start=base + offsets[item['start']], end=base + offsets[item['end']],
+                label=label, confidence=item.get('confidence', float('nan'))
+            )
+
+        data = text.encode("utf-8")
+        self.text.write(data)
+        self.text_size += len(data)
+        self._append(
+            'documents', success=bool(result.get('success')), total_pages=result.get('total_pages') or 0,
+            text_start=base, text_end=self.text_size
+        )
+        return doc
+
+    def close(self) -> Dict[str, int]:
+        """Write the tables and meta.json; returns the row count of each table"""
+        import numpy as np
+
+        self.paths.close()
+        self.text.close()
+
+        rows = {}
+        for table, columns in self.tables.items():
+            for column, values in columns.items():
+                np.save(self.output_dir / table / f"{column}.npy", np.frombuffer(values, dtype=values.typecode))
+            rows[table] = len(next(iter(columns.values())))
+
+        meta = {
+            'version': COLUMNAR_VERSION,
+            'rows': rows,
+            'text_bytes': self.text_size,
+            'labels': list(LABELS),
+            'methods': list(METHODS),
+        }
+        (self.output_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return rows
+
+
+class ColumnarResults:
+    """A columnar store mapped into memory (see load())"""
+
+    def __init__(self, store_dir: str, mmap: bool = True):
+        import numpy as np
+
+        self.store_dir = Path(store_dir)
+        self.meta = json.loads((self.store_dir / "meta.json").read_text(encoding="utf-8"))
+        if self.meta.get('version') != COLUMNAR_VERSION:
+            raise ValueError(
+                f"Columnar store version {self.meta.get('version')} at {store_dir}, expected {COLUMNAR_VERSION}"
+            )
+
+        mmap_mode = "r" if mmap else None
+        self.tables = {
+            table: {column: np.load(self.store_dir / table / f"{column}.npy", mmap_mode=mmap_mode)
+                    for column in columns}
+            for table, columns in COLUMNS.items()
+        }
+        if mmap and self.meta['text_bytes']:
+            self.buffer = np.memmap(self.store_dir / "text.bin", dtype=np.uint8, mode="r")
+        else:
+            self.buffer = np.fromfile(self.store_dir / "text.bin", dtype=np.uint8)
+        self._paths = None
+
+    @property
+    def documents(self):
+        return self.tables['documents']
+
+    @property
+    def pages(self):
+        return self.tables['pages']
+
+    @property
+    def spans(self):
+        return self.tables['spans']
+
+    @property
+    def paths(self):
+        if self._paths is None:
+            self._paths = (self.store_dir / "paths.txt").read_text(encoding="utf-8").splitlines()
+        return self._paths
+
+    def text(self, start: int, end: int) -> str:
+        """Text between two byte offsets of text.bin"""
+        return self.buffer[start:end].tobytes().decode("utf-8")
+
+    def span_text(self, row: int) -> str:
+        return self.text(self.spans['start'][row], self.spans['end'][row])
+
+    def document_text(self, doc: int) -> str:
+        return self.text(self.documents['text_start'][doc], self.documents['text_end'][doc])
+
+    def frame(self, table: str):
+        """
+        The table as a pandas DataFrame, with label / method as categoricals.
+        pandas may copy the mapped columns.
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame(self.tables[table], copy=False)
+        for column, names in (('label', LABELS), ('method', METHODS)):
+            if column in frame:
+                frame[column] = pd.Categorical.from_codes(frame[column], categories=list(names))
+        return frame
+
+
+def load(store_dir: str, mmap: bool = True) -> ColumnarResults:
+    """Open a columnar store; with mmap the columns stay on disk until read"""
+    return ColumnarResults(store_dir, mmap=mmap)
+
+
+def _latest_records(jsonl_path: Path) -> Tuple[Dict[str, int], int]:
+    """Line number of each path's last record, and the number of lines"""
+    latest = {}
+    count = 0
+    with open(jsonl_path, encoding="utf-8") as f:
+        for count, line in enumerate(f, 1):
+            try:
+                latest[json.loads(line)['path']] = count
+            except (ValueError, KeyError):
+                # Torn last line from a killed run
+                continue
+    return latest, count
+
+
+def write_columnar(jsonl_path: str, output_dir: str) -> Dict[str, int]:
+    """
+    Convert batch_runner JSONL output to a columnar store.
+    A document written more than once (retries, resumed runs) keeps its last record.
+
+    Returns:
+        Row count of each table
+    """
+    jsonl_path = Path(jsonl_path)
+    latest, lines = _latest_records(jsonl_path)
+    keep = set(latest.values())
+    writer = ColumnarWriter(output_dir)
+
+    with open(jsonl_path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if number in keep:
+                record = json.loads(line)
+                writer.add(record.pop('path'), record)
+
+    rows = writer.close()
+    logger.info(
+        f"✓ {rows['documents']} documents ({lines - len(keep)} superseded records skipped), "
+        f"{rows['pages']} pages, {rows['spans']} spans → {output_dir}"
+    )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert batch results (JSONL) to a columnar store")
+    parser.add_argument("results", help="JSONL written by batch_runner.py")
+    parser.add_argument("--output", required=True, help="Directory for the columnar store")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(write_columnar(args.results, args.output), indent=2))
+
+
+if __name__ == "__main__":
+    main()
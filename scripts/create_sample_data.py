@@ -1,5 +1,6 @@
 import random
 import json
+import string
 from pathlib import Path
 from faker import Faker
 from datetime import datetime, timedelta
@@ -89,6 +90,49 @@ def generate_date():
     return random.choice(formats)
 
 
+ENTITY_LABELS = {'party': "PARTY_NAME", 'amount': "AMOUNT", 'date': "DATE"}
+TERMINATION_KEYWORDS = ['terminate', 'termination', 'cancel', 'cancellation']
+
+_formatter = string.Formatter()
+
+
+def fill_template(template, entities_data):
+    """
+    Fill `template` and annotate every inserted value at its exact offset.
+    Format: [{'start', 'end', 'label'}, ...] in text order
+    """
+    parts = []
+    annotations = []
+    length = 0
+
+    for literal, field, _, _ in _formatter.parse(template):
+        parts.append(literal)
+        length += len(literal)
+        if field is None:
+            continue
+
+        value = entities_data[field]
+        label = ENTITY_LABELS[field.rstrip('0123456789')]
+        annotations.append({'start': length, 'end': length + len(value), 'label': label})
+        parts.append(value)
+        length += len(value)
+
+    return ''.join(parts), annotations
+
+
+def termination_spans(text):
+    """Sentences (split on '.') mentioning termination, with exact offsets"""
+    spans = []
+    offset = 0
+    for sentence in text.split('.'):
+        stripped = sentence.strip()
+        if len(stripped) > 20 and any(keyword in stripped.lower() for keyword in TERMINATION_KEYWORDS):
+            start = offset + len(sentence) - len(sentence.lstrip())
+            spans.append({'start': start, 'end': start + len(stripped), 'label': 'TERMINATION_CLAUSE'})
+        offset += len(sentence) + 1
+    return spans
+
+
 def create_training_sample(template):
     """Create one annotated training sample"""
 
@@ -103,49 +147,11 @@ def create_training_sample(template):
         'date3': generate_date(),
     }
 
-    # Fill template
-    text = template.format(**entities_data)
-
-    # Create annotations
-    # Format: [start_char, end_char, entity_type]
-    annotations = []
-
-    # Find each entity in the text
-    for key, value in entities_data.items():
-        entity_type = None
-        if 'party' in key:
-            entity_type = "PARTY_NAME"
-        elif 'amount' in key:
-            entity_type = "AMOUNT"
-        elif 'date' in key:
-            entity_type = "DATE"
-
-        # Find all occurrences
-        start = 0
-        while True:
-            pos = text.find(value, start)
-            if pos == -1:
-                break
-            annotations.append({
-                'start': pos,
-                'end': pos + len(value),
-                'label': entity_type
-            })
-            start = pos + 1
+    # Fill template, recording each entity's span as it is inserted
+    text, annotations = fill_template(template, entities_data)
 
     # Find termination clauses
-    termination_keywords = ['terminate', 'termination', 'cancel', 'cancellation']
-    sentences = text.split('.')
-
-    for sentence in sentences:
-        if any(keyword in sentence.lower() for keyword in termination_keywords):
-            pos = text.find(sentence.strip())
-            if pos != -1 and len(sentence.strip()) > 20:
-                annotations.append({
-                    'start': pos,
-                    'end': pos + len(sentence.strip()),
-                    'label': 'TERMINATION_CLAUSE'
-                })
+    annotations.extend(termination_spans(text))
 
     return {
         'text': text,
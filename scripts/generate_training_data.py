@@ -0,0 +1,201 @@
+"""
+Parallel, streaming training-data generation.
+
+Samples come from create_sample_data (exact spans recorded while the
+template is filled). Work is split into shards; each pool worker seeds
+its generators from (seed, shard index), generates one shard and writes
+it straight to disk, so output is reproducible regardless of scheduling
+and memory stays at one shard per worker.
+
+Shards are written to a temp file and renamed when complete. Re-running
+the same command skips shards that already exist.
+
+Output formats:
+    jsonl  - one {"text", "annotations"} object per line (create_training_sample format)
+    docbin - spaCy DocBin (.spacy); entities in doc.ents, every annotation
+             (including TERMINATION_CLAUSE, which overlaps entities) in doc.spans["sc"]
+
+Usage:
+    python scripts/generate_training_data.py --samples 1000000 --output-dir data/train --workers 8
+    python scripts/generate_training_data.py --samples 200000 --format docbin --shard-size 20000
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import create_sample_data
+from create_sample_data import create_training_sample, TEMPLATES
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {'jsonl': '.jsonl', 'docbin': '.spacy'}
+SPAN_KEY = "sc"
+
+# Per-process blank spaCy pipeline for DocBin output
+_nlp = None
+
+
+def generate_samples(count: int, seed: int, shard_index: int = 0, first: int = 0) -> Iterator[Dict]:
+    """
+    Yield `count` samples, seeded from (seed, shard_index).
+    Templates rotate by global sample index (`first` onwards), as in generate_dataset.
+    """
+    shard_seed = f"{seed}:{shard_index}"
+    random.seed(shard_seed)
+    create_sample_data.fake.seed_instance(shard_seed)
+
+    for i in range(first, first + count):
+        yield create_training_sample(TEMPLATES[i % len(TEMPLATES)])
+
+
+def _write_jsonl(samples: Iterator[Dict], f) -> int:
+    count = 0
+    for sample in samples:
+        f.write(json.dumps(sample) + "\n")
+        count += 1
+    return count
+
+
+def _to_doc(sample: Dict):
+    from spacy.util import filter_spans
+
+    doc = _nlp.make_doc(sample['text'])
+    spans = []
+    for ann in sample['annotations']:
+        span = doc.char_span(ann['start'], ann['end'], label=ann['label'], alignment_mode="contract")
+        if span is not None:
+            spans.append(span)
+
+    doc.spans[SPAN_KEY] = spans
+    doc.ents = filter_spans([span for span in spans if span.label_ != 'TERMINATION_CLAUSE'])
+    return doc
+
+
+def _write_docbin(samples: Iterator[Dict], f) -> int:
+    global _nlp
+    from spacy.tokens import DocBin
+
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.blank("en")
+
+    doc_bin = DocBin(store_user_data=False)
+    for sample in samples:
+        doc_bin.add(_to_doc(sample))
+    f.write(doc_bin.to_bytes())
+    return len(doc_bin)
+
+
+def shard_path(output_dir: Path, shard_index: int, fmt: str) -> Path:
+    return output_dir / f"shard-{shard_index:05d}{FORMATS[fmt]}"
+
+
+def write_shard(
+        output_dir: str,
+        shard_index: int,
+        first: int,
+        count: int,
+        seed: int,
+        fmt: str
+) -> Tuple[int, int]:
+    """
+    Generate samples first..first+count as one shard and write it atomically.
+    Returns (shard_index, samples written).
+    """
+    path = shard_path(Path(output_dir), shard_index, fmt)
+    samples = generate_samples(count, seed, shard_index, first)
+
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        if fmt == 'jsonl':
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                written = _write_jsonl(samples, f)
+        else:
+            with os.fdopen(fd, "wb") as f:
+                written = _write_docbin(samples, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return shard_index, written
+
+
+def plan_shards(total: int, shard_size: int) -> List[int]:
+    """Sample count per shard; only the last shard may be smaller"""
+    full, rest = divmod(total, shard_size)
+    return [shard_size] * full + ([rest] if rest else [])
+
+
+def generate(
+        total: int,
+        output_dir: str,
+        shard_size: int = 10000,
+        workers: int = 1,
+        fmt: str = 'jsonl',
+        seed: int = 0
+) -> Dict:
+    """
+    Write `total` samples as shards in `output_dir`, skipping shards that
+    already exist. Returns run statistics including samples/sec.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {list(FORMATS)}")
+
+    # Resuming only lines up with earlier shards when the shard size is unchanged
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    sizes = plan_shards(total, shard_size)
+    todo = [index for index in range(len(sizes)) if not shard_path(output, index, fmt).exists()]
+
+    logger.info(f"📄 {len(sizes)} shards, {len(sizes) - len(todo)} already written, {len(todo)} to generate")
+
+    written = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(write_shard, str(output), index, index * shard_size, sizes[index], seed, fmt)
+            for index in todo
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            _, count = future.result()
+            written += count
+            elapsed = time.perf_counter() - start
+            logger.info(f"{done}/{len(todo)} shards, {written} samples ({written / elapsed:.0f} samples/sec)")
+
+    elapsed = time.perf_counter() - start
+    return {
+        'shards': len(sizes),
+        'skipped_shards': len(sizes) - len(todo),
+        'samples_written': written,
+        'elapsed_s': round(elapsed, 2),
+        'samples_per_sec': round(written / elapsed, 1) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate sharded NER training data in parallel")
+    parser.add_argument("--samples", type=int, required=True, help="Total number of samples")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--shard-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--format", choices=sorted(FORMATS), default="jsonl")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    stats = generate(args.samples, args.output_dir, args.shard_size, args.workers, args.format, args.seed)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
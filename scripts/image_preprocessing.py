@@ -0,0 +1,184 @@
+"""
+Preprocessing engines for OCR pages.
+
+pil_preprocess_image is the original PIL filter chain (contrast, sharpen,
+denoise, binarize). The NumPy engine (preprocess_image) does the same
+clean-up on one uint8 page buffer with a few reusable scratch buffers
+instead of a new full-page image per step.
+"""
+from fractions import Fraction
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+CONTRAST_FACTOR = 2.0
+SHARPNESS_FACTOR = 1.5
+SHARPEN_STEP = Fraction(SHARPNESS_FACTOR - 1).limit_denominator(64)
+ADAPTIVE_BLOCK = 31     # neighbourhood size (pixels) for adaptive thresholding
+ADAPTIVE_OFFSET = 10    # how much darker than the local mean a pixel must be to count as ink
+MEDIAN_STRIP_ROWS = 256  # rows per strip of the median filter
+
+
+def box_sum3(gray: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """3x3 neighbourhood sum (edges replicated) as int16"""
+    padded = np.pad(gray, 1, mode='edge')
+    rows = np.empty((padded.shape[0], gray.shape[1]), dtype=np.int16)
+    np.add(padded[:, :-2], padded[:, 1:-1], out=rows, dtype=np.int16)
+    np.add(rows, padded[:, 2:], out=rows, dtype=np.int16)
+
+    if out is None:
+        out = np.empty(gray.shape, dtype=np.int16)
+    np.add(rows[:-2], rows[1:-1], out=out)
+    np.add(out, rows[2:], out=out)
+    return out
+
+
+def _sort3(a: np.ndarray, b: np.ndarray, c: np.ndarray):
+    """Element-wise (min, median, max) of three arrays"""
+    low, high = np.minimum(a, b), np.maximum(a, b)
+    middle, high = np.minimum(high, c), np.maximum(high, c)
+    return np.minimum(low, middle), np.maximum(low, middle), high
+
+
+def median3(gray: np.ndarray) -> np.ndarray:
+    """
+    3x3 median in place (edges replicated, same result as ImageFilter.MedianFilter(3)).
+    Min/max network: sort each row of the neighbourhood, then the median is the
+    median of (largest minimum, median of medians, smallest maximum). Runs a
+    strip of rows at a time to bound the scratch arrays.
+    """
+    padded = np.pad(gray, 1, mode='edge')
+    height, width = gray.shape
+    for top in range(0, height, MEDIAN_STRIP_ROWS):
+        rows = min(MEDIAN_STRIP_ROWS, height - top)
+        sorted_rows = [
+            _sort3(*(padded[top + dy:top + dy + rows, dx:dx + width] for dx in range(3))) for dy in range(3)
+        ]
+        lows, middles, highs = zip(*sorted_rows)
+        largest_low = np.maximum(np.maximum(lows[0], lows[1]), lows[2])
+        smallest_high = np.minimum(np.minimum(highs[0], highs[1]), highs[2])
+        gray[top:top + rows] = _sort3(largest_low, _sort3(*middles)[1], smallest_high)[1]
+    return gray
+
+
+def threshold_mean(gray: np.ndarray):
+    """Global threshold at the mean pixel value"""
+    return gray.mean()
+
+
+def threshold_otsu(gray: np.ndarray):
+    """Global threshold that best separates ink and paper (Otsu's method)"""
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256, dtype=np.float64)
+
+    weight_bg = np.cumsum(hist)
+    weight_fg = weight_bg[-1] - weight_bg
+    sum_bg = np.cumsum(hist * levels)
+    mean_bg = sum_bg / np.maximum(weight_bg, 1)
+    mean_fg = (sum_bg[-1] - sum_bg) / np.maximum(weight_fg, 1)
+
+    between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    return int(np.argmax(between))
+
+
+def threshold_adaptive(gray: np.ndarray):
+    """Per-pixel threshold: local mean over ADAPTIVE_BLOCK pixels minus ADAPTIVE_OFFSET"""
+    radius = ADAPTIVE_BLOCK // 2
+    padded = np.pad(gray, radius, mode='edge')
+
+    # Separable running sums; int32 is enough for a 31x31 window of uint8
+    cols = np.cumsum(padded, axis=1, dtype=np.int32)
+    rows = cols[:, ADAPTIVE_BLOCK - 1:].copy()
+    rows[:, 1:] -= cols[:, :-ADAPTIVE_BLOCK]
+    del cols
+
+    sums = np.cumsum(rows, axis=0, dtype=np.int32)
+    window = sums[ADAPTIVE_BLOCK - 1:].copy()
+    window[1:] -= sums[:-ADAPTIVE_BLOCK]
+    del sums, rows
+
+    window //= ADAPTIVE_BLOCK * ADAPTIVE_BLOCK
+    window -= ADAPTIVE_OFFSET
+    return window
+
+
+THRESHOLDS = {
+    'mean': threshold_mean,
+    'otsu': threshold_otsu,
+    'adaptive': threshold_adaptive,
+}
+
+
+def preprocess_array(gray: np.ndarray, threshold: str = 'mean') -> np.ndarray:
+    """
+    Clean up a grayscale page in place and return it binarized (0/255).
+
+    Steps:
+    1. Contrast (one 256-entry lookup table, same formula as ImageEnhance.Contrast)
+    2. Sharpen (same rounding as ImageEnhance.Sharpness, via a 3x3 box sum)
+    3. Remove noise (3x3 median, same as ImageFilter.MedianFilter(3))
+    4. Binarize with the chosen threshold ('mean', 'otsu' or 'adaptive')
+    """
+    if threshold not in THRESHOLDS:
+        raise ValueError(f"Unknown threshold '{threshold}'. Choose from: {', '.join(THRESHOLDS)}")
+
+    # Contrast: blend with the mean grey level, done as a lookup table
+    mean = int(gray.mean() + 0.5)
+    lut = np.arange(256, dtype=np.float32)
+    lut = np.clip(mean + CONTRAST_FACTOR * (lut - mean), 0, 255).astype(np.uint8)
+    np.take(lut, gray, out=gray)
+
+    # Sharpen as ImageEnhance.Sharpness: smooth = round((box9 + 4 * img) / 13) (ImageFilter.SMOOTH),
+    # out = floor(smooth + f * (img - smooth)) = img + floor((f - 1) * (img - smooth)); edges unchanged
+    work = box_sum3(gray)
+    np.add(work, np.multiply(gray, 4, dtype=np.int16), out=work)
+    np.multiply(work, 2, out=work)
+    np.add(work, 13, out=work)
+    np.floor_divide(work, 26, out=work)
+    np.subtract(gray, work, out=work)
+    np.multiply(work, SHARPEN_STEP.numerator, out=work)
+    np.floor_divide(work, SHARPEN_STEP.denominator, out=work)
+    np.add(work, gray, out=work)
+    np.clip(work, 0, 255, out=work)
+    gray[1:-1, 1:-1] = work[1:-1, 1:-1]
+    del work
+
+    # Denoise before binarizing, like the PIL chain
+    median3(gray)
+
+    # Binarize: paper (above threshold) -> 255, ink -> 0
+    limit = THRESHOLDS[threshold](gray)
+    ink = gray.view(np.bool_)
+    np.greater(gray, limit, out=ink)
+    np.multiply(gray, 255, out=gray)
+
+    return gray
+
+
+def preprocess_image(image: Image.Image, threshold: str = 'mean') -> Image.Image:
+    """Grayscale a page and run preprocess_array on its pixel buffer"""
+    gray = np.array(image.convert('L'), dtype=np.uint8)
+    return Image.fromarray(preprocess_array(gray, threshold))
+
+
+def pil_preprocess_image(image: Image.Image) -> Image.Image:
+    """The PIL filter chain: a new full-page image per step, mean threshold"""
+    # Grayscale conversion
+    image = image.convert('L')
+
+    # Enhance contrast
+    enhancer = ImageEnhance.Contrast(image)
+    image = enhancer.enhance(CONTRAST_FACTOR)
+
+    # Sharpen
+    enhancer = ImageEnhance.Sharpness(image)
+    image = enhancer.enhance(SHARPNESS_FACTOR)
+
+    # Remove noise
+    image = image.filter(ImageFilter.MedianFilter(size=3))
+
+    # Binarization (black & white only)
+    img_array = np.array(image)
+    threshold = np.mean(img_array)
+    binary = (img_array > threshold) * 255
+    return Image.fromarray(binary.astype(np.uint8))
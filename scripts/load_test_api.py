@@ -0,0 +1,99 @@
+"""
+Load test for the extraction API using generated contract PDFs.
+
+Usage:
+    python scripts/api_server.py &
+    python scripts/load_test_api.py --requests 200 --concurrency 16
+    python scripts/load_test_api.py --mode jobs --requests 500 --concurrency 32
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+from benchmark_corpus import build_native_pdf
+
+
+def generate_pdfs(directory, count):
+    """Render `count` distinct one-page contracts from the sample templates"""
+    return [
+        Path(build_native_pdf(Path(directory) / f"contract_{i:05d}.pdf", 1, start=i))
+        for i in range(count)
+    ]
+
+
+async def send_sync(client, pdf_bytes):
+    response = await client.post("/extract", content=pdf_bytes, headers={"Content-Type": "application/pdf"})
+    return response.status_code
+
+
+async def send_job(client, pdf_bytes, poll_interval):
+    response = await client.post("/jobs", content=pdf_bytes, headers={"Content-Type": "application/pdf"})
+    if response.status_code != 202:
+        return response.status_code
+
+    job_id = response.json()["job_id"]
+    while True:
+        await asyncio.sleep(poll_interval)
+        job = (await client.get(f"/jobs/{job_id}")).json()
+        if job["status"] == "done":
+            return 200
+        if job["status"] == "failed":
+            return 500
+
+
+async def run(args, pdfs):
+    payloads = [path.read_bytes() for path in pdfs]
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = Counter()
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                if args.mode == "sync":
+                    status = await send_sync(client, payloads[i % len(payloads)])
+                else:
+                    status = await send_job(client, payloads[i % len(payloads)], args.poll_interval)
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    print("===== LOAD TEST =====")
+    print(f"Mode: {args.mode}, requests: {args.requests}, concurrency: {args.concurrency}")
+    print(f"Status codes: {dict(statuses)}")
+    print(f"Throughput: {statuses[200] / elapsed:.2f} docs/sec ({statuses[200] / elapsed * 3600:.0f} docs/hour)")
+    if latencies:
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"Latency p50: {statistics.median(latencies):.2f}s  p95: {p95:.2f}s  max: {latencies[-1]:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the LexiScan extraction API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--mode", choices=["sync", "jobs"], default="sync")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--distinct-pdfs", type=int, default=20, help="Unique PDFs to generate (cache-miss mix)")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = generate_pdfs(tmp, args.distinct_pdfs)
+        asyncio.run(run(args, pdfs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Prometheus metrics for the extraction pipeline.
+
+Stage latencies go into one histogram labelled by stage, so a throughput
+drop can be traced to the stage that slowed down:
+    pdf_render, preprocess, tesseract, refine, native_extract, native_layout, native_pass,
+    spacy_ner, transformer_ner, rules, clauses, document
+
+Rates (pages/sec, docs/sec) come from the counters, e.g.
+    rate(lexiscan_pages_total[5m])
+
+API scheduler lanes (native / ocr / ner) report queue wait and run time
+separately, e.g. p99 time in the OCR queue:
+    histogram_quantile(0.99, rate(lexiscan_lane_seconds_bucket{lane="ocr",phase="wait"}[5m]))
+
+Every time_stage block is also a span of the current document trace
+(see tracing.py), for per-document breakdowns the histograms cannot give.
+
+When the pipeline runs in several processes (API pool, batch runner), set
+PROMETHEUS_MULTIPROC_DIR to a shared empty directory before start-up so
+every process's samples are aggregated.
+
+Usage (standalone exporter):
+    python scripts/metrics.py --port 9100
+"""
+import argparse
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, make_asgi_app, multiprocess, start_http_server
+)
+
+import tracing
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "lexiscan_stage_seconds",
+    "Time spent in each pipeline stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+PAGES_TOTAL = Counter(
+    "lexiscan_pages_total",
+    "Pages extracted, by method (native/ocr/reused)",
+    ["method"]
+)
+DOCUMENTS_TOTAL = Counter(
+    "lexiscan_documents_total",
+    "Documents processed, by step (extraction/ner)",
+    ["step"]
+)
+PAGE_ROUTES_TOTAL = Counter(
+    "lexiscan_page_routes_total",
+    "Native vs OCR routing decisions per page",
+    ["route"]
+)
+LOW_CONFIDENCE_PAGES_TOTAL = Counter(
+    "lexiscan_low_confidence_pages_total",
+    "OCR pages below min_confidence"
+)
+LANE_SECONDS = Histogram(
+    "lexiscan_lane_seconds",
+    "Scheduler lane latency per work item, by phase (wait/run)",
+    ["lane", "phase"],
+    buckets=STAGE_BUCKETS
+)
+LANE_QUEUE_DEPTH = Gauge(
+    "lexiscan_lane_queue_depth",
+    "Work items waiting in a scheduler lane",
+    ["lane"],
+    multiprocess_mode="livesum"
+)
+
+
+@contextmanager
+def time_stage(stage: str, **attributes):
+    """
+    Observe the wall time of the enclosed block under `stage`.
+    Also a tracing span (yielded; attributes go on the span only).
+    """
+    start = time.perf_counter()
+    try:
+        with tracing.span(stage, **attributes) as span:
+            yield span
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
+
+
+def _registry():
+    """Aggregate across processes in multiprocess mode, else the default registry"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return None
+
+
+def metrics_app():
+    """ASGI app serving /metrics (mount it on the API)"""
+    registry = _registry()
+    return make_asgi_app(registry=registry) if registry else make_asgi_app()
+
+
+def start_exporter(port: int = 9100, addr: str = "0.0.0.0"):
+    """Serve metrics on a separate HTTP port (for batch jobs without the API)"""
+    registry = _registry()
+    if registry:
+        start_http_server(port, addr=addr, registry=registry)
+    else:
+        start_http_server(port, addr=addr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Standalone Prometheus exporter")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+
+    start_exporter(args.port)
+    print(f"✓ Serving metrics on :{args.port}/metrics")
+    while True:
+        time.sleep(3600)
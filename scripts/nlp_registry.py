@@ -0,0 +1,90 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Components NER_Algo actually reads:
+#   ner    -> doc.ents (ORG / MONEY / DATE)
+# In the packaged English models ner has its own internal tok2vec; the shared
+# tok2vec only feeds the tagger and parser, so it stays disabled too.
+# Termination clauses are segmented by clause_extractor, so the parser is not
+# needed; tagger, attribute_ruler and lemmatizer are never used either.
+DEFAULT_COMPONENTS = ("ner",)
+
+
+class PipelineEntry:
+    """
+    A loaded spaCy pipeline.
+    One entry exists per (model name, enabled components) per process.
+    """
+
+    def __init__(self, nlp, model_name: str, components: Tuple[str, ...]):
+        self.nlp = nlp
+        self.model_name = model_name
+        self.components = components
+
+
+_pipelines: Dict[Tuple[str, Tuple[str, ...]], PipelineEntry] = {}
+_registry_lock = threading.Lock()
+
+
+def _key(model_name: str, components: Optional[Sequence[str]]) -> Tuple[str, Tuple[str, ...]]:
+    if components is None:
+        components = DEFAULT_COMPONENTS
+    return model_name, tuple(components)
+
+
+def get_pipeline(
+        model_name: str = DEFAULT_MODEL,
+        components: Optional[Sequence[str]] = None
+) -> PipelineEntry:
+    """
+    Load a spaCy pipeline once per process and return the cached entry.
+
+    Args:
+        model_name: Installed spaCy package name
+        components: Pipeline components to keep enabled (defaults to what NER_Algo reads)
+    """
+    key = _key(model_name, components)
+    entry = _pipelines.get(key)
+    if entry is not None:
+        return entry
+
+    with _registry_lock:
+        entry = _pipelines.get(key)
+        if entry is None:
+            import spacy
+
+            logger.info(f"Loading spaCy model {model_name} (enabled: {', '.join(key[1])})")
+            nlp = spacy.load(model_name, enable=list(key[1]))
+            entry = PipelineEntry(nlp, model_name, key[1])
+            _pipelines[key] = entry
+    return entry
+
+
+def warm_up(
+        model_name: str = DEFAULT_MODEL,
+        components: Optional[Sequence[str]] = None
+) -> PipelineEntry:
+    """
+    Load the pipeline and push a short text through it.
+    Call at worker start so the first real contract doesn't pay the load cost.
+    """
+    entry = get_pipeline(model_name, components)
+    entry.nlp("This Agreement is made on January 15, 2024 by Acme Corp. for $1,000.00.")
+    logger.info(f"✓ spaCy model {model_name} is warm")
+    return entry
+
+
+def loaded_pipelines() -> List[Tuple[str, Tuple[str, ...]]]:
+    """Keys of the pipelines loaded in this process."""
+    return list(_pipelines)
+
+
+def clear() -> None:
+    """Drop every cached pipeline (mainly for tests and benchmarks)."""
+    with _registry_lock:
+        _pipelines.clear()
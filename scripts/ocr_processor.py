@@ -1,16 +1,234 @@
-import pytesseract
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
-from pdf2image import convert_from_path
-import pdfplumber
-from typing import Dict, List, Optional
+"""
+PDF text extraction: native text layer, Tesseract OCR or both per page.
+
+pytesseract, pdf2image, pdfplumber, PIL and NumPy are imported inside the
+functions that use them, so importing this module stays cheap for
+processes that never render or OCR a page (the API's parent process,
+routing-only lanes). The Tesseract binary is checked once per process.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+import hashlib
 import logging
-from PIL import Image, ImageEnhance, ImageFilter
-import numpy as np
 from pathlib import Path
-import time
+
+import metrics
+import tracing
+from metrics import time_stage
+from result_cache import ResultCache
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# Bump when preprocessing or text reconstruction changes, so cached results are not reused
+PREPROCESSING_VERSION = 4
+
+# Page triage thresholds
+NATIVE_MIN_CHARS = 100          # text-layer characters for a page to count as native
+SCAN_MIN_IMAGE_COVERAGE = 0.3   # share of the page covered by images for a scan
+BLANK_MAX_STD = 4.0             # thumbnail pixel std-dev below which a page is blank
+THUMBNAIL_DPI = 24
+NATIVE_PARALLEL_MIN_PAGES = 40  # split the native pass across workers from this many pages
+FINGERPRINT_DPI = 72            # render used to fingerprint scanned pages
+
+# Region refinement (re-OCR of low-confidence lines)
+REFINE_MAX_LINES = 20   # more weak lines than this → the whole page is poor, leave it to adaptive DPI
+REFINE_SCALE = 2        # upscale factor for cropped lines
+REFINE_PADDING = 4      # pixels of margin around a cropped line
+
+TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+# Per-process OCRProcessor used by pool workers (set by _init_worker)
+_worker_processor = None
+
+# Tesseract version, set by the first successful check_tesseract() in this process
+_tesseract_version = None
+
+
+def _pytesseract():
+    """pytesseract, pointed at the Tesseract binary unless the caller already set one"""
+    import pytesseract
+
+    if pytesseract.pytesseract.tesseract_cmd == "tesseract":
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    return pytesseract
+
+
+def check_tesseract() -> str:
+    """Verify the Tesseract binary is installed (runs it once per process)"""
+    global _tesseract_version
+    if _tesseract_version is None:
+        try:
+            _tesseract_version = str(_pytesseract().get_tesseract_version())
+        except Exception:
+            raise RuntimeError(
+                "Tesseract not installed. Run: sudo apt install tesseract-ocr"
+            )
+        logger.info("✓ Tesseract OCR is ready")
+    return _tesseract_version
+
+
+def preload():
+    """Import the rendering/OCR libraries now instead of on the first page"""
+    import numpy  # noqa: F401
+    import pdfplumber  # noqa: F401
+    import PyPDF2  # noqa: F401
+    from pdf2image import convert_from_path  # noqa: F401
+    from PIL import Image, ImageEnhance, ImageFilter  # noqa: F401
+
+    import image_preprocessing  # noqa: F401
+    _pytesseract()
+
+
+def _init_worker(options: Dict):
+    """Build one OCRProcessor per worker process instead of one per page"""
+    global _worker_processor
+    _worker_processor = OCRProcessor(**options)
+
+
+def text_from_ocr_data(ocr_data: Dict) -> str:
+    """
+    Rebuild page text from a pytesseract.image_to_data dict.
+
+    Matches the layout of image_to_string: words on a line are joined by
+    spaces, lines end with a newline, paragraphs and blocks are separated
+    by a blank line and the page ends with a form feed.
+    """
+    paragraphs = []
+    current_par = None
+    current_line = None
+
+    for level, block, par, line, word in zip(
+            ocr_data['level'], ocr_data['block_num'], ocr_data['par_num'],
+            ocr_data['line_num'], ocr_data['text']
+    ):
+        # Level 5 rows are words; the other levels only carry layout boxes
+        if int(level) != 5 or not str(word).strip():
+            continue
+
+        if (block, par) != current_par:
+            paragraphs.append([])
+            current_par = (block, par)
+            current_line = None
+
+        if line != current_line:
+            paragraphs[-1].append([])
+            current_line = line
+
+        paragraphs[-1][-1].append(str(word).strip())
+
+    if not paragraphs:
+        return ''
+
+    text = ''.join(
+        ''.join(' '.join(words) + '\n' for words in lines) + '\n'
+        for lines in paragraphs
+    )
+    return text + '\f'
+
+
+def _weak_lines(ocr_data: Dict, min_confidence: float) -> List[Dict]:
+    """
+    Lines of an image_to_data result whose average word confidence is
+    below min_confidence, weakest first, with their bounding box and rows.
+    """
+    lines = {}
+    for i, level in enumerate(ocr_data['level']):
+        if int(level) != 5 or not str(ocr_data['text'][i]).strip():
+            continue
+
+        key = (ocr_data['block_num'][i], ocr_data['par_num'][i], ocr_data['line_num'][i])
+        left, top = int(ocr_data['left'][i]), int(ocr_data['top'][i])
+        right, bottom = left + int(ocr_data['width'][i]), top + int(ocr_data['height'][i])
+
+        line = lines.setdefault(key, {'key': key, 'rows': [], 'confs': [], 'box': [left, top, right, bottom]})
+        line['rows'].append(i)
+        line['confs'].append(max(0.0, float(ocr_data['conf'][i])))
+        box = line['box']
+        line['box'] = [min(box[0], left), min(box[1], top), max(box[2], right), max(box[3], bottom)]
+
+    weak = []
+    for line in lines.values():
+        line['confidence'] = sum(line['confs']) / len(line['confs'])
+        if line['confidence'] < min_confidence:
+            weak.append(line)
+    return sorted(weak, key=lambda line: line['confidence'])
+
+
+def _splice_lines(ocr_data: Dict, replacements: Dict[int, Tuple[List[int], List[Dict]]]) -> Dict:
+    """
+    Copy of `ocr_data` where each refined line's word rows are replaced.
+    `replacements` maps a line's first row index to (its rows, new word rows).
+    """
+    columns = list(ocr_data.keys())
+    dropped = {row for rows, _ in replacements.values() for row in rows}
+    spliced = {column: [] for column in columns}
+
+    for i in range(len(ocr_data['level'])):
+        if i in replacements:
+            for word in replacements[i][1]:
+                for column in columns:
+                    spliced[column].append(word.get(column, ocr_data[column][i]))
+        if i in dropped:
+            continue
+        for column in columns:
+            spliced[column].append(ocr_data[column][i])
+
+    return spliced
+
+
+def _page_runs(page_nums: List[int], window: int) -> Iterator[Tuple[int, int]]:
+    """Group sorted page numbers into contiguous (first, last) runs of at most `window` pages"""
+    first = last = None
+    for page_num in page_nums:
+        if first is not None and page_num == last + 1 and page_num - first < window:
+            last = page_num
+            continue
+        if first is not None:
+            yield first, last
+        first = last = page_num
+    if first is not None:
+        yield first, last
+
+
+def _triage_worker(pdf_path: str, fingerprints: bool, first_page: int, last_page: int) -> List[Dict]:
+    """Triage one page range inside a worker process"""
+    return _worker_processor.triage_pages(pdf_path, fingerprints, first_page, last_page)
+
+
+class _LayoutPages:
+    """pdfplumber pages of one PDF, opened only if a page is asked for"""
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self.pdf = None
+
+    def __getitem__(self, page_num: int):
+        if self.pdf is None:
+            import pdfplumber
+
+            self.pdf = pdfplumber.open(self.pdf_path)
+        return self.pdf.pages[page_num - 1]
+
+    def close(self):
+        if self.pdf is not None:
+            self.pdf.close()
+
+
+def _ocr_page_worker(pdf_path: str, page_num: int) -> Optional[Dict]:
+    """Render, clean up and OCR a single page inside a worker process"""
+    from pdf2image import convert_from_path
+
+    processor = _worker_processor
+    with time_stage("pdf_render"):
+        images = convert_from_path(
+            pdf_path, dpi=processor.first_pass_dpi, first_page=page_num, last_page=page_num
+        )
+    return processor.ocr_rendered_page(pdf_path, images.pop(0), page_num)
+
 
 class OCRProcessor:
     """
@@ -18,30 +236,93 @@ class OCRProcessor:
     Handles both digital PDFs and scanned documents.
     """
 
-    def __init__(self, min_confidence: float = 60.0, dpi: int = 300):
+    def __init__(
+            self,
+            min_confidence: float = 60.0,
+            dpi: int = 300,
+            workers: int = 1,
+            render_memory_mb: int = 512,
+            routing: str = "page",
+            preprocessing: str = "pil",
+            threshold: str = "mean",
+            cache: Optional[ResultCache] = None,
+            adaptive_dpi: Optional[int] = None,
+            refine_regions: bool = False,
+            native_layout: bool = False
+    ):
         """
         Initialize OCR processor
 
         Args:
             min_confidence: Minimum quality score (0-100) to accept OCR results
             dpi: Image resolution (higher = better quality but slower)
+            workers: Worker processes for page-level OCR (1 = sequential)
+            render_memory_mb: Budget for rendered pages held in memory at once
+            routing: "page" to choose native/OCR per page, "document" for one choice per file
+            preprocessing: "pil" (original filter chain) or "numpy" (in-place engine)
+            threshold: Binarization for the numpy engine: "mean", "otsu" or "adaptive"
+            cache: Optional on-disk result cache checked before extraction
+            adaptive_dpi: OCR at this lower DPI first and re-render at `dpi` only
+                pages whose confidence falls below min_confidence (None = off)
+            refine_regions: Re-OCR only the low-confidence lines of a page
+                (upscaled crop, Otsu threshold, single-line mode) and splice them back
+            native_layout: Take native text from pdfplumber's layout-aware
+                extraction (slow) instead of PyPDF2's plain text
         """
         self.min_confidence = min_confidence
         self.dpi = dpi
-
-        # Verify Tesseract is installed
-        try:
-            pytesseract.get_tesseract_version()
-            logger.info("✓ Tesseract OCR is ready")
-        except Exception as e:
-            raise RuntimeError(
-                "Tesseract not installed. Run: sudo apt install tesseract-ocr"
-            )
-
-    def preprocess_image(self, image: Image.Image) -> Image.Image:
+        self.workers = max(1, workers)
+        self.render_memory_mb = render_memory_mb
+        self.routing = routing
+        self.preprocessing = preprocessing
+        self.threshold = threshold
+        self.cache = cache
+        self.adaptive_dpi = adaptive_dpi if adaptive_dpi and adaptive_dpi < dpi else None
+        self.refine_regions = refine_regions
+        self.native_layout = native_layout
+
+        import image_preprocessing
+
+        if preprocessing not in ("pil", "numpy"):
+            raise ValueError(f"Unknown preprocessing '{preprocessing}'. Choose 'pil' or 'numpy'")
+        if threshold not in image_preprocessing.THRESHOLDS:
+            raise ValueError(f"Unknown threshold '{threshold}'")
+
+        check_tesseract()
+
+    def _worker_options(self) -> Dict:
+        """Constructor arguments for the per-process OCRProcessor in pool workers"""
+        return {
+            'min_confidence': self.min_confidence,
+            'dpi': self.dpi,
+            'preprocessing': self.preprocessing,
+            'threshold': self.threshold,
+            'adaptive_dpi': self.adaptive_dpi,
+            'refine_regions': self.refine_regions,
+            'native_layout': self.native_layout,
+        }
+
+    def cache_settings(self) -> Dict:
+        """Settings that change the extraction output (part of the cache key)"""
+        return {
+            'dpi': self.dpi,
+            'min_confidence': self.min_confidence,
+            'routing': self.routing,
+            'preprocessing': self.preprocessing,
+            'threshold': self.threshold,
+            'adaptive_dpi': self.adaptive_dpi,
+            'refine_regions': self.refine_regions,
+            'native_layout': self.native_layout,
+            'preprocessing_version': PREPROCESSING_VERSION,
+        }
+
+    def preprocess_image(self, image: "Image.Image") -> "Image.Image":
         """
         Clean up image for better OCR accuracy.
 
+        With preprocessing="numpy" the same steps run in place on one
+        uint8 buffer (see image_preprocessing.preprocess_array).
+
         Steps:
         1. Convert to grayscale (removes color, reduces noise)
         2. Increase contrast (makes text darker, background lighter)
@@ -49,47 +330,32 @@ class OCRProcessor:
         4. Remove noise (smooth out scan artifacts)
         5. Binarize (pure black text on white background)
         """
-        # Grayscale conversion
-        image = image.convert('L')
-
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2.0)
-
-        # Sharpen
-        enhancer = ImageEnhance.Sharpness(image)
-        image = enhancer.enhance(1.5)
-
-        # Remove noise
-        image = image.filter(ImageFilter.MedianFilter(size=3))
-
-        # Binarization (black & white only)
-        img_array = np.array(image)
-        threshold = np.mean(img_array)
-        binary = (img_array > threshold) * 255
-        image = Image.fromarray(binary.astype(np.uint8))
+        import image_preprocessing
 
-        return image
+        if self.preprocessing == "numpy":
+            return image_preprocessing.preprocess_image(image, self.threshold)
+        return image_preprocessing.pil_preprocess_image(image)
 
     def extract_text_native(self, pdf_path: str) -> Dict:
         """
         Fast extraction from digital PDFs (PDFs created on computer).
         Works when PDF already contains text.
+
+        Plain text comes from PyPDF2 (milliseconds per page), so a scanned
+        document costs next to nothing here before OCR takes over.
+        pdfplumber's layout-aware text is used when native_layout is set.
         """
         try:
             text_pages = []
 
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text()
-
-                    if text and text.strip():
-                        text_pages.append({
-                            'page': page_num,
-                            'text': text,
-                            'method': 'native',
-                            'confidence': 100.0
-                        })
+            for page_num, text in self._native_texts(pdf_path):
+                if text and text.strip():
+                    text_pages.append({
+                        'page': page_num,
+                        'text': text,
+                        'method': 'native',
+                        'confidence': 100.0
+                    })
 
             return {
                 'success': True,
@@ -100,67 +366,570 @@ class OCRProcessor:
             logger.error(f"Native extraction failed: {e}")
             return {'success': False, 'error': str(e)}
 
+    def _native_texts(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        """(page number, text layer) for every page: PyPDF2, or pdfplumber with native_layout"""
+        if self.native_layout:
+            import pdfplumber
+
+            with pdfplumber.open(pdf_path) as pdf:
+                for page_num, page in enumerate(pdf.pages, 1):
+                    with time_stage("native_layout"):
+                        yield page_num, page.extract_text()
+            return
+
+        from PyPDF2 import PdfReader
+
+        for page_num, page in enumerate(PdfReader(pdf_path).pages, 1):
+            with time_stage("native_extract"):
+                text = page.extract_text()
+            yield page_num, text
+
+    @property
+    def first_pass_dpi(self) -> int:
+        """Resolution pages are rendered at first (adaptive_dpi when enabled)"""
+        return self.adaptive_dpi or self.dpi
+
+    def ocr_page(
+            self,
+            image: "Image.Image",
+            page_num: int,
+            dpi: Optional[int] = None,
+            final: bool = True
+    ) -> Optional[Dict]:
+        """
+        Clean up and OCR one rendered page.
+        Returns the page result, or None if no text was found.
+
+        Args:
+            image: Rendered page
+            page_num: 1-based page number
+            dpi: Resolution the page was rendered at (recorded in the result)
+            final: False for an adaptive first pass that may still be redone,
+                so its low-quality warning and page counts are skipped
+        """
+        # Clean up image
+        with time_stage("preprocess"):
+            clean_image = self.preprocess_image(image)
+
+        # Single Tesseract pass: word boxes, confidences and text
+        pytesseract = _pytesseract()
+        with time_stage("tesseract"):
+            ocr_data = pytesseract.image_to_data(
+                clean_image,
+                output_type=pytesseract.Output.DICT
+            )
+
+        # Calculate average confidence
+        avg_confidence = self._average_confidence(ocr_data)
+
+        # Rebuild text from the same result instead of a second image_to_string pass
+        text = text_from_ocr_data(ocr_data)
+
+        if not text.strip():
+            return None
+
+        if not final and avg_confidence < self.min_confidence:
+            return {'page': page_num, 'confidence': round(avg_confidence, 2), 'retry': True}
+
+        refined = 0
+        if self.refine_regions:
+            with time_stage("refine"):
+                ocr_data, refined = self.refine_low_confidence_lines(image, ocr_data)
+            if refined:
+                avg_confidence = self._average_confidence(ocr_data)
+                text = text_from_ocr_data(ocr_data)
+
+        metrics.PAGES_TOTAL.labels('ocr').inc()
+        if avg_confidence < self.min_confidence:
+            metrics.LOW_CONFIDENCE_PAGES_TOTAL.inc()
+            logger.warning(
+                f"⚠ Page {page_num}: Low quality ({avg_confidence:.1f}%)"
+            )
+
+        return {
+            'page': page_num,
+            'text': text,
+            'method': 'ocr',
+            'confidence': round(avg_confidence, 2),
+            'dpi': dpi or self.dpi,
+            'refined_regions': refined
+        }
+
+    @staticmethod
+    def _average_confidence(ocr_data: Dict) -> float:
+        confidences = [
+            float(c) for c in ocr_data['conf']
+            if float(c) > 0
+        ]
+        return sum(confidences) / len(confidences) if confidences else 0
+
+    def refine_low_confidence_lines(self, image: "Image.Image", ocr_data: Dict) -> Tuple[Dict, int]:
+        """
+        Re-OCR low-confidence lines instead of the whole page.
+
+        Each weak line is cropped from the original render, upscaled,
+        binarized with Otsu's threshold and read in single-line mode
+        (--psm 7). The new words replace the old ones only when their
+        confidence is higher.
+
+        Returns:
+            (possibly updated ocr_data, number of lines replaced)
+        """
+        weak = _weak_lines(ocr_data, self.min_confidence)
+        if not weak or len(weak) > REFINE_MAX_LINES:
+            return ocr_data, 0
+
+        from PIL import Image
+        import image_preprocessing
+
+        pytesseract = _pytesseract()
+        replacements = {}
+        for line in weak:
+            left, top, right, bottom = line['box']
+            left, top = max(0, left - REFINE_PADDING), max(0, top - REFINE_PADDING)
+            right = min(image.width, right + REFINE_PADDING)
+            bottom = min(image.height, bottom + REFINE_PADDING)
+            if right <= left or bottom <= top:
+                continue
+
+            crop = image.crop((left, top, right, bottom)).resize(
+                ((right - left) * REFINE_SCALE, (bottom - top) * REFINE_SCALE), Image.LANCZOS
+            )
+            crop = image_preprocessing.preprocess_image(crop, threshold='otsu')
+            data = pytesseract.image_to_data(crop, config='--psm 7', output_type=pytesseract.Output.DICT)
+
+            block, par, line_num = line['key']
+            words = []
+            for i, level in enumerate(data['level']):
+                if int(level) != 5 or not str(data['text'][i]).strip():
+                    continue
+                words.append({
+                    'level': 5,
+                    'block_num': block,
+                    'par_num': par,
+                    'line_num': line_num,
+                    'word_num': len(words) + 1,
+                    'left': left + int(data['left'][i]) // REFINE_SCALE,
+                    'top': top + int(data['top'][i]) // REFINE_SCALE,
+                    'width': int(data['width'][i]) // REFINE_SCALE,
+                    'height': int(data['height'][i]) // REFINE_SCALE,
+                    'conf': max(0.0, float(data['conf'][i])),
+                    'text': str(data['text'][i]).strip(),
+                })
+
+            if words and sum(w['conf'] for w in words) / len(words) > line['confidence']:
+                replacements[line['rows'][0]] = (line['rows'], words)
+
+        if not replacements:
+            return ocr_data, 0
+
+        logger.info(f"Refined {len(replacements)} low-confidence lines")
+        return _splice_lines(ocr_data, replacements), len(replacements)
+
+    def ocr_rendered_page(self, pdf_path: str, image: "Image.Image", page_num: int) -> Optional[Dict]:
+        """
+        OCR a page rendered at first_pass_dpi. In adaptive mode, a page that
+        comes back below min_confidence is re-rendered at full DPI and
+        recognized again; a page without any text is not retried.
+        """
+        with tracing.span("page", page=page_num, width=image.width, height=image.height) as page_span:
+            if not self.adaptive_dpi:
+                page = self.ocr_page(image, page_num)
+            else:
+                page = self.ocr_page(image, page_num, dpi=self.adaptive_dpi, final=False)
+                del image
+                if page and page.get('retry'):
+                    from pdf2image import convert_from_path
+
+                    logger.info(f"Page {page_num}: re-scanning at {self.dpi} DPI")
+                    with time_stage("pdf_render", first_page=page_num, last_page=page_num, dpi=self.dpi):
+                        image = convert_from_path(
+                            pdf_path, dpi=self.dpi, first_page=page_num, last_page=page_num
+                        )[0]
+                    page = self.ocr_page(image, page_num, dpi=self.dpi)
+
+            if page:
+                page_span.set(
+                    dpi=page['dpi'], confidence=page['confidence'], chars=len(page['text']),
+                    refined_regions=page['refined_regions']
+                )
+            return page
+
+    def _render_window(self, pdf_path: str) -> Tuple[int, int]:
+        """
+        Look up the page count and how many rendered pages fit in render_memory_mb.
+        A page costs its RGB render plus roughly the same again for preprocessing.
+        """
+        from pdf2image import pdfinfo_from_path
+
+        info = pdfinfo_from_path(pdf_path)
+        total_pages = info['Pages']
+
+        # "612 x 792 pts (letter)" -> width/height in points
+        width_pts, _, height_pts = info.get('Page size', '612 x 792').split()[:3]
+        width_px = float(width_pts) / 72 * self.dpi
+        height_px = float(height_pts) / 72 * self.dpi
+        page_bytes = width_px * height_px * 3 * 2
+
+        window = int(self.render_memory_mb * 1024 * 1024 // page_bytes)
+        return total_pages, max(1, window)
+
+    def iter_pages_ocr(self, pdf_path: str, pages: Optional[List[int]] = None) -> Iterator[Dict]:
+        """
+        Render and OCR pages a few at a time, yielding each page result in
+        page order as soon as it is ready. Only as many rendered pages as fit
+        in render_memory_mb are held in memory; each is freed after OCR.
+        Pages without text are skipped.
+
+        Args:
+            pdf_path: PDF to OCR
+            pages: 1-based page numbers to OCR (default: every page)
+        """
+        total_pages, window = self._render_window(pdf_path)
+        page_nums = sorted(pages) if pages is not None else list(range(1, total_pages + 1))
+
+        if self.workers > 1:
+            yield from self._iter_pages_ocr_parallel(pdf_path, page_nums, window)
+            return
+
+        from pdf2image import convert_from_path
+
+        logger.info(
+            f"OCR of {len(page_nums)} pages at {self.first_pass_dpi} DPI ({window} pages per render window)..."
+        )
+
+        for first_page, last_page in _page_runs(page_nums, window):
+            with time_stage("pdf_render", first_page=first_page, last_page=last_page, dpi=self.first_pass_dpi):
+                images = convert_from_path(
+                    pdf_path, dpi=self.first_pass_dpi, first_page=first_page, last_page=last_page
+                )
+
+            for page_num in range(first_page, last_page + 1):
+                logger.info(f"Processing page {page_num}/{total_pages}...")
+
+                # Drop our reference so the render is freed once OCR is done
+                image = images.pop(0)
+                page = self.ocr_rendered_page(pdf_path, image, page_num)
+                del image
+
+                if page:
+                    yield page
+
+    def _iter_pages_ocr_parallel(self, pdf_path: str, page_nums: List[int], window: int) -> Iterator[Dict]:
+        """
+        Fan pages out to a process pool and yield them back in page order.
+        Each worker renders its own page, so at most `workers` renders exist
+        at once; the worker count is capped by the render window.
+        """
+        workers = max(1, min(self.workers, window, len(page_nums)))
+        logger.info(f"OCR of {len(page_nums)} pages at {self.first_pass_dpi} DPI on {workers} workers...")
+
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self._worker_options(),)
+        ) as pool:
+            # Keep a couple of pages queued per worker, no more
+            pending = deque()
+            for page_num in page_nums:
+                pending.append(pool.submit(_ocr_page_worker, pdf_path, page_num))
+
+                if len(pending) >= workers * 2:
+                    page = pending.popleft().result()
+                    if page:
+                        yield page
+
+            while pending:
+                page = pending.popleft().result()
+                if page:
+                    yield page
+
     def extract_text_ocr(self, pdf_path: str) -> Dict:
         """
         Slower extraction from scanned PDFs (photos/scans of paper).
         Uses OCR to "read" the image.
+        With workers > 1, pages are rendered and OCRed in parallel processes.
         """
         try:
-            # Convert PDF pages to images
-            logger.info(f"Converting PDF to images at {self.dpi} DPI...")
-            images = convert_from_path(pdf_path, dpi=self.dpi)
+            total_pages, _ = self._render_window(pdf_path)
+            text_pages = list(self.iter_pages_ocr(pdf_path))
 
-            text_pages = []
+            return {
+                'success': True,
+                'pages': text_pages,
+                'total_pages': total_pages
+            }
+        except Exception as e:
+            logger.error(f"OCR extraction failed: {e}")
+            return {'success': False, 'error': str(e)}
 
-            for page_num, image in enumerate(images, 1):
-                logger.info(f"Processing page {page_num}/{len(images)}...")
+    def triage_pages(
+            self,
+            pdf_path: str,
+            fingerprints: bool = False,
+            first_page: int = 1,
+            last_page: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Classify pages as 'native', 'scanned' or 'blank' from cheap signals.
 
-                # Clean up image
-                clean_image = self.preprocess_image(image)
+        Signals:
+        1. Text-layer probe: PyPDF2's plain text for the page, a few ms per
+           page (enough characters → native, and that text is kept)
+        2. Share of the page covered by embedded images (big scan → scanned)
+        3. Pixel variance of a tiny thumbnail (flat page → blank)
 
-                # Get OCR confidence scores
-                ocr_data = pytesseract.image_to_data(
-                    clean_image,
-                    output_type=pytesseract.Output.DICT
-                )
+        Signals 2 and 3 only run for pages the probe leaves undecided.
+        pdfplumber is opened only for those pages, or for the layout-aware
+        text of native pages when native_layout is set.
 
-                # Calculate average confidence
-                confidences = [
-                    int(c) for c in ocr_data['conf']
-                    if c != '-1' and int(c) > 0
-                ]
-                avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+        With workers > 1, documents of NATIVE_PARALLEL_MIN_PAGES or more
+        are split into page ranges triaged in parallel processes.
 
-                # Extract text
-                text = pytesseract.image_to_string(clean_image)
+        With fingerprints=True each entry also gets a 'fingerprint': a hash
+        of the page's content streams and resources for native pages, of a
+        low-resolution render for scanned and blank pages (whose content
+        stream only places an image).
+        """
+        from PyPDF2 import PdfReader
 
-                if text.strip():
-                    text_pages.append({
+        reader = PdfReader(pdf_path)
+        last_page = min(last_page or len(reader.pages), len(reader.pages))
+        if self.workers > 1 and last_page - first_page + 1 >= NATIVE_PARALLEL_MIN_PAGES:
+            return self._triage_parallel(pdf_path, fingerprints, first_page, last_page)
+
+        triage = []
+        hashed = {}
+        layout = _LayoutPages(pdf_path)
+        try:
+            for page_num in range(first_page, last_page + 1):
+                page = reader.pages[page_num - 1]
+                with tracing.span("page", page=page_num) as page_span:
+                    with time_stage("native_extract"):
+                        text = page.extract_text() or ''
+                    chars = sum(1 for char in text if not char.isspace())
+
+                    coverage = 0.0
+                    if chars >= NATIVE_MIN_CHARS:
+                        route = 'native'
+                    else:
+                        coverage = self._image_coverage(layout[page_num])
+                        if self._thumbnail_std(pdf_path, page_num) < BLANK_MAX_STD:
+                            route = 'native' if chars else 'blank'
+                        elif coverage >= SCAN_MIN_IMAGE_COVERAGE or not chars:
+                            route = 'scanned'
+                        else:
+                            route = 'native'
+
+                    entry = {
                         'page': page_num,
-                        'text': text,
-                        'method': 'ocr',
-                        'confidence': round(avg_confidence, 2)
-                    })
+                        'route': route,
+                        'chars': chars,
+                        'image_coverage': round(coverage, 3)
+                    }
+                    page_span.set(route=route, chars=chars, image_coverage=entry['image_coverage'])
+                    if route == 'native':
+                        if self.native_layout:
+                            with time_stage("native_layout"):
+                                text = layout[page_num].extract_text() or ''
+                        entry['text'] = text
+                    if fingerprints:
+                        if route == 'native':
+                            digest = self._content_hash(page, hashed)
+                        else:
+                            digest = self._render_hash(pdf_path, page_num)
+                        entry['fingerprint'] = f"{route}:{digest}"
+                    triage.append(entry)
+        finally:
+            layout.close()
+
+        return triage
+
+    def _triage_parallel(self, pdf_path: str, fingerprints: bool, first_page: int, last_page: int) -> List[Dict]:
+        """triage_pages over contiguous page ranges, one per worker process"""
+        total = last_page - first_page + 1
+        workers = min(self.workers, total)
+        size = -(-total // workers)
+        firsts = list(range(first_page, last_page + 1, size))
+        lasts = [min(first + size - 1, last_page) for first in firsts]
+        logger.info(f"Native pass of {total} pages on {workers} workers...")
+
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self._worker_options(),)
+        ) as pool:
+            parts = pool.map(
+                _triage_worker, [pdf_path] * len(firsts), [fingerprints] * len(firsts), firsts, lasts
+            )
+            return [entry for part in parts for entry in part]
+
+    @staticmethod
+    def _image_coverage(page) -> float:
+        """Share of a pdfplumber page covered by embedded images"""
+        page_area = float(page.width * page.height) or 1.0
+        image_area = sum(
+            max(0.0, float(img['x1'] - img['x0'])) * max(0.0, float(img['bottom'] - img['top']))
+            for img in page.images
+        )
+        return min(1.0, image_area / page_area)
+
+    @staticmethod
+    def _thumbnail_std(pdf_path: str, page_num: int) -> float:
+        """Pixel standard deviation of a low-resolution grayscale render"""
+        import numpy as np
+        from pdf2image import convert_from_path
+
+        thumb = convert_from_path(
+            pdf_path, dpi=THUMBNAIL_DPI, first_page=page_num, last_page=page_num, grayscale=True
+        )[0]
+        return float(np.asarray(thumb).std())
+
+    @staticmethod
+    def _content_hash(page, memo: Optional[Dict] = None) -> str:
+        """
+        SHA-256 of what a PyPDF2 page draws: its decoded content streams,
+        every object reachable from its /Resources (fonts, images, form
+        XObjects and their own resources), its boxes and rotation.
+
+        memo maps (object number, generation) to that object's digest, so
+        objects shared by many pages (fonts, logos) are hashed once per
+        document.
+        """
+        from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+        memo = {} if memo is None else memo
+
+        def object_hash(obj) -> bytes:
+            if isinstance(obj, IndirectObject):
+                ref = (obj.idnum, obj.generation)
+                if ref not in memo:
+                    memo[ref] = b''  # an object referring back to itself hashes the reference as empty
+                    memo[ref] = object_hash(obj.get_object())
+                return memo[ref]
+
+            digest = hashlib.sha256(type(obj).__name__.encode())
+            if isinstance(obj, DictionaryObject):
+                for key in sorted(obj):
+                    if key != '/Parent':
+                        digest.update(key.encode())
+                        digest.update(object_hash(obj.raw_get(key)))
+                if isinstance(obj, StreamObject):
+                    # Encoded bytes: decoding every embedded image would cost more than it saves
+                    digest.update(obj._data or b'')
+            elif isinstance(obj, ArrayObject):
+                for item in obj:
+                    digest.update(object_hash(item))
+            else:
+                digest.update(repr(obj).encode())
+            return digest.digest()
+
+        digest = hashlib.sha256()
+        contents = page.get('/Contents')
+        if contents is not None:
+            contents = contents.get_object()
+            for stream in contents if isinstance(contents, ArrayObject) else [contents]:
+                digest.update(stream.get_object().get_data())
+        for key in ('/Resources', '/MediaBox', '/CropBox', '/Rotate'):
+            if key in page:
+                digest.update(key.encode())
+                digest.update(object_hash(page.raw_get(key)))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _render_hash(pdf_path: str, page_num: int) -> str:
+        """SHA-256 of a low-resolution grayscale render of one page"""
+        from pdf2image import convert_from_path
+
+        image = convert_from_path(
+            pdf_path, dpi=FINGERPRINT_DPI, first_page=page_num, last_page=page_num, grayscale=True
+        )[0]
+        return hashlib.sha256(image.tobytes()).hexdigest()
+
+    def ocr_triage(self, pdf_path: str, fingerprints: bool = False) -> List[Dict]:
+        """
+        triage_pages result that routes every page to OCR, for PDFs whose
+        text layer PyPDF2 cannot parse (page count from pdfinfo instead)
+        """
+        total_pages, _ = self._render_window(pdf_path)
+        triage = [{'page': page_num, 'route': 'scanned'} for page_num in range(1, total_pages + 1)]
+        if fingerprints:
+            for entry in triage:
+                entry['fingerprint'] = f"scanned:{self._render_hash(pdf_path, entry['page'])}"
+        return triage
+
+    def native_pass(self, pdf_path: str) -> Dict:
+        """
+        Triage every page and keep the native text where a page has it.
+
+        Returns:
+            {'pages': native page dicts, 'ocr_pages': page numbers that
+             still need OCR, 'total_pages', 'routing'}
+        """
+        try:
+            triage = self.triage_pages(pdf_path)
+        except Exception as e:
+            # Text layer PyPDF2 cannot parse: OCR every page, like document routing does
+            logger.warning(f"Text-layer probe failed ({e}); using OCR for every page")
+            triage = self.ocr_triage(pdf_path)
+
+        pages = [
+            {
+                'page': entry['page'],
+                'text': entry['text'],
+                'method': 'native',
+                'confidence': 100.0
+            }
+            for entry in triage
+            if entry['route'] == 'native' and entry['text'].strip()
+        ]
+
+        scanned = [entry['page'] for entry in triage if entry['route'] == 'scanned']
+        routing = {
+            'native': len(pages),
+            'ocr': len(scanned),
+            'blank': sum(1 for entry in triage if entry['route'] == 'blank')
+        }
+        logger.info(
+            f"Page routing: {routing['native']} native, {routing['ocr']} OCR, {routing['blank']} blank"
+        )
+        for route, count in routing.items():
+            metrics.PAGE_ROUTES_TOTAL.labels(route).inc(count)
+        metrics.PAGES_TOTAL.labels('native').inc(routing['native'])
+
+        return {'pages': pages, 'ocr_pages': scanned, 'total_pages': len(triage), 'routing': routing}
+
+    def extract_text_hybrid(self, pdf_path: str) -> Dict:
+        """
+        Per-page routing: keep native text where the page has it, OCR only
+        scanned pages, skip blank pages, and merge everything in page order.
+        """
+        try:
+            native = self.native_pass(pdf_path)
 
-                    if avg_confidence < self.min_confidence:
-                        logger.warning(
-                            f"⚠ Page {page_num}: Low quality ({avg_confidence:.1f}%)"
-                        )
+            pages = {page['page']: page for page in native['pages']}
+            if native['ocr_pages']:
+                for page in self.iter_pages_ocr(pdf_path, pages=native['ocr_pages']):
+                    pages[page['page']] = page
 
             return {
                 'success': True,
-                'pages': text_pages,
-                'total_pages': len(images)
+                'pages': [pages[num] for num in sorted(pages)],
+                'total_pages': native['total_pages'],
+                'routing': native['routing']
             }
         except Exception as e:
-            logger.error(f"OCR extraction failed: {e}")
+            logger.error(f"Hybrid extraction failed: {e}")
             return {'success': False, 'error': str(e)}
 
     def process_document(self, pdf_path: str) -> Dict:
         """
-        Smart extraction: tries fast method first, falls back to OCR.
+        Smart extraction: uses the fast native text where possible, OCR otherwise.
 
-        Process:
+        With routing="page" (default) every page is triaged on its own, so
+        mixed PDFs keep their native pages and only scanned pages are OCRed.
+
+        With routing="document":
         1. Try native extraction (fast)
         2. If successful and has enough text → done!
         3. Otherwise, use OCR (slower but works on scans)
@@ -170,6 +939,29 @@ class OCRProcessor:
         if not Path(pdf_path).exists():
             return {'success': False, 'error': 'File not found'}
 
+        metrics.DOCUMENTS_TOTAL.labels('extraction').inc()
+
+        with time_stage("document"):
+            if self.cache is None:
+                return self._extract(pdf_path)
+
+            # Same bytes + same settings → same result
+            key = self.cache.make_key(ResultCache.file_hash(pdf_path), self.cache_settings())
+            result = self.cache.get(key)
+            if result is not None:
+                logger.info("✓ Result cache hit")
+                return result
+
+            result = self._extract(pdf_path)
+            if result['success']:
+                self.cache.put(key, result)
+            return result
+
+    def _extract(self, pdf_path: str) -> Dict:
+        """Run the configured extraction strategy (no cache)"""
+        if self.routing == "page":
+            return self.extract_text_hybrid(pdf_path)
+
         # Try native first
         result = self.extract_text_native(pdf_path)
 
@@ -180,9 +972,14 @@ class OCRProcessor:
 
             if avg_words > 50:  # At least 50 words per page
                 logger.info("✓ Native extraction successful")
+                metrics.PAGE_ROUTES_TOTAL.labels('native').inc(result['total_pages'])
+                metrics.PAGES_TOTAL.labels('native').inc(result['total_pages'])
                 return result
 
         # Fall back to OCR
         logger.info("→ Using OCR (scanned document)")
-        return self.extract_text_ocr(pdf_path)
+        result = self.extract_text_ocr(pdf_path)
+        if result['success']:
+            metrics.PAGE_ROUTES_TOTAL.labels('ocr').inc(result['total_pages'])
+        return result
 
@@ -0,0 +1,232 @@
+"""
+Page-level incremental processing for revised contracts.
+
+Every page is fingerprinted during triage: a hash of its content stream
+for native pages, or of a low-resolution render for scans. The page
+store keeps each page's extracted text and its NER spans under that
+fingerprint plus the extraction/NER settings. Processing a new version
+of a contract only extracts and tags pages whose fingerprint is not in
+the store; unchanged pages are reused from any earlier version, even if
+they moved.
+
+NER runs per page here, so page-local offsets stay valid when a page is
+reused. Document offsets are rebuilt when the pages are joined.
+
+Batch runs use the store with `batch_runner.py --page-store` (see
+pipeline.process_pdf).
+
+Usage:
+    python scripts/page_store.py contract_v2.pdf --previous v1.json --output v2.json
+"""
+import argparse
+import json
+import logging
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import chunked_ner
+import metrics
+from NER_Algo import cache_settings as ner_cache_settings
+from result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored page format changes
+PAGE_STORE_VERSION = 2
+
+
+class PageStore:
+    """Per-page text + NER results keyed by page fingerprint (backed by ResultCache)"""
+
+    def __init__(self, store_dir: str, max_size_mb: int = 1024):
+        self.cache = ResultCache(store_dir, max_size_mb)
+
+    def key(self, fingerprint: str, settings: Dict) -> str:
+        return self.cache.make_key(fingerprint, settings)
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.cache.get(key)
+
+    def put(self, key: str, entry: Dict) -> None:
+        self.cache.put(key, entry)
+
+
+def _settings(processor, ner_mode: str) -> Dict:
+    return {
+        'extraction': processor.cache_settings(),
+        'ner': ner_cache_settings(ner_mode),
+        'ner_mode': ner_mode,
+        'chunking_version': chunked_ner.CHUNKING_VERSION,
+        'page_store_version': PAGE_STORE_VERSION,
+    }
+
+
+def _tag_page(page: Dict, ner_mode: str) -> Dict:
+    """NER for one page, offsets relative to the page text"""
+    ner = chunked_ner.extract_document([page], mode=ner_mode)
+    strip = lambda items: [{k: v for k, v in item.items() if k != 'page'} for item in items]  # noqa: E731
+    return {'spans': strip(ner['spans']), 'termination_clauses': strip(ner['termination_clauses'])}
+
+
+def process_incremental(pdf_path: str, processor, store: PageStore, ner_mode: str = "full") -> Dict:
+    """
+    Extract and tag a document, reusing stored pages whose fingerprint is unchanged.
+
+    Returns:
+        pipeline.process_pdf style result plus 'reused_pages' and
+        'processed_pages' (page numbers) and each page's 'fingerprint'
+    """
+    settings = _settings(processor, ner_mode)
+    try:
+        triage = processor.triage_pages(pdf_path, fingerprints=True)
+    except Exception as e:
+        # Same fallback as OCRProcessor.native_pass: OCR every page, fingerprinted by its render
+        logger.warning(f"Text-layer probe failed ({e}); using OCR for every page")
+        triage = processor.ocr_triage(pdf_path, fingerprints=True)
+
+    entries = {}
+    keys = {}
+    for item in triage:
+        if item['route'] == 'blank':
+            continue
+        keys[item['page']] = store.key(item['fingerprint'], settings)
+        stored = store.get(keys[item['page']])
+        if stored is not None:
+            entries[item['page']] = stored
+
+    reused = sorted(entries)
+    changed = [item for item in triage if item['route'] != 'blank' and item['page'] not in entries]
+    logger.info(f"📄 {len(reused)} pages reused, {len(changed)} to process")
+    metrics.PAGES_TOTAL.labels('reused').inc(len(reused))
+
+    pages = {}
+    for item in changed:
+        if item['route'] == 'native' and item['text'].strip():
+            pages[item['page']] = {'page': item['page'], 'text': item['text'], 'method': 'native', 'confidence': 100.0}
+    metrics.PAGES_TOTAL.labels('native').inc(len(pages))
+
+    scanned = [item['page'] for item in changed if item['route'] == 'scanned']
+    if scanned:
+        for page in processor.iter_pages_ocr(pdf_path, pages=scanned):
+            pages[page['page']] = page
+
+    for page_num, page in pages.items():
+        entry = {'page': {k: v for k, v in page.items() if k != 'page'}, **_tag_page(page, ner_mode)}
+        store.put(keys[page_num], entry)
+        entries[page_num] = entry
+
+    # Pages that gave no text are stored too, so the next revision does not OCR them again
+    for item in changed:
+        if item['page'] not in pages:
+            entries[item['page']] = {'page': None, 'spans': [], 'termination_clauses': []}
+            store.put(keys[item['page']], entries[item['page']])
+
+    fingerprints = {item['page']: item['fingerprint'] for item in triage}
+    return _assemble(entries, fingerprints, len(triage), reused, sorted(item['page'] for item in changed))
+
+
+def _assemble(entries: Dict[int, Dict], fingerprints: Dict[int, str], total_pages: int,
+              reused: List[int], processed: List[int]) -> Dict:
+    """Join per-page entries into one document result with document offsets"""
+    pages = [
+        dict(entries[num]['page'], page=num, fingerprint=fingerprints[num])
+        for num in sorted(entries)
+        if entries[num]['page'] is not None
+    ]
+    _, page_starts, _ = chunked_ner.join_pages(pages)
+
+    spans, clauses = [], []
+    for page, start in zip(pages, page_starts):
+        entry = entries[page['page']]
+        for target, items in ((spans, entry['spans']), (clauses, entry['termination_clauses'])):
+            target.extend(
+                dict(item, start=item['start'] + start, end=item['end'] + start, page=page['page'])
+                for item in items
+            )
+
+    party_names, dates, amounts, termination_clauses = chunked_ner.as_ner_tuple(
+        {'spans': spans, 'termination_clauses': clauses}
+    )
+    return {
+        'success': True,
+        'pages': pages,
+        'total_pages': total_pages,
+        'reused_pages': reused,
+        'processed_pages': processed,
+        'entities': {
+            'party_names': party_names,
+            'dates': dates,
+            'amounts': amounts,
+            'termination_clauses': termination_clauses
+        },
+        'entity_spans': spans,
+        'clause_spans': clauses,
+    }
+
+
+def diff_entities(previous: Dict, current: Dict) -> Dict:
+    """
+    Entities added and removed between two versions, compared by
+    (label, text) so moved pages do not show up as changes.
+    """
+    def counts(result):
+        items = [(span['label'], span['text']) for span in result.get('entity_spans', [])]
+        items += [('TERMINATION_CLAUSE', clause['text']) for clause in result.get('clause_spans', [])]
+        return Counter(items)
+
+    def where(result, label, text):
+        for span in result.get('entity_spans', []) + result.get('clause_spans', []):
+            if span.get('label', 'TERMINATION_CLAUSE') == label and span['text'] == text:
+                return span.get('page')
+        return None
+
+    old, new = counts(previous), counts(current)
+    return {
+        'added': [
+            {'label': label, 'text': text, 'page': where(current, label, text)}
+            for label, text in sorted((new - old).elements())
+        ],
+        'removed': [
+            {'label': label, 'text': text, 'page': where(previous, label, text)}
+            for label, text in sorted((old - new).elements())
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process a contract revision, reusing unchanged pages")
+    parser.add_argument("pdf", help="PDF to process")
+    parser.add_argument("--previous", help="Result JSON of the earlier version, to diff entities against")
+    parser.add_argument("--output", help="Write the result JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Settings live in the lexiscan-auto scripts package
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "lexiscan-auto" / "scripts"))
+    from src.utils.config import settings
+    from ocr_processor import OCRProcessor
+    import pipeline
+    import transformer_ner
+
+    transformer_ner.configure(**pipeline.transformer_options_from_settings(settings))
+    processor = OCRProcessor(**pipeline.ocr_options_from_settings(settings))
+    store = PageStore(str(settings.page_store_dir), settings.cache_max_size_mb)
+    result = process_incremental(args.pdf, processor, store, settings.ner_mode)
+
+    if args.previous:
+        previous = json.loads(Path(args.previous).read_text(encoding="utf-8"))
+        result['entity_diff'] = diff_entities(previous, result)
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+        print(f"✓ {len(result['reused_pages'])} pages reused, {len(result['processed_pages'])} processed")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
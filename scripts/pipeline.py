@@ -0,0 +1,267 @@
+"""
+OCR + NER for one PDF, shared by the API and the batch runner.
+
+Pool workers call init_worker once (OCRProcessor, result cache, warm spaCy
+model) and then process_pdf per document. warm_up loads the same libraries
+and models ahead of time; start_workers makes a pool fork all its workers
+and run init_worker before the first document arrives.
+
+The API scheduler runs the same work as separate stages on its own lanes:
+native_stage (triage + native text), ocr_stage (a chunk of scanned pages)
+and ner_stage (entities for the merged pages).
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-process pipeline objects inside pool workers (set by init_worker)
+_processor = None
+_cache = None
+_page_store = None
+_ner_mode = "full"
+
+
+def ocr_options_from_settings(settings) -> Dict:
+    """OCRProcessor keyword arguments from src.utils.config.Settings"""
+    return {
+        'min_confidence': settings.ocr_min_confidence,
+        'dpi': settings.ocr_dpi,
+        'adaptive_dpi': settings.ocr_adaptive_dpi,
+        'render_memory_mb': settings.ocr_render_memory_mb,
+        'refine_regions': settings.ocr_refine_regions,
+        'native_layout': settings.ocr_native_layout,
+        'workers': settings.ocr_workers,
+    }
+
+
+def transformer_options_from_settings(settings) -> Dict:
+    """transformer_ner.configure keyword arguments from src.utils.config.Settings"""
+    return {
+        'model_path': settings.model_path,
+        'max_length': settings.max_length,
+        'min_confidence': settings.min_confidence,
+        'batch_size': settings.ner_batch_size,
+        'quantize': settings.ner_quantize,
+    }
+
+
+def warm_up(ner_mode: str = "full", ocr: bool = True, ner: bool = True):
+    """
+    Import and load what the pipeline needs before the first document.
+
+    Args:
+        ner_mode: NER_Algo mode ("rules" has no model to load)
+        ocr: Import the rendering/OCR libraries and check Tesseract
+        ner: Load the NER model for ner_mode
+    """
+    import chunked_ner  # noqa: F401
+    import nlp_registry
+    import ocr_processor
+    from transformer_ner import get_engine
+
+    if ocr:
+        ocr_processor.preload()
+        ocr_processor.check_tesseract()
+    if not ner:
+        return
+    if ner_mode == "full":
+        nlp_registry.warm_up()
+    elif ner_mode == "transformer":
+        get_engine().predict(["This Agreement is made on January 15, 2024 by Acme Corp. for $1,000.00."])
+
+
+def trace_options_from_settings(settings) -> Dict:
+    """tracing.configure keyword arguments from src.utils.config.Settings"""
+    return {
+        'enabled': settings.trace_enabled,
+        'profile_rate': settings.trace_profile_rate,
+        'slow_seconds': settings.trace_slow_seconds,
+        'profile_dir': str(settings.trace_profile_dir) if settings.trace_profile_dir else None,
+    }
+
+
+def init_worker(
+        ocr_options: Dict,
+        cache_dir: Optional[str] = None,
+        cache_max_size_mb: int = 1024,
+        ner_mode: str = "full",
+        warm_ner: bool = True,
+        warm_ocr: bool = True,
+        trace_options: Optional[Dict] = None,
+        page_store_dir: Optional[str] = None,
+        transformer_options: Optional[Dict] = None
+):
+    """
+    Build the pipeline once per worker process.
+
+    Args:
+        ocr_options: OCRProcessor keyword arguments
+        cache_dir: Result cache directory (None disables caching)
+        cache_max_size_mb: Result cache size limit
+        ner_mode: NER_Algo mode ("rules" skips loading spaCy, "transformer" loads legal-bert)
+        warm_ner: Load the NER model now (off for workers that only extract text)
+        warm_ocr: Import the OCR libraries now (off for workers that only run NER)
+        trace_options: tracing.configure keyword arguments (None = tracing off)
+        page_store_dir: Page store directory; process_pdf then reuses unchanged
+            pages of earlier revisions (None = off)
+        transformer_options: transformer_ner.configure keyword arguments (for ner_mode "transformer")
+    """
+    global _processor, _cache, _page_store, _ner_mode
+    from ocr_processor import OCRProcessor
+    from result_cache import ResultCache
+    import tracing
+    import transformer_ner
+
+    tracing.configure(**(trace_options or {}))
+    if transformer_options:
+        transformer_ner.configure(**transformer_options)
+
+    _cache = ResultCache(cache_dir, cache_max_size_mb) if cache_dir else None
+    if page_store_dir:
+        from page_store import PageStore
+
+        _page_store = PageStore(page_store_dir, cache_max_size_mb)
+    _processor = OCRProcessor(cache=_cache, **ocr_options)
+    _ner_mode = ner_mode
+    warm_up(ner_mode, ocr=warm_ocr, ner=warm_ner)
+
+
+def _worker_ready(barrier) -> int:
+    """Pool task that holds its worker until every worker has picked one up"""
+    barrier.wait()
+    return os.getpid()
+
+
+def start_workers(pool: Executor, workers: int, timeout: float = 300) -> List[int]:
+    """
+    Make every worker of a pool start and run its initializer now, so the
+    first documents do not pay for process start-up and model loading.
+    Each of `workers` tasks waits at a barrier, so they can only finish
+    once `workers` distinct processes are initialized.
+
+    Returns:
+        The worker process ids
+    """
+    with multiprocessing.Manager() as manager:
+        barrier = manager.Barrier(workers, timeout=timeout)
+        futures = [pool.submit(_worker_ready, barrier) for _ in range(workers)]
+        return sorted(future.result() for future in futures)
+
+
+def process_pdf(pdf_path: str) -> Dict:
+    """
+    Extract every page of a PDF and run windowed NER over its pages.
+    Errors are returned as {'success': False, 'error': ...} instead of raised.
+    """
+    import tracing
+
+    if _processor is None:
+        init_worker({})
+
+    with tracing.document("process_pdf", file=os.path.basename(pdf_path)) as span:
+        try:
+            if _page_store is not None:
+                return _process_incremental(pdf_path, span)
+
+            result = _processor.process_document(pdf_path)
+            if not result['success']:
+                span.set(error=result.get('error'))
+                return result
+
+            span.set(pages=len(result['pages']), total_pages=result['total_pages'])
+            return _add_entities(result)
+        except Exception as e:
+            logger.error(f"Pipeline failed for {pdf_path}: {e}")
+            span.set(error=str(e))
+            return {'success': False, 'error': str(e)}
+
+
+def _process_incremental(pdf_path: str, span) -> Dict:
+    """process_pdf through the page store: only new or changed pages are extracted and tagged"""
+    from page_store import process_incremental
+
+    if not os.path.exists(pdf_path):
+        return {'success': False, 'error': 'File not found'}
+
+    result = process_incremental(pdf_path, _processor, _page_store, _ner_mode)
+    span.set(pages=len(result['pages']), total_pages=result['total_pages'], reused=len(result['reused_pages']))
+    return result
+
+
+def _add_entities(result: Dict) -> Dict:
+    """Run windowed NER over an extraction result's pages and attach the entities"""
+    import chunked_ner
+
+    ner = chunked_ner.extract_document(result['pages'], mode=_ner_mode, cache=_cache)
+    party_names, dates, amounts, termination_clauses = chunked_ner.as_ner_tuple(ner)
+
+    result['entities'] = {
+        'party_names': party_names,
+        'dates': dates,
+        'amounts': amounts,
+        'termination_clauses': termination_clauses
+    }
+    # Offsets are into the pages joined with blank lines; each span has its page number
+    result['entity_spans'] = ner['spans']
+    result['clause_spans'] = ner['termination_clauses']
+    return result
+
+
+def native_stage(pdf_path: str) -> Dict:
+    """
+    Native lane: a cached extraction, or the native pages plus the page
+    numbers that still need OCR ('ocr_pages') and the cache key to store
+    the finished extraction under.
+    """
+    from metrics import DOCUMENTS_TOTAL, time_stage
+    from result_cache import ResultCache
+
+    if _processor is None:
+        init_worker({}, warm_ner=False)
+
+    try:
+        DOCUMENTS_TOTAL.labels('extraction').inc()
+        key = None
+        if _cache is not None:
+            key = _cache.make_key(ResultCache.file_hash(pdf_path), _processor.cache_settings())
+            cached = _cache.get(key)
+            if cached is not None:
+                return dict(cached, ocr_pages=[], cached=True)
+
+        with time_stage("native_pass"):
+            result = _processor.native_pass(pdf_path)
+        return dict(result, success=True, cache_key=key)
+    except Exception as e:
+        logger.error(f"Native stage failed for {pdf_path}: {e}")
+        return {'success': False, 'error': str(e)}
+
+
+def ocr_stage(pdf_path: str, pages: List[int]) -> List[Dict]:
+    """OCR lane: OCR the given page numbers"""
+    if _processor is None:
+        init_worker({}, warm_ner=False)
+    return list(_processor.iter_pages_ocr(pdf_path, pages=pages))
+
+
+def ner_stage(extraction: Dict) -> Dict:
+    """
+    NER lane: cache the merged extraction (when native_stage gave a key)
+    and attach entities.
+    """
+    if _processor is None:
+        init_worker({}, warm_ocr=False)
+
+    key = extraction.pop('cache_key', None)
+    extraction.pop('cached', None)
+    extraction.pop('ocr_pages', None)
+    try:
+        if _cache is not None and key is not None:
+            _cache.put(key, extraction)
+        return _add_entities(extraction)
+    except Exception as e:
+        logger.error(f"NER stage failed: {e}")
+        return {'success': False, 'error': str(e)}
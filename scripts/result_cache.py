@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction runs without the cross-process lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache for extraction results.
+
+    Entries are JSON files named by a hash of the input content plus the
+    settings that produced them. Writes go to a temp file and are renamed
+    into place, so worker processes sharing the directory never see a
+    half-written entry. Reads refresh the file's mtime; when the directory
+    grows past max_size_mb the least recently used entries are removed.
+
+    Each process tracks the directory size from its own writes and re-stats
+    the directory every rescan_seconds, so writes by other processes
+    sharing it are counted too. Eviction runs under a lock file and
+    re-reads the directory, so concurrent processes do not evict twice.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: int = 1024, rescan_seconds: float = 30.0):
+        """
+        Args:
+            cache_dir: Directory for cache entries (shared between processes)
+            max_size_mb: Size limit before LRU eviction kicks in
+            rescan_seconds: How often to re-stat the directory size
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.rescan_seconds = rescan_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self._size_estimate = None
+        self._size_checked = 0.0
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """SHA-256 of a file's contents, read in chunks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """SHA-256 of a text"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_key(content_hash: str, settings: Dict) -> str:
+        """Cache key for some content processed with the given settings"""
+        payload = content_hash + json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached value for `key`, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            # Mark as recently used
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value) -> bool:
+        """
+        Store a JSON-serializable value under `key` (atomic rename).
+        A failed write (disk full, permissions) is logged and returns False:
+        the cache is best-effort and never fails the document being processed.
+        """
+        path = self._path(key)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if not isinstance(e, OSError):
+                raise
+            logger.warning(f"Result cache: could not write {path.name}: {e}")
+            return False
+
+        now = time.monotonic()
+        if self._size_estimate is None or now - self._size_checked >= self.rescan_seconds:
+            self._size_estimate = self._total_size()
+            self._size_checked = now
+        else:
+            self._size_estimate += path.stat().st_size
+
+        if self._size_estimate > self.max_bytes:
+            self.evict()
+        return True
+
+    def _entries(self):
+        """(mtime, size, path) for every cache entry"""
+        entries = []
+        for path in self.cache_dir.glob('*/*.json'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _total_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    @contextmanager
+    def _eviction_lock(self):
+        """Exclusive lock on the cache directory, shared by every process using it"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.cache_dir / ".evict.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under the size limit"""
+        removed = 0
+        with self._eviction_lock():
+            # Re-read under the lock: another process may have evicted already
+            entries = sorted(self._entries(), key=lambda entry: entry[0])
+            total = sum(size for _, size, _ in entries)
+
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+        self._size_estimate = total
+        self._size_checked = time.monotonic()
+        if removed:
+            logger.info(f"Result cache: evicted {removed} entries")
+        return removed
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this process plus current cache size"""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': len(entries),
+            'size_bytes': sum(size for _, size, _ in entries)
+        }
@@ -0,0 +1,168 @@
+"""
+Rule-based AMOUNT and DATE extraction.
+
+Contract amounts and dates come in a handful of fixed formats (the same
+ones create_sample_data generates):
+    $50,000    $50,000.00    USD 50,000
+    January 15, 2024    01/15/2024    15 January 2024
+
+One precompiled regex finds all of them in a single scan and normalizes
+amounts to (Decimal value, currency) and dates to ISO 8601, so callers
+that only need these two fields can skip the parser and NER entirely.
+
+The same rules can run inside a spaCy pipeline ahead of `ner`
+(add_to_pipeline); the statistical NER keeps the entities they set.
+"""
+import re
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+COMPONENT_NAME = "lexiscan_amount_date_rules"
+
+CURRENCY_SYMBOLS = {'$': 'USD', '€': 'EUR', '£': 'GBP'}
+
+MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8,
+    'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+_MONTH = r"(?:" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+_NUMBER = r"\d{1,3}(?:,\d{3})+|\d+"
+
+RULES_RE = re.compile(
+    r"(?P<amount>"
+    r"(?:(?P<symbol>[$€£])\s?|(?P<code>USD|EUR|GBP)\s)"
+    rf"(?P<number>{_NUMBER})(?:\.(?P<cents>\d{{1,2}}))?(?![\d,.]*\d)"
+    r")"
+    r"|(?P<date_mdy>"
+    rf"\b(?P<mdy_month>{_MONTH})\s+(?P<mdy_day>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<mdy_year>\d{{4}})\b"
+    r")"
+    r"|(?P<date_dmy>"
+    rf"\b(?P<dmy_day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?P<dmy_month>{_MONTH})\s+(?P<dmy_year>\d{{4}})\b"
+    r")"
+    r"|(?P<date_numeric>"
+    r"(?<![\d/])(?P<num_month>\d{1,2})/(?P<num_day>\d{1,2})/(?P<num_year>\d{4})(?![\d/])"
+    r")",
+    re.IGNORECASE
+)
+
+
+def _iso_date(year: str, month: int, day: str) -> Optional[str]:
+    """ISO date string, or None if the parts don't form a real date"""
+    try:
+        return date(int(year), month, int(day)).isoformat()
+    except ValueError:
+        return None
+
+
+def _month(name: str) -> int:
+    return MONTHS[name.rstrip('.').lower()]
+
+
+def _normalize(match: re.Match) -> Optional[Dict]:
+    """Entity dict for one regex match (None for impossible dates)"""
+    entity = {'text': match.group(0), 'start': match.start(), 'end': match.end()}
+
+    if match.group('amount'):
+        number = match.group('number').replace(',', '')
+        cents = match.group('cents')
+        currency = match.group('code') or CURRENCY_SYMBOLS[match.group('symbol')]
+        entity.update(
+            label='MONEY',
+            value=Decimal(f"{number}.{cents}" if cents else number),
+            currency=currency.upper()
+        )
+        return entity
+
+    if match.group('date_mdy'):
+        value = _iso_date(match.group('mdy_year'), _month(match.group('mdy_month')), match.group('mdy_day'))
+    elif match.group('date_dmy'):
+        value = _iso_date(match.group('dmy_year'), _month(match.group('dmy_month')), match.group('dmy_day'))
+    else:
+        # Numeric dates are US month/day/year, like generate_date's %m/%d/%Y
+        value = _iso_date(match.group('num_year'), int(match.group('num_month')), match.group('num_day'))
+
+    if value is None:
+        return None
+    entity.update(label='DATE', value=value)
+    return entity
+
+
+def extract_entities(text: str) -> List[Dict]:
+    """
+    Find amounts and dates in one pass over `text`.
+
+    Returns:
+        Entities in text order, each a dict with label ('MONEY' / 'DATE'),
+        text, start, end (character offsets) and value; MONEY also has
+        currency. Amount values are Decimal, date values ISO strings.
+    """
+    entities = []
+    for match in RULES_RE.finditer(text):
+        entity = _normalize(match)
+        if entity is not None:
+            entities.append(entity)
+    return entities
+
+
+def extract_amounts_dates(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Unique date and amount strings as NER_Algo reports them.
+
+    Returns:
+        (dates, amounts)
+    """
+    dates, amounts = {}, {}
+    for entity in extract_entities(text):
+        target = amounts if entity['label'] == 'MONEY' else dates
+        target.setdefault(entity['text'], None)
+    return list(dates), list(amounts)
+
+
+def _register_component():
+    """Register the spaCy component (imports spaCy only when it is used)"""
+    from spacy.language import Language
+    from spacy.tokens import Span
+    from spacy.util import filter_spans
+
+    if not Span.has_extension("value"):
+        Span.set_extension("value", default=None)
+    if not Span.has_extension("currency"):
+        Span.set_extension("currency", default=None)
+
+    if Language.has_factory(COMPONENT_NAME):
+        return
+
+    @Language.component(COMPONENT_NAME)
+    def amount_date_rules(doc):
+        spans = []
+        for entity in extract_entities(doc.text):
+            span = doc.char_span(entity['start'], entity['end'], label=entity['label'], alignment_mode="expand")
+            if span is None:
+                continue
+            span._.value = entity['value']
+            span._.currency = entity.get('currency')
+            spans.append(span)
+
+        # Rule matches win over entities set by earlier components
+        doc.ents = filter_spans(spans + [ent for ent in doc.ents if not any(
+            ent.start < span.end and span.start < ent.end for span in spans
+        )])
+        return doc
+
+
+def add_to_pipeline(nlp, before: Optional[str] = "ner"):
+    """
+    Add the amount/date rules to a spaCy pipeline, ahead of `before` when
+    that component exists (otherwise at the end). Matched spans carry the
+    normalized value in span._.value and span._.currency.
+    """
+    _register_component()
+    if COMPONENT_NAME in nlp.pipe_names:
+        return nlp.get_pipe(COMPONENT_NAME)
+    if before in nlp.pipe_names:
+        return nlp.add_pipe(COMPONENT_NAME, before=before)
+    return nlp.add_pipe(COMPONENT_NAME)
@@ -0,0 +1,281 @@
+"""
+Lane scheduler for the extraction API.
+
+Documents move through three lanes, each with its own process pool,
+concurrency limit and queue bound:
+    native - page triage + native text (milliseconds per document)
+    ocr    - scanned pages, split into chunks of a few pages
+    ner    - entities over the merged pages
+
+A large scan therefore only occupies OCR workers, and digital contracts
+queued behind it still go straight through the native and NER lanes.
+
+Within a lane, work is ordered by (job priority, tenant priority, rank).
+A document's rank is its arrival time, and chunk N of it ranks as if it
+arrived N * chunk_aging_s later. Chunk 0 of a new document therefore runs
+before chunk 5 of a large scan that started just before it, so large
+documents cannot starve small ones; but the large scan's later chunks
+still run ahead of documents arriving more than that much later, so a
+steady stream of new documents cannot starve it either.
+
+New documents are rejected (LaneFull, 429 in the API) when the native
+lane's queue is full or too many documents are in flight. Once admitted,
+a document is never rejected: every lane submission, the native one
+included, waits for queue room.
+
+Queue wait and run time per lane are exported as
+lexiscan_lane_seconds{lane, phase}; stats() also reports recent
+p50/p95/p99 latency per lane for /health.
+
+With tracing enabled, every lane call runs under tracing.traced_call in
+its worker; the returned span trees hang under one span per lane call
+(with its queue wait) in the document's trace.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import metrics
+import pipeline
+import tracing
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+DEFAULT_TENANT_PRIORITY = 1
+LATENCY_WINDOW = 1000  # recent items per lane used for the /health percentiles
+
+
+class LaneFull(Exception):
+    """A lane's queue is at its bound"""
+
+    def __init__(self, lane: str, queued: int):
+        super().__init__(f"Lane {lane} is full ({queued} queued)")
+        self.lane = lane
+        self.queued = queued
+
+
+def _percentile(ordered: List[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return round(ordered[index], 4)
+
+
+class Lane:
+    """Priority queue in front of an executor, with at most `concurrency` items running"""
+
+    def __init__(self, name: str, executor: Executor, concurrency: int, max_queue: int):
+        self.name = name
+        self.executor = executor
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.running = 0
+        self._queue: List[Tuple] = []
+        self._sequence = itertools.count()
+        self._room_waiters: deque = deque()
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def has_room(self) -> bool:
+        return self.queued < self.max_queue
+
+    async def submit(self, fn: Callable, *args, key: Tuple = (), wait: bool = False):
+        """
+        Run fn(*args) on the lane's executor and return its result.
+
+        Args:
+            key: Sort key, lowest first (see Scheduler.key)
+            wait: When the queue is full, wait for room instead of raising LaneFull
+        """
+        loop = asyncio.get_running_loop()
+        while not self.has_room():
+            if not wait:
+                raise LaneFull(self.name, self.queued)
+            waiter = loop.create_future()
+            self._room_waiters.append(waiter)
+            await waiter
+
+        future = loop.create_future()
+        heapq.heappush(self._queue, (key, next(self._sequence), fn, args, future, time.perf_counter()))
+        metrics.LANE_QUEUE_DEPTH.labels(self.name).set(self.queued)
+        self._dispatch()
+        return await future
+
+    def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while self.running < self.concurrency and self._queue:
+            _, _, fn, args, future, queued_at = heapq.heappop(self._queue)
+            if future.cancelled():
+                continue
+
+            started = time.perf_counter()
+            metrics.LANE_SECONDS.labels(self.name, "wait").observe(started - queued_at)
+            self.running += 1
+            task = loop.run_in_executor(self.executor, fn, *args)
+            task.add_done_callback(lambda done, f=future, q=queued_at, s=started: self._finished(done, f, q, s))
+
+        metrics.LANE_QUEUE_DEPTH.labels(self.name).set(self.queued)
+        while self._room_waiters and self.has_room():
+            waiter = self._room_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _finished(self, done, future, queued_at: float, started: float):
+        finished = time.perf_counter()
+        self.running -= 1
+        metrics.LANE_SECONDS.labels(self.name, "run").observe(finished - started)
+        self._latencies.append(finished - queued_at)
+
+        if not future.cancelled():
+            if done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result())
+        self._dispatch()
+
+    def stats(self) -> Dict:
+        """Current load and recent end-to-end (wait + run) latency"""
+        ordered = sorted(self._latencies)
+        return {
+            'concurrency': self.concurrency,
+            'running': self.running,
+            'queued': self.queued,
+            'max_queue': self.max_queue,
+            'p50_s': _percentile(ordered, 50),
+            'p95_s': _percentile(ordered, 95),
+            'p99_s': _percentile(ordered, 99),
+        }
+
+
+class Scheduler:
+    """Routes each document through the native, OCR and NER lanes"""
+
+    def __init__(
+            self,
+            lanes: Dict[str, Lane],
+            ocr_chunk_pages: int = 4,
+            max_in_flight: int = 64,
+            tenant_priorities: Optional[Dict[str, int]] = None,
+            chunk_aging_s: float = 2.0
+    ):
+        self.lanes = lanes
+        self.ocr_chunk_pages = ocr_chunk_pages
+        self.max_in_flight = max_in_flight
+        self.chunk_aging_s = chunk_aging_s
+        self.tenant_priorities = tenant_priorities or {}
+        self.in_flight = 0
+
+    def key(
+            self, priority: str, tenant: Optional[str], part: int = 0, arrival: Optional[float] = None
+    ) -> Tuple[int, int, float]:
+        """
+        Lane sort key: job priority, then tenant priority, then rank
+        (document arrival, monotonic clock, plus chunk index * chunk_aging_s)
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {list(PRIORITIES)}")
+        tenant_priority = self.tenant_priorities.get(tenant, DEFAULT_TENANT_PRIORITY)
+        if arrival is None:
+            arrival = time.monotonic()
+        return PRIORITIES[priority], tenant_priority, arrival + part * self.chunk_aging_s
+
+    def admit(self):
+        """Claim a document slot or raise LaneFull"""
+        native = self.lanes['native']
+        if not native.has_room():
+            raise LaneFull(native.name, native.queued)
+        if self.in_flight >= self.max_in_flight:
+            raise LaneFull('documents', self.in_flight)
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+
+    @staticmethod
+    def chunks(pages: Sequence[int], size: int) -> List[List[int]]:
+        return [list(pages[i:i + size]) for i in range(0, len(pages), size)]
+
+    async def _submit(
+            self,
+            lane: str,
+            fn: Callable,
+            *args,
+            key: Tuple,
+            wait: bool = False,
+            trace: Optional[tracing.Trace] = None,
+            **attributes
+    ):
+        """Lane.submit, recording the call as a span of `trace` when given"""
+        if trace is None:
+            return await self.lanes[lane].submit(fn, *args, key=key, wait=wait)
+
+        span = tracing.Span(lane, attributes)
+        trace.root.children.append(span)
+        try:
+            result, fragment = await self.lanes[lane].submit(
+                tracing.traced_call, fn, args, trace.profiled, key=key, wait=wait
+            )
+        finally:
+            span.finish()
+
+        span.set(wait_ms=round(span.duration_ms - fragment['span']['duration_ms'], 3))
+        span.attach(fragment['span'])
+        trace.add_stats(fragment['stats'])
+        return result
+
+    async def process(self, pdf_path: str, priority: str = "normal", tenant: Optional[str] = None) -> Dict:
+        """
+        Run one admitted document through the lanes (releases its slot when done).
+        Returns the same result as pipeline.process_pdf.
+        """
+        trace = None
+        if tracing.enabled():
+            trace = tracing.Trace("document", file=os.path.basename(pdf_path), priority=priority, tenant=tenant)
+
+        arrival = time.monotonic()
+        try:
+            # Admission already checked the native queue; an admitted document waits for room
+            extraction = await self._submit(
+                'native', pipeline.native_stage, pdf_path,
+                key=self.key(priority, tenant, arrival=arrival), wait=True, trace=trace
+            )
+            if not extraction['success']:
+                return extraction
+
+            ocr_pages = extraction.pop('ocr_pages', [])
+            if ocr_pages:
+                chunk_results = await asyncio.gather(*(
+                    self._submit(
+                        'ocr', pipeline.ocr_stage, pdf_path, chunk,
+                        key=self.key(priority, tenant, part, arrival), wait=True, trace=trace, pages=chunk
+                    )
+                    for part, chunk in enumerate(self.chunks(ocr_pages, self.ocr_chunk_pages))
+                ))
+                pages = extraction['pages'] + [page for chunk in chunk_results for page in chunk]
+                extraction['pages'] = sorted(pages, key=lambda page: page['page'])
+
+            return await self._submit(
+                'ner', pipeline.ner_stage, extraction, key=self.key(priority, tenant, arrival=arrival),
+                wait=True, trace=trace
+            )
+        finally:
+            self.release()
+            if trace is not None:
+                trace.finish()
+
+    def stats(self) -> Dict:
+        return {
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'lanes': {name: lane.stats() for name, lane in self.lanes.items()},
+        }
@@ -0,0 +1,252 @@
+"""
+Per-document traces: a tree of timed spans for one document.
+
+    process_pdf
+    ├── document
+    │   ├── native_pass ── page (route, chars) ── native_extract
+    │   ├── pdf_render (first_page, last_page, dpi)
+    │   └── page (width, height, dpi, confidence) ── preprocess / tesseract / refine
+    └── ner (mode, chars, windows) ── tokenize / ner / clauses
+
+metrics.time_stage opens a span for its stage, so every Prometheus stage
+shows up in the tree; page and NER spans add sizes and confidences.
+Outside a trace, span() only looks up a context variable.
+
+Finished traces are logged on the "lexiscan.trace" logger with the tree
+in the record's `trace` field. With setup_logging(json_format=True) each
+trace is one JSON line.
+
+Profiling: a profile_rate share of traced documents also run under
+cProfile. If such a document takes at least slow_seconds, its record
+gets the top functions by cumulative time (`profile`) and, with
+profile_dir set, the path of the full .prof dump (`profile_path`).
+
+In the API one document runs in several lane processes. Each lane call
+is traced in its worker (traced_call) and the scheduler joins the
+fragments under one document span.
+"""
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("lexiscan.trace")
+
+PROFILE_TOP_FUNCTIONS = 30
+
+_config = {'enabled': False, 'profile_rate': 0.0, 'slow_seconds': 60.0, 'profile_dir': None}
+_current: contextvars.ContextVar = contextvars.ContextVar("lexiscan_span", default=None)
+
+
+def configure(
+        enabled: bool = False,
+        profile_rate: float = 0.0,
+        slow_seconds: float = 60.0,
+        profile_dir: Optional[str] = None
+):
+    """
+    Args:
+        enabled: Trace every document
+        profile_rate: Share of traced documents (0-1) run under cProfile
+        slow_seconds: Profiled documents at least this slow get the profile attached
+        profile_dir: Also write the .prof dumps of slow documents here
+    """
+    _config.update(
+        enabled=enabled, profile_rate=profile_rate, slow_seconds=slow_seconds,
+        profile_dir=str(profile_dir) if profile_dir else None
+    )
+
+
+def enabled() -> bool:
+    return _config['enabled']
+
+
+class Span:
+    """A timed node of a trace"""
+
+    __slots__ = ("name", "attributes", "children", "started", "duration_ms")
+
+    def __init__(self, name: str, attributes: Optional[Dict] = None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.children: List = []
+        self.started = time.perf_counter()
+        self.duration_ms = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def attach(self, fragment: Dict):
+        """Add a span tree recorded in another process (Span.to_dict output)"""
+        self.children.append(fragment)
+
+    def finish(self):
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 3)
+
+    def to_dict(self) -> Dict:
+        node = {'name': self.name, 'duration_ms': self.duration_ms}
+        if self.attributes:
+            node['attributes'] = self.attributes
+        if self.children:
+            node['children'] = [child.to_dict() if isinstance(child, Span) else child for child in self.children]
+        return node
+
+
+class _NoSpan:
+    """Stand-in yielded by span() outside a trace"""
+
+    def set(self, **attributes):
+        pass
+
+    def attach(self, fragment: Dict):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Child span of the current span; a no-op outside a trace"""
+    parent = _current.get()
+    if parent is None:
+        yield NO_SPAN
+        return
+
+    child = Span(name, attributes)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        _current.reset(token)
+
+
+def annotate(**attributes):
+    """Set attributes on the current span (if any)"""
+    current = _current.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+class _Stats:
+    """Raw cProfile stats in the form pstats.Stats accepts"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def _raw_stats(profiler: Optional[cProfile.Profile]) -> Optional[Dict]:
+    if profiler is None:
+        return None
+    profiler.create_stats()
+    return profiler.stats
+
+
+class Trace:
+    """Root span of one document, its profile data and the log record it ends in"""
+
+    def __init__(self, name: str, profiled: Optional[bool] = None, **attributes):
+        self.trace_id = uuid.uuid4().hex
+        self.root = Span(name, attributes)
+        if profiled is None:
+            profiled = _config['profile_rate'] > 0 and random.random() < _config['profile_rate']
+        self.profiled = profiled
+        self.stats: List[Dict] = []
+
+    def add_stats(self, stats: Optional[Dict]):
+        if stats:
+            self.stats.append(stats)
+
+    def _profile(self) -> Optional[pstats.Stats]:
+        if not self.stats:
+            return None
+        merged = pstats.Stats(_Stats(self.stats[0]))
+        for stats in self.stats[1:]:
+            merged.add(_Stats(stats))
+        return merged
+
+    def finish(self) -> Dict:
+        """Close the root span and log the trace"""
+        self.root.finish()
+        record = {'trace_id': self.trace_id, 'duration_ms': self.root.duration_ms, 'trace': self.root.to_dict()}
+
+        merged = self._profile()
+        if merged is not None and self.root.duration_ms >= _config['slow_seconds'] * 1000:
+            text = io.StringIO()
+            merged.stream = text
+            merged.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            record['profile'] = text.getvalue()
+
+            if _config['profile_dir']:
+                path = Path(_config['profile_dir']) / f"{self.trace_id}.prof"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                merged.dump_stats(str(path))
+                record['profile_path'] = str(path)
+
+        label = self.root.attributes.get('file', self.root.name)
+        logger.info(
+            f"Trace {label}: {self.root.duration_ms:.0f} ms{' (profiled)' if 'profile' in record else ''}",
+            extra=record
+        )
+        return record
+
+
+@contextmanager
+def document(name: str, **attributes):
+    """
+    Trace one document in this process and log it on exit.
+    Inside an existing trace, or with tracing off, this is a plain span().
+    """
+    if not _config['enabled'] or _current.get() is not None:
+        with span(name, **attributes) as current:
+            yield current
+        return
+
+    trace = Trace(name, **attributes)
+    token = _current.set(trace.root)
+    profiler = cProfile.Profile() if trace.profiled else None
+    if profiler:
+        profiler.enable()
+    try:
+        yield trace.root
+    finally:
+        if profiler:
+            profiler.disable()
+        _current.reset(token)
+        trace.add_stats(_raw_stats(profiler))
+        trace.finish()
+
+
+def traced_call(fn: Callable, args: Sequence, profiled: bool = False):
+    """
+    Run fn(*args) under a fresh span tree (in a pool worker).
+
+    Returns:
+        (fn's result, {'span': the tree as a dict, 'stats': raw cProfile stats or None})
+    """
+    root = Span(fn.__name__, {'pid': os.getpid()})
+    token = _current.set(root)
+    profiler = cProfile.Profile() if profiled else None
+    if profiler:
+        profiler.enable()
+    try:
+        result = fn(*args)
+    finally:
+        if profiler:
+            profiler.disable()
+        _current.reset(token)
+        root.finish()
+    return result, {'span': root.to_dict(), 'stats': _raw_stats(profiler)}
@@ -0,0 +1,237 @@
+"""
+Transformer NER inference on CPU for the fine-tuned legal-bert model.
+
+Loads a token-classification model (BIO labels, e.g. B-PARTY_NAME /
+I-DATE) saved with save_pretrained at Settings.model_path and runs it
+CPU-efficiently:
+  - documents are tokenized once, sorted by length and batched with
+    dynamic padding, so short texts are not padded to max_length;
+  - Linear layers are quantized to int8 (torch dynamic quantization);
+  - forward passes run under torch.inference_mode.
+
+Sub-token predictions are mapped back to character spans through the
+fast tokenizer's offset mapping; spans below min_confidence are dropped.
+Texts longer than max_length tokens are truncated here, with a warning
+(chunked_ner splits long documents into windows before calling predict).
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 16
+
+# Per-process engine (loaded once, like the spaCy pipelines in nlp_registry)
+_engine = None
+_engine_options: Dict = {}
+_engine_lock = threading.Lock()
+
+
+def decode_spans(
+        text: str,
+        offsets: Sequence[Sequence[int]],
+        labels: Sequence[str],
+        scores: Sequence[float],
+        min_confidence: float,
+        word_ids: Optional[Sequence[Optional[int]]] = None
+) -> List[Dict]:
+    """
+    Merge per-token BIO predictions into character spans.
+
+    A span starts at B-X (or at I-X not continuing X), extends over
+    following I-X tokens and ends at O or another label. Later word
+    pieces of a word follow its first piece, whatever their own label.
+    Its confidence is the mean token probability.
+
+    Args:
+        text: The original text
+        offsets: (start, end) character offsets per token; (0, 0) = special token
+        labels: Predicted label per token ("O", "B-DATE", ...)
+        scores: Probability of the predicted label per token
+        min_confidence: Drop spans whose confidence is below this
+        word_ids: Word index per token (tokenizer word_ids); None = every token is a word
+    """
+    spans = []
+    current = None
+
+    def close():
+        if current is not None:
+            confidence = sum(current['scores']) / len(current['scores'])
+            if confidence >= min_confidence:
+                spans.append({
+                    'label': current['label'],
+                    'start': current['start'],
+                    'end': current['end'],
+                    'text': text[current['start']:current['end']],
+                    'confidence': round(confidence, 4),
+                })
+
+    previous_word = None
+    for index, ((start, end), label, score) in enumerate(zip(offsets, labels, scores)):
+        if start == end:
+            continue
+
+        # Later piece of the same word: in the word's span, if it has one
+        word = word_ids[index] if word_ids is not None else None
+        if word is not None and word == previous_word:
+            if current is not None:
+                current['end'] = end
+                current['scores'].append(score)
+            continue
+        previous_word = word
+
+        prefix, _, entity = label.partition("-")
+        if label == "O" or not entity:
+            close()
+            current = None
+        elif prefix == "I" and current is not None and current['label'] == entity:
+            current['end'] = end
+            current['scores'].append(score)
+        else:
+            close()
+            current = {'label': entity, 'start': start, 'end': end, 'scores': [score]}
+
+    close()
+    return spans
+
+
+class TransformerNER:
+    """Batched, optionally int8-quantized token-classification model on CPU"""
+
+    def __init__(
+            self,
+            model_path,
+            max_length: int = 512,
+            min_confidence: float = 0.75,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            quantize: bool = True,
+            num_threads: Optional[int] = None
+    ):
+        """
+        Args:
+            model_path: Directory with the fine-tuned model and its (fast) tokenizer
+            max_length: Maximum tokens per text, including special tokens
+            min_confidence: Minimum mean token probability for a returned span
+            batch_size: Texts per forward pass
+            quantize: Apply dynamic int8 quantization to Linear layers
+            num_threads: torch intra-op threads (None = torch default)
+        """
+        import torch
+        from transformers import AutoModelForTokenClassification, AutoTokenizer
+
+        model_path = Path(model_path)
+        if not model_path.exists():
+            raise FileNotFoundError(f"NER model not found at {model_path}")
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.torch = torch
+        self.model_path = model_path
+        self.max_length = max_length
+        self.min_confidence = min_confidence
+        self.batch_size = batch_size
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_path), use_fast=True)
+        model = AutoModelForTokenClassification.from_pretrained(str(model_path))
+        model.eval()
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model
+        self.id2label = {int(i): label for i, label in model.config.id2label.items()}
+        self.quantized = quantize
+
+        logger.info(
+            f"✓ Transformer NER loaded from {model_path} "
+            f"({'int8' if quantize else 'fp32'}, {len(self.id2label)} labels)"
+        )
+
+    def predict(self, texts: Sequence[str]) -> List[List[Dict]]:
+        """
+        Entity spans for each text, in input order.
+
+        Returns:
+            One list per text of {'label', 'start', 'end', 'text', 'confidence'}
+        """
+        texts = list(texts)
+        with tracing.span("tokenize", texts=len(texts)) as span:
+            encodings = self.tokenizer(
+                texts,
+                truncation=True,
+                max_length=self.max_length,
+                return_offsets_mapping=True,
+            )
+            span.set(tokens=sum(len(ids) for ids in encodings['input_ids']))
+
+        truncated = sum(1 for ids in encodings['input_ids'] if len(ids) >= self.max_length)
+        if truncated:
+            logger.warning(
+                f"Transformer NER: {truncated} of {len(texts)} texts reached max_length={self.max_length} tokens "
+                f"and were truncated; entities past the limit are lost (use chunked_ner for long documents)"
+            )
+
+        # Longest first: similar lengths share a batch, so padding stays small
+        order = sorted(range(len(texts)), key=lambda i: len(encodings['input_ids'][i]), reverse=True)
+        results: List[List[Dict]] = [[] for _ in texts]
+
+        for batch_start in range(0, len(order), self.batch_size):
+            batch = order[batch_start:batch_start + self.batch_size]
+            features = [
+                {'input_ids': encodings['input_ids'][i], 'attention_mask': encodings['attention_mask'][i]}
+                for i in batch
+            ]
+            padded = self.tokenizer.pad(features, return_tensors="pt")
+
+            with tracing.span("forward", batch=len(batch), padded_length=padded['input_ids'].shape[1]):
+                with self.torch.inference_mode():
+                    logits = self.model(**padded).logits
+                    probabilities = logits.softmax(dim=-1)
+                    scores, label_ids = probabilities.max(dim=-1)
+
+            for row, i in enumerate(batch):
+                length = len(encodings['input_ids'][i])
+                labels = [self.id2label[label_id] for label_id in label_ids[row, :length].tolist()]
+                results[i] = decode_spans(
+                    texts[i],
+                    encodings['offset_mapping'][i],
+                    labels,
+                    scores[row, :length].tolist(),
+                    self.min_confidence,
+                    encodings.word_ids(i)
+                )
+
+        return results
+
+
+def configure(**options):
+    """
+    TransformerNER keyword arguments for the per-process engine (see
+    pipeline.transformer_options_from_settings). Call before the first
+    get_engine().
+    """
+    global _engine_options
+    _engine_options = options
+
+
+def get_engine(**overrides) -> TransformerNER:
+    """
+    The per-process engine, built on first use from the configure()
+    options plus `overrides` (which only apply to that first call).
+    """
+    global _engine
+    if _engine is not None:
+        return _engine
+
+    with _engine_lock:
+        if _engine is None:
+            options = dict(_engine_options, **overrides)
+            if 'model_path' not in options:
+                raise RuntimeError(
+                    "Transformer NER is not configured: call transformer_ner.configure(model_path=...) first"
+                )
+            _engine = TransformerNER(**options)
+    return _engine